@@ -5,7 +5,7 @@ a = Analysis(
     ['launcher.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('engine/pattern_library.json', 'engine')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
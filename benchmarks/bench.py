@@ -0,0 +1,261 @@
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import click
+import numpy as np
+
+from config.config import Config
+from engine.backends import BACKENDS, create_backend
+from engine.board import create_board, create_history
+from engine.game_of_life import next_board_state_optimized
+from engine.patterns import detect_patterns
+from engine.render import apply_pattern_colors, render
+from rules.rules import classic_rules, respawn_rules, von_neumann_rules, zombie_rules
+
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+RULES = {
+    "classic": classic_rules,
+    "zombie": zombie_rules,
+    "neumann": von_neumann_rules,
+    "respawn": respawn_rules,
+}
+
+GLIDER_GUNS = {
+    "ggg": "board_file/ggg.json",
+    "sgg": "board_file/sgg.json",
+}
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    group: str
+    board: str
+    cells: int
+    iterations: int
+    seconds: float
+    iterations_per_second: float
+    cells_per_second: float
+    peak_memory_bytes: int
+
+
+def load_boards(names: tuple[str, ...], seed: int) -> dict[str, list[list[int]]]:
+    """Return the benchmarked boards: the BOARD_SIZES presets filled at random and the glider guns."""
+    boards = {}
+
+    for name, (width, height) in Config.BOARD_SIZES.items():
+        if not names or name in names:
+            boards[name] = create_board(None, "DEAD", "topleft", width, height, rng=np.random.default_rng(seed))
+
+    for name, path in GLIDER_GUNS.items():
+        if not names or name in names:
+            boards[name] = create_board(path, "DEAD", "topleft", None, None)
+
+    return boards
+
+
+def measure(run: Callable[[], None], max_iterations: int, max_seconds: float) -> tuple[int, float]:
+    """Call run until max_iterations or max_seconds is reached, return the iterations and the elapsed time."""
+    iterations = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+
+    while iterations < max_iterations and (iterations == 0 or elapsed < max_seconds):
+        run()
+        iterations += 1
+        elapsed = time.perf_counter() - start
+
+    return iterations, elapsed
+
+
+def peak_memory(setup: Callable[[], Callable[[], None]]) -> int:
+    """Return the peak memory allocated by a setup and one call of the function it returns."""
+    tracemalloc.start()
+    try:
+        run = setup()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def benchmark(
+    name: str,
+    group: str,
+    board_name: str,
+    board: list[list[int]],
+    setup: Callable[[], Callable[[], None]],
+    max_iterations: int,
+    max_seconds: float
+) -> BenchmarkResult:
+    """Time the function returned by setup, its setup is not timed."""
+    cells = len(board) * len(board[0])
+    iterations, seconds = measure(setup(), max_iterations, max_seconds)
+    return BenchmarkResult(
+        name=name,
+        group=group,
+        board=board_name,
+        cells=cells,
+        iterations=iterations,
+        seconds=seconds,
+        iterations_per_second=iterations / seconds,
+        cells_per_second=cells * iterations / seconds,
+        peak_memory_bytes=peak_memory(setup),
+    )
+
+
+def engine_setup(backend: str, rule: Callable, board: list[list[int]]) -> Callable[[], Callable[[], None]]:
+    def setup() -> Callable[[], None]:
+        engine = create_backend(backend, board, rule, create_history(board), rng=np.random.default_rng(0))
+        return engine.step
+    return setup
+
+
+def run_benchmarks(
+    groups: tuple[str, ...],
+    backends: tuple[str, ...],
+    rules: tuple[str, ...],
+    boards: dict[str, list[list[int]]],
+    max_iterations: int,
+    max_seconds: float
+):
+    """Yield the result of every selected benchmark, unsupported backend and rule pairs are skipped."""
+    for board_name, board in boards.items():
+        if "engine" in groups:
+            for backend in backends:
+                for rule_name in rules:
+                    setup = engine_setup(backend, RULES[rule_name], board)
+                    try:
+                        result = benchmark(f"{backend}/{rule_name}", "engine", board_name, board, setup, max_iterations, max_seconds)
+                    except ValueError:
+                        # The backend does not run this rule
+                        continue
+                    yield result
+
+            yield benchmark(
+                "next_board_state_optimized", "engine", board_name, board,
+                lambda: lambda: next_board_state_optimized(board),
+                max_iterations, max_seconds,
+            )
+
+        if "patterns" in groups:
+            yield benchmark(
+                "detect_patterns", "patterns", board_name, board,
+                lambda: lambda: detect_patterns(board),
+                max_iterations, max_seconds,
+            )
+
+        if "render" in groups:
+            rendered = render(board)
+            patterns = detect_patterns(board)
+            yield benchmark(
+                "render", "render", board_name, board,
+                lambda: lambda: render(board),
+                max_iterations, max_seconds,
+            )
+            yield benchmark(
+                "apply_pattern_colors", "render", board_name, board,
+                lambda: lambda: apply_pattern_colors(rendered, patterns),
+                max_iterations, max_seconds,
+            )
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list[BenchmarkResult], baseline_path: str, threshold: float) -> list[str]:
+    """Return a report line for every benchmark slower than the baseline by more than threshold."""
+    with open(baseline_path) as f:
+        baseline = {
+            (result["name"], result["board"]): result
+            for result in json.load(f)["results"]
+        }
+
+    regressions = []
+    for result in results:
+        previous = baseline.get((result.name, result.board))
+        if previous is None:
+            continue
+        ratio = result.iterations_per_second / previous["iterations_per_second"]
+        click.echo(f"{result.name:<40} {result.board:<8} {ratio:6.2f}x")
+        if ratio < 1 - threshold:
+            regressions.append(f"{result.name} on {result.board} is {1 / ratio:.2f}x slower")
+
+    return regressions
+
+
+@click.command()
+@click.option("--group", "groups", multiple=True, type=click.Choice(["engine", "patterns", "render"]), help="Benchmark groups, all by default.")
+@click.option("--backend", "backends", multiple=True, type=click.Choice(BACKENDS.keys()), help="Backends, all by default.")
+@click.option("--rule", "rules", multiple=True, type=click.Choice(RULES.keys()), help="Rules, all by default.")
+@click.option("--board", "boards", multiple=True, type=click.Choice([*Config.BOARD_SIZES, *GLIDER_GUNS]), help="Boards, all by default.")
+@click.option("--max-iterations", type=int, default=100, help="Maximum iterations of each benchmark.")
+@click.option("--max-seconds", type=float, default=2.0, help="Time budget of each benchmark, at least one iteration runs.")
+@click.option("--seed", type=int, default=0, help="Seed of the random boards.")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="JSON results file, benchmarks/results/<commit>.json by default.")
+@click.option("--compare", "baseline", type=click.Path(exists=True, dir_okay=False), default=None, help="JSON results to compare against.")
+@click.option("--threshold", type=float, default=0.1, help="Slowdown ratio reported as a regression.")
+def main(groups, backends, rules, boards, max_iterations, max_seconds, seed, output, baseline, threshold):
+    """Measure generations per second, cells per second and peak memory."""
+    commit = git_commit()
+    results = []
+
+    click.echo(f"{'benchmark':<40} {'board':<8} {'iter/s':>10} {'cells/s':>12} {'peak MB':>8}")
+    for result in run_benchmarks(
+        groups or ("engine", "patterns", "render"),
+        backends or tuple(BACKENDS),
+        rules or tuple(RULES),
+        load_boards(boards, seed),
+        max_iterations,
+        max_seconds,
+    ):
+        results.append(result)
+        click.echo(
+            f"{result.name:<40} {result.board:<8} {result.iterations_per_second:>10.2f} "
+            f"{result.cells_per_second:>12.3g} {result.peak_memory_bytes / 2**20:>8.1f}"
+        )
+
+    path = Path(output) if output else RESULTS_DIR / f"{commit or 'results'}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "commit": commit,
+                "date": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "seed": seed,
+                "results": [asdict(result) for result in results],
+            },
+            f,
+            indent=2,
+        )
+    click.echo(f"Results saved to {path}")
+
+    if baseline:
+        regressions = compare(results, baseline, threshold)
+        for regression in regressions:
+            click.echo(f"REGRESSION: {regression}", err=True)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
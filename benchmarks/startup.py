@@ -0,0 +1,72 @@
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import click
+
+
+ROOT = Path(__file__).parent.parent
+
+# Median seconds of `python main.py run --help`, the interpreter start included
+STARTUP_BUDGET_S = 0.5
+
+# Modules the help of a command must not import, they are only loaded by the commands using them
+DEFERRED_MODULES = [
+    "numpy", "pygame", "keyboard", "pydantic", "PIL", "concurrent.futures", "cProfile",
+    "rules.compiler", "engine.backend", "engine.backends", "engine.snapshot", "engine.terminal",
+    "engine.game_of_life", "engine.tiled", "engine.hashlife",
+]
+
+
+def startup_times(command: list[str], runs: int) -> list[float]:
+    """Return the seconds taken by every run of `python main.py` with the command, in new interpreters."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "main.py", *command], cwd=ROOT, check=True, capture_output=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def loaded_modules(command: list[str]) -> set[str]:
+    """Return the modules imported by `python main.py` with the command."""
+    script = (
+        "import sys, runpy\n"
+        f"sys.argv = ['main.py', *{command!r}]\n"
+        "try:\n"
+        "    runpy.run_path('main.py', run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('\\n'.join(sys.modules), file=sys.stderr)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, check=True, capture_output=True, text=True)
+    return set(result.stderr.split())
+
+
+@click.command()
+@click.option("--runs", type=click.IntRange(min=1), default=10, help="Interpreters started.")
+@click.option("--budget", type=float, default=STARTUP_BUDGET_S, help="Median seconds allowed.")
+@click.argument("command", nargs=-1)
+def main(runs, budget, command):
+    """Time `python main.py COMMAND`, `run --help` by default, and fail when its median exceeds the budget.
+
+    The options of COMMAND follow a --, such as `-- terminal --help`.
+    """
+    command = list(command) or ["run", "--help"]
+    times = startup_times(command, runs)
+    median = statistics.median(times)
+    click.echo(f"main.py {' '.join(command)}: median {median * 1000:.0f} ms, min {min(times) * 1000:.0f} ms over {runs} runs (budget {budget * 1000:.0f} ms)")
+
+    loaded = [module for module in DEFERRED_MODULES if module in loaded_modules(command)]
+    if loaded:
+        click.echo(f"REGRESSION: imports {', '.join(loaded)}", err=True)
+    if median > budget:
+        click.echo(f"REGRESSION: startup over budget by {(median - budget) * 1000:.0f} ms", err=True)
+    if loaded or median > budget:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,9 @@ class Config:
     BOARD_FILES = {
         "Blinker": "board_file/blinker.json",
         "Pulsar": "board_file/pulsar.json",
-        "LWS": "board_file/lws.json"
+        "LWS": "board_file/lws.json",
+        "Glider": "board_file/glider.rle",
+        "R-pentomino": "board_file/r_pentomino.cells"
     }
     BOARD_SIZES = {
         "Small": (53, 53),
@@ -31,5 +33,21 @@ class Config:
     SPEEDS = {
         "Fast": 0.5,
         "Medium": 1,
-        "Slow": 3
-    }
\ No newline at end of file
+        "Slow": 3,
+        "Max": 0
+    }
+    # Choices of the command line, known without importing the engine
+    BOUNDARIES = ("dead", "torus", "infinite")
+    DISPLAY_MODES = ("emoji", "halfblock", "braille")
+    # A .gol snapshot stores the index of its encoding
+    SNAPSHOT_ENCODINGS = ("uint8", "packed")
+    # Backend classes by name, imported by engine.backends.BACKENDS when first used
+    BACKENDS = {
+        "python": "engine.backends.PythonBackend",
+        "numpy": "engine.backends.NumpyBackend",
+        "sparse": "engine.sparse.SparseBackend",
+        "hashlife": "engine.hashlife.HashLifeBackend",
+        "tiled": "engine.tiled.TiledBackend",
+        "bitpacked": "engine.bitpacked.BitPackedBackend",
+        "incremental": "engine.incremental.IncrementalBackend",
+    }
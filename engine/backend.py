@@ -0,0 +1,141 @@
+from typing import Callable
+
+import numpy as np
+
+from config.config import Config
+from engine.metrics import Metrics, measure
+
+
+# Edges of the board: DEAD cells beyond them, wrapped around as a torus, or a plane growing with the pattern
+BOUNDARIES = Config.BOUNDARIES
+
+
+class Backend:
+    """Common interface of the engines stepping a board for GameOfLife."""
+
+    # Whether the backend runs the stochastic rules, it then takes an rng option
+    stochastic = False
+    # Boundaries the backend implements, the first one is its default
+    boundaries = ("dead",)
+
+    def __init__(self, width: int, height: int, rules: Callable, boundary: str | None = None) -> None:
+        boundary = boundary if boundary else self.boundaries[0]
+        if boundary not in self.boundaries:
+            raise ValueError(
+                f"Boundary '{boundary}' is not supported by {type(self).__name__}, choose between {', '.join(self.boundaries)}"
+            )
+        self.rules = rules
+        self.width = width
+        self.height = height
+        self.boundary = boundary
+
+    @property
+    def bounded(self) -> bool:
+        """Return whether the board is the whole universe, cells of an infinite plane keep evolving outside of it."""
+        return self.boundary != "infinite"
+
+    @classmethod
+    def from_board(cls, board: list[list[int]], rules: Callable, ever_alive: np.ndarray, **options) -> "Backend":
+        """Return a backend starting from a dense board."""
+        return cls(board, rules, ever_alive, **options)
+
+    @classmethod
+    def from_plane(
+        cls,
+        cells: np.ndarray,
+        rules: Callable,
+        ever_alive: np.ndarray,
+        window: tuple[int, int, int, int],
+        **options
+    ) -> "Backend":
+        """Return a backend starting from a plane returned by plane, the board is rows [top, bottom) and columns [left, right) of it.
+
+        A bounded backend only keeps the board.
+        """
+        top, left, bottom, right = window
+        return cls.from_board(cells[top:bottom, left:right], rules, ever_alive[top:bottom, left:right], **options)
+
+    def plane(self) -> tuple[np.ndarray, np.ndarray, tuple[int, int]]:
+        """Return the cells and the ever ALIVE cells of the whole universe, with the row and column of the board in them.
+
+        It is the board itself on a bounded board.
+        """
+        return self.to_array(), self.ever_alive, (0, 0)
+
+    @property
+    def board(self) -> list[list[int]]:
+        """Return the current board as nested lists."""
+        raise NotImplementedError
+
+    @property
+    def ever_alive(self) -> np.ndarray:
+        """Return a boolean array of the cells that were ALIVE at least once, it must not be modified."""
+        raise NotImplementedError
+
+    def to_array(self, top: int = 0, left: int = 0, bottom: int | None = None, right: int | None = None) -> np.ndarray:
+        """Return the cells of rows [top, bottom) and columns [left, right) as a uint8 array, the whole board by default.
+
+        The array may be a view on the backend state, it must not be modified.
+        """
+        rows = self.board[top:bottom]
+        columns = len(range(self.width)[left:right])
+        return np.array([row[left:right] for row in rows], dtype=np.uint8).reshape(len(rows), columns)
+
+    def population(self) -> int:
+        """Return the number of ALIVE cells."""
+        return int(np.count_nonzero(self.to_array() == Config.ALIVE))
+
+    @property
+    def dirty(self) -> set[tuple[int, int]] | None:
+        """Return the cells changed by the last step, None when the backend does not track them."""
+        return None
+
+    def census(self, previous: object = None) -> object:
+        """Return what measure needs of the current board to count the births and deaths of the next generations.
+
+        It is a copy of the board, written over previous when given.
+        """
+        cells = self.to_array()
+        if isinstance(previous, np.ndarray) and previous.shape == cells.shape:
+            np.copyto(previous, cells)
+            return previous
+        return np.array(cells)
+
+    def measure(self, previous: object, generation: int, step_s: float) -> Metrics:
+        """Return the Metrics of the board, births and deaths counted since the census previous."""
+        return measure(previous, self.to_array(), generation, step_s)
+
+    def step(self) -> None:
+        """Compute the next generation."""
+        raise NotImplementedError
+
+    def advance(self, generations: int) -> None:
+        """Compute the board a given number of generations ahead."""
+        for _ in range(generations):
+            self.step()
+
+    def close(self) -> None:
+        """Release the resources held by the backend."""
+
+
+def plane_of_cells(
+    width: int,
+    height: int,
+    cells: dict[tuple[int, int], int],
+    ever_alive: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, tuple[int, int]]:
+    """Return the plane of Backend.plane holding a board and cells given by their coordinates, some outside of it.
+
+    The ever ALIVE cells are only known on the board.
+    """
+    rows = [i for i, _ in cells]
+    cols = [j for _, j in cells]
+    top, left = min([0, *rows]), min([0, *cols])
+    bottom, right = max([height, *(row + 1 for row in rows)]), max([width, *(col + 1 for col in cols)])
+
+    plane = np.zeros((bottom - top, right - left), dtype=np.uint8)
+    if cells:
+        plane[np.array(rows) - top, np.array(cols) - left] = list(cells.values())
+    history = np.zeros(plane.shape, dtype=bool)
+    history[-top:height - top, -left:width - left] = ever_alive
+    return plane, history, (-top, -left)
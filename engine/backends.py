@@ -0,0 +1,198 @@
+import importlib
+from collections.abc import Mapping
+from typing import Callable, Iterator
+
+import numpy as np
+
+from config.config import Config
+from engine.backend import Backend
+from engine.state import next_board_state
+from engine.vectorized import next_board_state_vectorized, to_array
+from rules.compiler import STOCHASTIC_RULES, as_compiled
+from rules.rules import TorusBoard
+
+
+# DEAD rows and columns added at least to a side of an infinite plane reached by the pattern
+PLANE_MARGIN = 16
+
+
+class PythonBackend(Backend):
+    """Reference backend calling the rule once per cell on nested lists."""
+
+    stochastic = True
+    boundaries = ("dead", "torus")
+
+    def __init__(
+        self,
+        board: list[list[int]],
+        rules: Callable,
+        ever_alive: np.ndarray,
+        rng: np.random.Generator | None = None,
+        boundary: str | None = None
+    ) -> None:
+        super().__init__(len(board[0]), len(board), rules, boundary)
+        self._board = board.tolist() if isinstance(board, np.ndarray) else board
+        self._ever_alive = np.array(ever_alive, dtype=bool)
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    @property
+    def board(self) -> list[list[int]]:
+        return self._board
+
+    @property
+    def ever_alive(self) -> np.ndarray:
+        return self._ever_alive
+
+    def step(self) -> None:
+        # One draw per generation, as lists the per-cell rules index them faster
+        noise = self.rng.random((self.height, self.width)).tolist() if self.rules in STOCHASTIC_RULES else None
+        # The rules wrap the neighbors of the cells on the edges of a torus board, rows are not copied
+        board = TorusBoard(self._board) if self.boundary == "torus" else self._board
+        self._board, self._ever_alive = next_board_state(board, self.rules, self._ever_alive, noise)
+
+
+class NumpyBackend(Backend):
+    """Backend keeping the board as a uint8 array and stepping it with NumPy.
+
+    On an infinite plane the array grows by DEAD margins whenever a non DEAD
+    cell reaches its edge, the board is the window of it at origin.
+    """
+
+    stochastic = True
+    boundaries = ("dead", "torus", "infinite")
+
+    def __init__(
+        self,
+        board: list[list[int]],
+        rules: Callable,
+        ever_alive: np.ndarray,
+        rng: np.random.Generator | None = None,
+        boundary: str | None = None
+    ) -> None:
+        super().__init__(len(board[0]), len(board), rules, boundary)
+        compiled = as_compiled(rules)
+        if self.boundary == "infinite" and compiled is not None and 0 in compiled.spec.birth:
+            raise ValueError("B0 rules give birth in empty space, an infinite plane cannot run them")
+
+        self.array = to_array(board)
+        self.history = np.array(ever_alive, dtype=bool)
+        # Row and column of the top left cell of the board in array
+        self.origin = (0, 0)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._board = None
+
+    @classmethod
+    def from_plane(
+        cls,
+        cells: np.ndarray,
+        rules: Callable,
+        ever_alive: np.ndarray,
+        window: tuple[int, int, int, int],
+        **options
+    ) -> "NumpyBackend":
+        backend = super().from_plane(cells, rules, ever_alive, window, **options)
+        if not backend.bounded:
+            # The array is restored as it was, the noise of the stochastic rules is drawn over all of it
+            backend.array = np.array(cells, dtype=np.uint8)
+            backend.history = np.array(ever_alive, dtype=bool)
+            backend.origin = window[:2]
+        return backend
+
+    def plane(self) -> tuple[np.ndarray, np.ndarray, tuple[int, int]]:
+        if self.bounded:
+            return super().plane()
+        return self.array, self.history, self.origin
+
+    @property
+    def board(self) -> list[list[int]]:
+        if self._board is None:
+            self._board = self.to_array().tolist()
+        return self._board
+
+    @property
+    def ever_alive(self) -> np.ndarray:
+        row, col = self.origin
+        return self.history[row:row + self.height, col:col + self.width]
+
+    def to_array(self, top: int = 0, left: int = 0, bottom: int | None = None, right: int | None = None) -> np.ndarray:
+        top, bottom, _ = slice(top, bottom).indices(self.height)
+        left, right, _ = slice(left, right).indices(self.width)
+        row, col = self.origin
+        return self.array[row + top:row + max(top, bottom), col + left:col + max(left, right)]
+
+    def _grow(self) -> None:
+        """Add DEAD margins to the sides of the plane reached by a non DEAD cell, no cell is ever born outside of it."""
+        array = self.array
+        height, width = array.shape
+        rows, cols = max(PLANE_MARGIN, height // 2), max(PLANE_MARGIN, width // 2)
+        pad = (
+            (rows if (array[0] != Config.DEAD).any() else 0, rows if (array[-1] != Config.DEAD).any() else 0),
+            (cols if (array[:, 0] != Config.DEAD).any() else 0, cols if (array[:, -1] != Config.DEAD).any() else 0),
+        )
+        if any(map(any, pad)):
+            self.array = np.pad(array, pad, constant_values=Config.DEAD)
+            self.history = np.pad(self.history, pad, constant_values=False)
+            self.origin = (self.origin[0] + pad[0][0], self.origin[1] + pad[1][0])
+
+    def step(self) -> None:
+        if self.boundary == "infinite":
+            self._grow()
+        noise = self.rng.random(self.array.shape) if self.rules in STOCHASTIC_RULES else None
+        self.array, self.history = next_board_state_vectorized(
+            self.array, self.rules, self.history, noise, self.boundary == "torus"
+        )
+        self._board = None
+
+
+class BackendRegistry(Mapping):
+    """Backend classes by name, the module of a backend is only imported the first time it is looked up.
+
+    The names are known without importing anything, so listing the backends
+    costs nothing and a run only loads the backend it uses.
+    """
+
+    def __init__(self, paths: dict[str, str]) -> None:
+        self._paths = paths
+        self._classes: dict[str, type[Backend]] = {}
+
+    def __getitem__(self, name: str) -> type[Backend]:
+        if name not in self._classes:
+            module, _, attribute = self._paths[name].rpartition(".")
+            self._classes[name] = getattr(importlib.import_module(module), attribute)
+        return self._classes[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
+BACKENDS = BackendRegistry(Config.BACKENDS)
+
+
+def create_backend(
+    name: str,
+    board: list[list[int]],
+    rules: Callable,
+    ever_alive: np.ndarray,
+    window: tuple[int, int, int, int] | None = None,
+    **options
+) -> Backend:
+    """Return the backend registered under name, options are passed to its constructor.
+
+    With a window the board is a plane returned by Backend.plane, the board
+    being rows [top, bottom) and columns [left, right) of it. The rng option
+    is dropped for the backends running deterministic rules only.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}', choose between {', '.join(BACKENDS)}")
+    backend = BACKENDS[name]
+    boundary = options.get("boundary")
+    if boundary and boundary not in backend.boundaries:
+        raise ValueError(f"The {name} backend has no {boundary} boundary, choose between {', '.join(backend.boundaries)}")
+    if not backend.stochastic:
+        options.pop("rng", None)
+    if window is not None:
+        return backend.from_plane(board, rules, ever_alive, window, **options)
+    return backend.from_board(board, rules, ever_alive, **options)
@@ -0,0 +1,50 @@
+from time import perf_counter
+from typing import Iterator
+
+import numpy as np
+
+from config.config import Config
+from engine.game_of_life import GameOfLife
+
+
+def snapshot(game: GameOfLife) -> dict:
+    """Return the ALIVE cells of the board as a coordinates board file."""
+    rows, cols = np.nonzero(game.to_array() == Config.ALIVE)
+    return {
+        "format": "coordinates",
+        "width": game.width,
+        "height": game.height,
+        "alive_cells": np.stack([rows, cols], axis=1).tolist(),
+    }
+
+
+def run(game: GameOfLife, generations: int, every: int = 1, snapshots: bool = False, stop_on_cycle: bool = False) -> Iterator[dict]:
+    """Compute generations without rendering, yield a record of the board every `every` generations and at the end.
+
+    A record holds the generation, the population and the seconds spent
+    computing since the start, with the snapshot of the board when asked.
+    Between two records the game advances in one call, so the hashlife
+    backend jumps over them. When the game detects cycles the records also
+    hold the period and the generation starting the cycle, and with
+    stop_on_cycle the run ends at the first record after the board repeats.
+    """
+    if every < 1:
+        raise ValueError("every must be at least 1")
+
+    elapsed = 0.0
+    end = game.generation + generations
+
+    while True:
+        record = {"generation": game.generation, "population": game.population(), "elapsed_s": round(elapsed, 6)}
+        if game.cycles:
+            record.update(period=game.period, cycle_start=game.cycles.start)
+        if snapshots:
+            record.update(snapshot(game))
+        yield record
+
+        if game.generation >= end or stop_on_cycle and game.period:
+            return
+
+        start = perf_counter()
+        game.advance(min(every, end - game.generation))
+        elapsed += perf_counter() - start
@@ -0,0 +1,192 @@
+from typing import Callable
+
+import numpy as np
+
+from config.config import Config
+from engine.backend import Backend
+from engine.vectorized import to_array
+from rules.compiler import as_compiled
+
+
+WORD_BITS = 64
+
+
+class PackedBoard:
+    """Two states board storing one cell per bit, 64 cells per uint64 word.
+
+    Cell (i, j) is bit j % 64 of words[i, j // 64], the padding bits after the
+    last column are always 0.
+    """
+
+    def __init__(self, words: np.ndarray, width: int) -> None:
+        self.words = words
+        self.width = width
+        self.height = words.shape[0]
+
+    @classmethod
+    def from_array(cls, board: np.ndarray) -> "PackedBoard":
+        """Pack the ALIVE cells of a uint8 board."""
+        height, width = board.shape
+        padded_width = -(-width // WORD_BITS) * WORD_BITS
+        bits = np.zeros((height, padded_width), dtype=bool)
+        bits[:, :width] = board == Config.ALIVE
+        words = np.packbits(bits, axis=1, bitorder="little").view("<u8")
+        return cls(np.ascontiguousarray(words, dtype=np.uint64), width)
+
+    @classmethod
+    def from_grid(cls, board: list[list[int]]) -> "PackedBoard":
+        """Pack the ALIVE cells of a nested lists board."""
+        return cls.from_array(to_array(board))
+
+    def to_array(self, top: int = 0, left: int = 0, bottom: int | None = None, right: int | None = None) -> np.ndarray:
+        """Return the board, or rows [top, bottom) and columns [left, right) of it, as a uint8 array of DEAD and ALIVE cells."""
+        left, right, _ = slice(left, right).indices(self.width)
+        right = max(left, right)
+        # Only unpack the words holding the requested columns
+        first = left // WORD_BITS
+        words = self.words[top:bottom, first:-(-right // WORD_BITS)]
+        bits = np.unpackbits(words.astype("<u8").view(np.uint8), axis=1, bitorder="little")
+        return bits[:, left - first * WORD_BITS:right - first * WORD_BITS] * np.uint8(Config.ALIVE)
+
+    def to_grid(self) -> list[list[int]]:
+        """Return the board as nested lists."""
+        return self.to_array().tolist()
+
+    @property
+    def nbytes(self) -> int:
+        return self.words.nbytes
+
+
+def shift(words: np.ndarray, di: int, dj: int, width: int | None = None) -> np.ndarray:
+    """Return the words where every cell (i, j) holds the cell (i + di, j + dj).
+
+    Cells outside the board are DEAD, or with the width of the board its
+    edges wrap around as a torus. The padding bits of the result may be set.
+    """
+    if width is None:
+        rows = np.zeros_like(words)
+        height = len(words)
+        rows[max(0, -di):height - max(0, di)] = words[max(0, di):height - max(0, -di)]
+    else:
+        rows = np.roll(words, -di, axis=0)
+
+    if dj == 0:
+        return rows
+
+    # Word and bit of the last column, the first column wraps to it and back
+    last, bit = divmod(width - 1, WORD_BITS) if width is not None else (0, 0)
+    carry = np.zeros_like(rows)
+    if dj == 1:
+        carry[:, :-1] = rows[:, 1:] << np.uint64(WORD_BITS - 1)
+        shifted = (rows >> np.uint64(1)) | carry
+        if width is not None:
+            shifted[:, last] |= (rows[:, 0] & np.uint64(1)) << np.uint64(bit)
+    else:
+        carry[:, 1:] = rows[:, :-1] >> np.uint64(WORD_BITS - 1)
+        shifted = (rows << np.uint64(1)) | carry
+        if width is not None:
+            shifted[:, 0] |= (rows[:, last] >> np.uint64(bit)) & np.uint64(1)
+
+    return shifted
+
+
+def padding_mask(width: int) -> np.ndarray:
+    """Return the mask of the real cells of every word of a row."""
+    mask = np.full(-(-width // WORD_BITS), np.uint64(2**64 - 1), dtype=np.uint64)
+    if width % WORD_BITS:
+        mask[-1] = np.uint64((1 << (width % WORD_BITS)) - 1)
+    return mask
+
+
+def next_packed_state(
+    board: PackedBoard,
+    birth: frozenset[int],
+    survival: frozenset[int],
+    neighbors: list[tuple[int, int]],
+    torus: bool = False
+) -> PackedBoard:
+    """Return the next board of a two states rule, counting the neighbors of 64 cells at once with bit-sliced adders."""
+    words = board.words
+    width = board.width if torus else None
+
+    # planes[k] holds bit k of the ALIVE neighbor count of every cell
+    planes = [np.zeros_like(words) for _ in range(len(neighbors).bit_length())]
+    for di, dj in neighbors:
+        addend = shift(words, di, dj, width)
+        for plane in planes:
+            carry = plane & addend
+            plane ^= addend
+            addend = carry
+
+    def count_is(count: int) -> np.ndarray:
+        match = np.full_like(words, np.uint64(2**64 - 1))
+        for k, plane in enumerate(planes):
+            match &= plane if count >> k & 1 else ~plane
+        return match
+
+    born = np.zeros_like(words)
+    for count in birth:
+        born |= count_is(count)
+    survives = np.zeros_like(words)
+    for count in survival:
+        survives |= count_is(count)
+
+    result = ((~words & born) | (words & survives)) & padding_mask(board.width)
+    return PackedBoard(result, board.width)
+
+
+class BitPackedBackend(Backend):
+    """Backend keeping a two states board and its history packed 64 cells per word."""
+
+    boundaries = ("dead", "torus")
+
+    def __init__(
+        self,
+        board: list[list[int]] | PackedBoard,
+        rules: Callable,
+        ever_alive: np.ndarray | PackedBoard,
+        boundary: str | None = None
+    ) -> None:
+        packed = board if isinstance(board, PackedBoard) else PackedBoard.from_grid(board)
+        super().__init__(packed.width, packed.height, rules, boundary)
+
+        self.rule = as_compiled(rules)
+        if self.rule is None or self.rule.spec.states != 2:
+            raise ValueError(
+                f"Rule '{getattr(rules, '__name__', rules)}' is not supported by the bitpacked backend, it needs a deterministic two states rule"
+            )
+
+        # A step builds new words, the board may be read-only
+        self.packed = packed
+        if isinstance(ever_alive, PackedBoard):
+            self.history = ever_alive
+        else:
+            self.history = PackedBoard.from_array(np.asarray(ever_alive, dtype=bool).view(np.uint8))
+        self._board = None
+
+    @classmethod
+    def from_packed(cls, packed: PackedBoard, rules: Callable, boundary: str | None = None) -> "BitPackedBackend":
+        """Return a backend starting from packed words without unpacking them, such as the mapped words of a snapshot.
+
+        The history starts as a copy of the ALIVE cells, the words themselves are never written.
+        """
+        return cls(packed, rules, PackedBoard(np.array(packed.words, dtype=np.uint64), packed.width), boundary)
+
+    @property
+    def board(self) -> list[list[int]]:
+        if self._board is None:
+            self._board = self.packed.to_grid()
+        return self._board
+
+    @property
+    def ever_alive(self) -> np.ndarray:
+        return self.history.to_array() == Config.ALIVE
+
+    def to_array(self, top: int = 0, left: int = 0, bottom: int | None = None, right: int | None = None) -> np.ndarray:
+        return self.packed.to_array(top, left, bottom, right)
+
+    def step(self) -> None:
+        spec = self.rule.spec
+        self.packed = next_packed_state(self.packed, spec.birth, spec.survival, self.rule.neighbors, self.boundary == "torus")
+        self.history.words |= self.packed.words
+        self._board = None
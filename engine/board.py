@@ -1,13 +1,22 @@
 import json
-import random
-from typing import Callable, Literal, Optional
+from dataclasses import dataclass, fields
+from typing import Literal, Optional
 
-from pydantic import BaseModel, model_validator
+import numpy as np
 from config.config import Config
+from engine.pattern_files import is_pattern_file, read_pattern
 from engine.state import dead_state, random_state
 
 
-class BoardFile(BaseModel):
+def _is_int_rows(value) -> bool:
+    return isinstance(value, list) and all(
+        isinstance(row, list) and all(isinstance(cell, int) for cell in row) for row in value
+    )
+
+
+@dataclass
+class BoardFile:
+    """Content of a JSON board file, checked by hand to keep a validation library out of the startup."""
     format: Literal["grid", "coordinates"]
 
     # grid format
@@ -18,31 +27,43 @@ class BoardFile(BaseModel):
     height: Optional[int] = None
     alive_cells: Optional[list[list[int]]] = None
 
-    @model_validator(mode="after")
-    def validate_structure(self):
+    def __post_init__(self):
         if self.format == "grid":
             if self.grid is None:
                 raise ValueError("Grid format requires 'grid'")
+            if not _is_int_rows(self.grid):
+                raise ValueError("'grid' must be a list of rows of integers")
         elif self.format == "coordinates":
             if None in (self.width, self.height, self.alive_cells):
                 raise ValueError("Coordinates format requires width, height and alive_cells")
-        return self
-
+            if not (isinstance(self.width, int) and isinstance(self.height, int)):
+                raise ValueError("'width' and 'height' must be integers")
+            if not (_is_int_rows(self.alive_cells) and all(len(cell) == 2 for cell in self.alive_cells)):
+                raise ValueError("'alive_cells' must be a list of [row, column] integer pairs")
+        else:
+            raise ValueError(f"Unknown board file format {self.format!r}, expected 'grid' or 'coordinates'")
 
-def create_history(board: Callable[[int, int], int]) -> set:
-    """Create the history of the ALIVE cells."""
-    width = len(board[0])
-    height = len(board)
-    ever_alive = set()
+    @classmethod
+    def model_validate(cls, data) -> "BoardFile":
+        """Return the board file of parsed JSON, the keys of other records are ignored."""
+        if not isinstance(data, dict) or "format" not in data:
+            raise ValueError("A board file must be a JSON object with a 'format'")
+        return cls(**{field.name: data[field.name] for field in fields(cls) if field.name in data})
 
-    for i in range(height):
-        for j in range(width):
-            if board[i][j] == Config.ALIVE:
-                ever_alive.add((i, j))
 
-    return ever_alive
+def create_history(board: list[list[int]]) -> np.ndarray:
+    """Create the history of the ALIVE cells, a boolean array of the board size."""
+    return np.asarray(board, dtype=np.uint8) == Config.ALIVE
 
-def create_board(file: str | None, fill_mode: str, placement: str, width: int | None, height: int | None) -> list[list[int]]:
+def create_board(
+    file: str | None,
+    fill_mode: str,
+    placement: str,
+    width: int | None,
+    height: int | None,
+    density: float = 0.5,
+    rng: np.random.Generator | None = None
+) -> list[list[int]]:
     """Create the board."""
     if file:
         board = load_state_from_file(file)
@@ -54,53 +75,58 @@ def create_board(file: str | None, fill_mode: str, placement: str, width: int |
                 height,
                 fill_mode,
                 placement,
+                rng,
             )
     else:
         width = width if width else 50
         height = height if height else 40
-        board = random_state(width, height)
+        board = random_state(width, height, density, rng)
 
     return board
 
+def _check_fit(width: int, height: int, pattern_width: int, pattern_height: int, fill_mode: str) -> None:
+    """Raise ValueError when the pattern is bigger than the board or the fill mode is unknown."""
+    if pattern_width > width or pattern_height > height:
+        raise ValueError(
+            "Board is smaller than pattern. "
+            f"Pattern size: {pattern_width}x{pattern_height}, "
+            f"Board size: {width}x{height}"
+        )
+    if fill_mode not in ("DEAD", "random"):
+        raise ValueError("fill_mode must be 'DEAD' or 'random'")
+
+def _random_fill(width: int, height: int, rng: np.random.Generator | None) -> np.ndarray:
+    """Return a uint8 board of ALIVE cells with probability 0.5, the draws of random_state."""
+    rng = rng if rng is not None else np.random.default_rng()
+    return np.where(rng.random((height, width)) < 0.5, Config.ALIVE, Config.DEAD).astype(np.uint8)
+
+def _placement_offsets(width: int, height: int, pattern_width: int, pattern_height: int, placement: str) -> tuple[int, int]:
+    """Return the row and column of the top left cell of the pattern on the board."""
+    if placement == "topleft":
+        return 0, 0
+    if placement == "center":
+        return (height - pattern_height) // 2, (width - pattern_width) // 2
+    raise ValueError("placement must be 'topleft' or 'center'")
+
 def integrate_pattern(
     pattern: list[list[int]],
     width: int,
     height: int,
     fill_mode: str,
-    placement: str
+    placement: str,
+    rng: np.random.Generator | None = None
 ) -> list[list[int]]:
 
     pattern_height = len(pattern)
     pattern_width = len(pattern[0])
-
-    # Refuse if pattern bigger than board
-    if pattern_width > width or pattern_height > height:
-        raise ValueError(
-            "Board is smaller than pattern. "
-            f"Pattern size: {pattern_width}x{pattern_height}, "
-            f"Board size: {width}x{height}"
-        )
+    _check_fit(width, height, pattern_width, pattern_height, fill_mode)
+    offset_y, offset_x = _placement_offsets(width, height, pattern_width, pattern_height, placement)
 
     # Create base board
     if fill_mode == "DEAD":
-        board = [[Config.DEAD for _ in range(width)]
-                for _ in range(height)]
-    elif fill_mode == "random":
-        board = [[random.choice([Config.DEAD, Config.ALIVE])
-                for _ in range(width)]
-                for _ in range(height)]
-    else:
-        raise ValueError("fill_mode must be 'DEAD' or 'random'")
-
-    # Place pattern in top-left corner
-    if placement == "topleft":
-        offset_y = 0
-        offset_x = 0
-    elif placement == "center":
-        offset_y = (height - pattern_height) // 2
-        offset_x = (width - pattern_width) // 2
+        board = dead_state(width, height)
     else:
-        raise ValueError("placement must be 'topleft' or 'center'")
+        board = _random_fill(width, height, rng).tolist()
 
     # Place pattern
     for i in range(pattern_height):
@@ -109,39 +135,144 @@ def integrate_pattern(
 
     return board
 
+def integrate_array(
+    pattern: np.ndarray,
+    width: int,
+    height: int,
+    fill_mode: str,
+    placement: str,
+    rng: np.random.Generator | None = None
+) -> np.ndarray:
+    """Place a pattern on a board like integrate_pattern does, as uint8 arrays."""
+    pattern_height, pattern_width = pattern.shape
+    _check_fit(width, height, pattern_width, pattern_height, fill_mode)
+    offset_y, offset_x = _placement_offsets(width, height, pattern_width, pattern_height, placement)
+
+    if fill_mode == "DEAD":
+        board = np.full((height, width), Config.DEAD, dtype=np.uint8)
+    else:
+        board = _random_fill(width, height, rng)
+
+    board[offset_y:offset_y + pattern_height, offset_x:offset_x + pattern_width] = pattern
+    return board
+
 def build_from_coordinates(data: BoardFile) -> list[list[int]]:
     """Build a full grid from a coordinate-based board definition."""
+    board = dead_state(data.width, data.height)
+
+    for (row, col), cell in cells_from_coordinates(data).items():
+        board[row][col] = cell
 
-    width = data.width
-    height = data.height
-    alive_cells = data.alive_cells
+    return board
 
-    board = dead_state(width, height)
+def cells_from_coordinates(data: BoardFile) -> dict[tuple[int, int], int]:
+    """Return the ALIVE cells of a coordinate-based board definition without building the grid."""
+    cells = {}
 
-    for cell in alive_cells:
+    for cell in data.alive_cells:
         if len(cell) != 2:
             raise ValueError("Each ALIVE cell must contain exactly two integers")
 
         row, col = cell
 
-        if not (0 <= row < height and 0 <= col < width):
+        if not (0 <= row < data.height and 0 <= col < data.width):
             raise ValueError(
                 f"ALIVE cell ({row}, {col}) is outside board bounds "
-                f"(height={height}, width={width})"
+                f"(height={data.height}, width={data.width})"
             )
 
-        board[row][col] = Config.ALIVE
+        cells[(row, col)] = Config.ALIVE
 
-    return board
+    return cells
+
+def load_cells_from_file(path: str) -> tuple[int, int, dict[tuple[int, int], int]]:
+    """Return the width, height and non DEAD cells of a board file."""
+    if is_pattern_file(path):
+        pattern = read_pattern(path)
+        return pattern.width, pattern.height, pattern.cells()
+
+    with open(path) as f:
+        json_data = json.load(f)
+
+    data = BoardFile.model_validate(json_data)
+
+    if data.format == "grid":
+        cells = {
+            (i, j): cell
+            for i, row in enumerate(data.grid)
+            for j, cell in enumerate(row)
+            if cell != Config.DEAD
+        }
+        return len(data.grid[0]), len(data.grid), cells
+    else:
+        return data.width, data.height, cells_from_coordinates(data)
+
+def create_sparse_board(
+    file: str,
+    fill_mode: str,
+    placement: str,
+    width: int | None,
+    height: int | None,
+    rng: np.random.Generator | None = None
+) -> tuple[int, int, dict[tuple[int, int], int]]:
+    """Create the board as its non DEAD cells, like create_board does for a file."""
+    pattern_width, pattern_height, pattern = load_cells_from_file(file)
+
+    if not (height and width):
+        return pattern_width, pattern_height, pattern
+
+    _check_fit(width, height, pattern_width, pattern_height, fill_mode)
+    offset_y, offset_x = _placement_offsets(width, height, pattern_width, pattern_height, placement)
+
+    if fill_mode == "DEAD":
+        cells = {}
+    else:
+        rows, cols = np.nonzero(_random_fill(width, height, rng))
+        cells = dict.fromkeys(zip(rows.tolist(), cols.tolist()), Config.ALIVE)
+
+    # The pattern overwrites its whole area, DEAD cells included
+    if cells:
+        for i in range(offset_y, offset_y + pattern_height):
+            for j in range(offset_x, offset_x + pattern_width):
+                cells.pop((i, j), None)
+
+    for (i, j), cell in pattern.items():
+        cells[(i + offset_y, j + offset_x)] = cell
+
+    return width, height, cells
 
 def load_state_from_file(path: str) -> list[list[int]]:
-    """Return a valid board from a file."""
+    """Return a valid board from a JSON, RLE or plaintext file."""
+    if is_pattern_file(path):
+        return read_pattern(path).to_array().tolist()
+
     with open(path) as f:
         json_data = json.load(f)
-    
+
     data = BoardFile.model_validate(json_data)
 
     if data.format == "grid":
         return data.grid
     else:
         return build_from_coordinates(data)
+
+
+def save_state_to_file(path: str, board, format: str = "coordinates") -> None:
+    """Write a board as a JSON board file, coordinates only keep the ALIVE cells."""
+    cells = np.asarray(board, dtype=np.uint8)
+
+    if format == "grid":
+        data = {"format": "grid", "grid": cells.tolist()}
+    elif format == "coordinates":
+        rows, cols = np.nonzero(cells == Config.ALIVE)
+        data = {
+            "format": "coordinates",
+            "width": int(cells.shape[1]),
+            "height": int(cells.shape[0]),
+            "alive_cells": np.stack([rows, cols], axis=1).tolist(),
+        }
+    else:
+        raise ValueError("format must be 'grid' or 'coordinates'")
+
+    with open(path, "w") as f:
+        json.dump(data, f)
@@ -0,0 +1,127 @@
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class Checkpoint:
+    """State of a game at a generation, enough to continue it as if it never stopped."""
+    cells: np.ndarray
+    ever_alive: np.ndarray
+    generation: int
+    rule: str
+    rng_state: dict
+    # Empty for the default boundary of the backend
+    boundary: str = ""
+    # Rows [top, bottom) and columns [left, right) of the board in the cells of an infinite plane, None when the cells are the board
+    window: tuple[int, int, int, int] | None = None
+
+
+def save_checkpoint(path: str, checkpoint: Checkpoint) -> None:
+    """Write a checkpoint atomically: to a temporary file of the same directory, then renamed over path.
+
+    A crash while writing leaves the previous checkpoint untouched.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix=".checkpoint-", suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f,
+                cells=checkpoint.cells,
+                ever_alive=checkpoint.ever_alive,
+                generation=np.int64(checkpoint.generation),
+                rule=np.str_(checkpoint.rule),
+                rng_state=np.str_(json.dumps(checkpoint.rng_state)),
+                boundary=np.str_(checkpoint.boundary),
+                **({"window": np.array(checkpoint.window, dtype=np.int64)} if checkpoint.window else {}),
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def load_checkpoint(path: str) -> Checkpoint:
+    """Read a checkpoint written by save_checkpoint."""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return Checkpoint(
+                data["cells"],
+                data["ever_alive"],
+                int(data["generation"]),
+                str(data["rule"]),
+                json.loads(str(data["rng_state"])),
+                str(data["boundary"]) if "boundary" in data else "",
+                tuple(data["window"].tolist()) if "window" in data else None,
+            )
+    except (OSError, KeyError, ValueError) as error:
+        raise ValueError(f"{path} is not a checkpoint: {error}") from error
+
+
+class Checkpointer:
+    """Write a checkpoint of a game every `every` generations from a background thread.
+
+    update is called by the thread stepping the game and only copies its
+    state; the file is written by the checkpointer thread. When a write is
+    still running the next checkpoint replaces the waiting one, so a slow
+    disk skips checkpoints instead of stalling the steps.
+    """
+
+    def __init__(self, path: str, every: int = 1000, generation: int = 0) -> None:
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        self.path = path
+        self.every = every
+        self.last_generation = generation
+        self.written = 0
+        self.error: BaseException | None = None
+        self._pending: Checkpoint | None = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def update(self, game) -> None:
+        """Checkpoint the game when `every` generations passed since the last checkpoint."""
+        if game.generation - self.last_generation >= self.every:
+            self.submit(game.checkpoint())
+
+    def submit(self, checkpoint: Checkpoint) -> None:
+        """Queue a checkpoint for the writer thread, replacing the one not written yet."""
+        self.last_generation = checkpoint.generation
+        with self._lock:
+            self._pending = checkpoint
+        self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                checkpoint, self._pending = self._pending, None
+            if checkpoint is not None:
+                try:
+                    save_checkpoint(self.path, checkpoint)
+                    self.written += 1
+                except Exception as error:
+                    self.error = error
+            if self._stopped and self._pending is None:
+                return
+
+    def close(self, game=None) -> None:
+        """Write the last checkpoint of the game, when given, and wait for the writes to finish."""
+        if game is not None:
+            self.submit(game.checkpoint())
+        self._stopped = True
+        self._wake.set()
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
@@ -0,0 +1,39 @@
+import numpy as np
+
+from engine.board import load_state_from_file, save_state_to_file
+from engine.pattern_files import is_pattern_file, read_pattern, write_pattern
+from engine.snapshot import is_snapshot, load_snapshot, save_snapshot
+
+
+def read_board(path: str) -> tuple[np.ndarray, str, int]:
+    """Return the cells, the rule and the generation of a board file of any format, by its extension."""
+    if is_snapshot(path):
+        snapshot = load_snapshot(path)
+        return snapshot.cells, snapshot.rule, snapshot.generation
+    if is_pattern_file(path):
+        pattern = read_pattern(path)
+        return pattern.to_array(), pattern.rule, 0
+    return np.asarray(load_state_from_file(path), dtype=np.uint8), "", 0
+
+
+def write_board(
+    path: str,
+    board,
+    rule: str = "",
+    generation: int = 0,
+    format: str = "coordinates",
+    encoding: str | None = None
+) -> None:
+    """Write a board file of any format, by its extension. Only a snapshot keeps the generation, only RLE and snapshots the rule."""
+    if is_snapshot(path):
+        save_snapshot(path, board, rule, generation, encoding)
+    elif is_pattern_file(path):
+        write_pattern(path, board, rule)
+    else:
+        save_state_to_file(path, board, format)
+
+
+def convert(source: str, destination: str, rule: str | None = None, format: str = "coordinates", encoding: str | None = None) -> None:
+    """Convert a board file to another format, keeping its rule unless one is given."""
+    cells, source_rule, generation = read_board(source)
+    write_board(destination, cells, source_rule if rule is None else rule, generation, format, encoding)
@@ -0,0 +1,89 @@
+from collections import deque
+from typing import Iterable
+
+import numpy as np
+
+from config.config import Config
+
+
+# Odd factor of the key of a cell for each state, 0 for DEAD
+STATE_FACTORS = np.array([0, *range(1, 511, 2)], dtype=np.uint64)
+
+
+class CycleDetector:
+    """Zobrist hash of the board kept over the generations to find the first board seen twice.
+
+    Every cell has a random 64 bits key, a board hashes to the XOR of the
+    keys of its cells multiplied by an odd factor of their state, 0 for
+    DEAD. A generation only XORs the keys of the cells it changed, given by
+    the backend or found by comparing with the previous board. The hashes
+    and the boards of the last `window` generations are kept, packed 8
+    cells per byte on two states boards, and at most max_bytes of boards:
+    a larger board keeps a shorter window. A hash seen again is only a
+    cycle when both boards are equal; period is then the number of
+    generations between them and start the generation of the first.
+    """
+
+    def __init__(self, width: int, height: int, window: int = 4096, seed: int = 0, max_bytes: int = 256 * 2**20) -> None:
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = max(1, min(window, max_bytes // max(1, width * height // 8)))
+        self.keys = np.random.default_rng(seed).bit_generator.random_raw((height, width)).astype(np.uint64)
+        self.hash = 0
+        self.period: int | None = None
+        self.start: int | None = None
+        self.collisions = 0
+        self._previous: np.ndarray | None = None
+        self._buffer = np.empty_like(self.keys)
+        self._seen: dict[int, list[int]] = {}
+        self._boards: dict[int, bytes] = {}
+        self._order: deque[tuple[int, int]] = deque()
+
+    def _rehash(self, cells: np.ndarray, changed: Iterable[tuple[int, int]] | None) -> None:
+        if self._previous is None:
+            np.multiply(self.keys, STATE_FACTORS[cells], out=self._buffer)
+            self.hash = int(np.bitwise_xor.reduce(self._buffer, axis=None))
+            self._previous = np.array(cells, dtype=np.uint8)
+            return
+
+        if changed is not None:
+            indices = np.array(list(changed), dtype=np.intp).reshape(-1, 2)
+            rows, cols = indices[:, 0], indices[:, 1]
+        else:
+            rows, cols = np.nonzero(cells != self._previous)
+        keys = self.keys[rows, cols]
+        # A changed cell leaves the hash with its old state and comes back with its new one
+        terms = keys * STATE_FACTORS[self._previous[rows, cols]] ^ keys * STATE_FACTORS[cells[rows, cols]]
+        self.hash ^= int(np.bitwise_xor.reduce(terms, initial=0))
+        self._previous[rows, cols] = cells[rows, cols]
+
+    def update(self, cells: np.ndarray, generation: int, changed: Iterable[tuple[int, int]] | None = None) -> int | None:
+        """Hash the board of a generation, return the period when it was already seen.
+
+        changed holds the cells changed since the previous board when the
+        backend tracks them, they are then the only ones read for the hash.
+        """
+        self._rehash(cells, changed)
+        board = np.packbits(cells, axis=None).tobytes() if cells.max(initial=0) <= Config.ALIVE else b"\x00" + cells.tobytes()
+
+        while self._order and self._order[0][0] < generation - self.window:
+            old_generation, old_hash = self._order.popleft()
+            del self._boards[old_generation]
+            generations = self._seen[old_hash]
+            generations.remove(old_generation)
+            if not generations:
+                del self._seen[old_hash]
+
+        if self.period is None:
+            for seen in self._seen.get(self.hash, []):
+                if self._boards[seen] == board:
+                    self.period = generation - seen
+                    self.start = seen
+                    break
+                self.collisions += 1
+
+        self._seen.setdefault(self.hash, []).append(generation)
+        self._boards[generation] = board
+        self._order.append((generation, self.hash))
+
+        return self.period
@@ -0,0 +1,152 @@
+import shutil
+import subprocess
+
+import numpy as np
+from PIL import GifImagePlugin, Image
+
+from config.config import Config
+from engine.render import PALETTE
+
+
+GIF_EXTENSION = ".gif"
+MP4_EXTENSION = ".mp4"
+
+# The cells index the colors directly, as an RGB lookup table and as a GIF palette
+PALETTE_ARRAY = np.array(PALETTE, dtype=np.uint8)
+PALETTE_BYTES = PALETTE_ARRAY.tobytes()
+
+
+def scale_cells(cells: np.ndarray, scale: int) -> np.ndarray:
+    """Return the cells with every one of them drawn as a scale x scale square."""
+    height, width = cells.shape
+    return np.broadcast_to(cells[:, None, :, None], (height, scale, width, scale)).reshape(height * scale, width * scale)
+
+
+class GifWriter:
+    """Encode frames to a GIF one at a time, the memory used does not grow with the number of frames.
+
+    Every frame uses the global palette of the cell states. After the first
+    one only the box of the cells changed since the previous frame is encoded.
+    """
+
+    def __init__(self, path: str, scale: int = 1, fps: float = 10, loop: int = 0) -> None:
+        self.scale = scale
+        # GIF delays are counted in hundredths of a second
+        self.duration = max(10, int(round(1000 / fps, -1)))
+        self.loop = loop
+        self._previous: np.ndarray | None = None
+        self._stream = open(path, "wb")
+
+    def _image(self, cells: np.ndarray) -> Image.Image:
+        image = Image.fromarray(np.ascontiguousarray(scale_cells(cells, self.scale)))
+        image.putpalette(PALETTE_BYTES)
+        return image
+
+    def write(self, cells: np.ndarray) -> None:
+        """Encode the next frame."""
+        top = left = 0
+        region = cells
+        if self._previous is None:
+            header, _ = GifImagePlugin.getheader(self._image(cells), None, {"loop": self.loop})
+            self._stream.write(b"".join(header))
+        else:
+            changed = cells != self._previous
+            rows, cols = np.flatnonzero(changed.any(axis=1)), np.flatnonzero(changed.any(axis=0))
+            # An unchanged frame still takes its duration, as one pixel redrawn
+            top, bottom = (rows[0], rows[-1] + 1) if len(rows) else (0, 1)
+            left, right = (cols[0], cols[-1] + 1) if len(cols) else (0, 1)
+            region = cells[top:bottom, left:right]
+
+        offset = (int(left) * self.scale, int(top) * self.scale)
+        for data in GifImagePlugin.getdata(self._image(region), offset, duration=self.duration, disposal=1):
+            self._stream.write(data)
+        self._previous = np.array(cells)
+
+    def close(self) -> None:
+        """Write the GIF trailer and close the file."""
+        try:
+            self._stream.write(b";")
+        finally:
+            self._stream.close()
+
+
+class Mp4Writer:
+    """Pipe frames as raw RGB to an ffmpeg process encoding them to H.264 as they come."""
+
+    def __init__(self, path: str, scale: int = 1, fps: float = 10) -> None:
+        self.ffmpeg = shutil.which("ffmpeg")
+        if self.ffmpeg is None:
+            raise ValueError("MP4 export needs ffmpeg, it was not found on the PATH")
+        self.path = path
+        self.scale = scale
+        self.fps = fps
+        self._process: subprocess.Popen | None = None
+        self._frame: np.ndarray | None = None
+
+    def _start(self, height: int, width: int) -> None:
+        # H.264 in yuv420p needs even sizes, the extra row and column are DEAD
+        self._frame = np.empty((height + height % 2, width + width % 2, 3), dtype=np.uint8)
+        self._frame[:] = PALETTE_ARRAY[Config.DEAD]
+        self._process = subprocess.Popen(
+            [
+                self.ffmpeg, "-y", "-loglevel", "error",
+                "-f", "rawvideo", "-pix_fmt", "rgb24",
+                "-s", f"{self._frame.shape[1]}x{self._frame.shape[0]}", "-r", str(self.fps),
+                "-i", "-",
+                "-c:v", "libx264", "-pix_fmt", "yuv420p",
+                self.path,
+            ],
+            stdin=subprocess.PIPE,
+        )
+
+    def write(self, cells: np.ndarray) -> None:
+        """Send the next frame to ffmpeg."""
+        pixels = scale_cells(cells, self.scale)
+        if self._process is None:
+            self._start(*pixels.shape)
+        self._frame[:pixels.shape[0], :pixels.shape[1]] = PALETTE_ARRAY[pixels]
+        try:
+            self._process.stdin.write(self._frame)
+        except BrokenPipeError:
+            # ffmpeg stopped, close reports its status
+            pass
+
+    def close(self) -> None:
+        """Wait for ffmpeg to write the end of the file."""
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        if self._process.wait():
+            raise ValueError(f"ffmpeg failed with exit status {self._process.returncode}")
+
+
+EXPORT_WRITERS = {
+    GIF_EXTENSION: GifWriter,
+    MP4_EXTENSION: Mp4Writer,
+}
+
+
+def export(game, path: str, frames: int = 100, every: int = 1, scale: int = 4, fps: float = 10) -> None:
+    """Record frames of a game to a GIF or an MP4 file, by its extension, starting from the current board.
+
+    The frames are drawn from the board arrays, scale pixels per cell side,
+    and streamed to the encoder one at a time. The game advances every
+    generations between two frames, so long games can be recorded in few.
+    """
+    extension = next((extension for extension in EXPORT_WRITERS if str(path).endswith(extension)), None)
+    if extension is None:
+        raise ValueError(f"Unknown export format of '{path}', expected one of {', '.join(EXPORT_WRITERS)}")
+    if frames < 1 or every < 1 or scale < 1 or fps <= 0:
+        raise ValueError("frames, every and scale must be at least 1 and fps positive")
+
+    writer = EXPORT_WRITERS[extension](path, scale, fps)
+    try:
+        for index in range(frames):
+            if index:
+                game.advance(every)
+            writer.write(game.to_array())
+    finally:
+        writer.close()
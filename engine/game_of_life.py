@@ -1,15 +1,22 @@
-import os
 import threading
 from typing import Callable
-import keyboard
-from time import sleep
+import numpy as np
+from time import perf_counter, sleep
 
-from engine.board import create_board, create_history
+from engine.backends import BACKENDS, create_backend
+from engine.checkpoint import Checkpoint, Checkpointer, load_checkpoint
+from engine.cycles import CycleDetector
+from engine.metrics import Observer
+from engine.board import create_board, create_history, create_sparse_board, integrate_array
 from config.config import Config
+from engine.pattern_files import is_pattern_file, read_pattern, read_pattern_rule
 from engine.patterns import detect_patterns
-from engine.render import apply_pattern_colors, render
+from engine.profiling import Profiler, no_phase
+from engine.snapshot import is_snapshot, load_snapshot, save_snapshot
+from engine.terminal import TerminalRenderer
+from rules.compiler import STOCHASTIC_RULES, resolve_rule, rule_name
 from rules.rules import classic_rules, zombie_rules, von_neumann_rules, respawn_rules
-from engine.state import dead_state, next_board_state
+from engine.state import dead_state
 
 
 class GameOfLife():
@@ -23,25 +30,194 @@ class GameOfLife():
         fill_mode: str = "DEAD",
         placement: str = "topleft",
         rules: Callable[[int, int], int] | None = None,
-        paterns: bool = False
+        paterns: bool = False,
+        backend: str = "python",
+        workers: int | None = None,
+        display: str = "emoji",
+        density: float = 0.5,
+        seed: int | None = None,
+        checkpoint: str | None = None,
+        checkpoint_every: int = 1000,
+        resume_from: str | Checkpoint | None = None,
+        detect_cycles: bool = False,
+        boundary: str | None = None
     ) -> None:
         self.running: bool = True
         self.game: bool = False
-        self.board = create_board(file, fill_mode, placement, width, height)
-        self.width = len(self.board[0])
-        self.height = len(self.board)
         self.interval_s = interval_s
         self.rules = rules if rules else classic_rules
         self.paterns = paterns
-        self.ever_alive = create_history(self.board)
+        self.display = display
+        # Every random draw of the game, the board and the stochastic rules, comes from this generator
+        self.rng = np.random.default_rng(seed)
+        self.generation = 0
 
-    def step(self):
-        self.board, self.ever_alive = next_board_state(
-            self.board,
-            self.rules,
-            self.ever_alive
+        if file and is_pattern_file(file) and rules is None:
+            self.rules = resolve_rule(read_pattern_rule(file) or self.rules)
+
+        options = {"workers": workers} if backend == "tiled" else {}
+
+        if resume_from:
+            # Continue a checkpointed game where it stopped, its random draws included
+            saved = resume_from if isinstance(resume_from, Checkpoint) else load_checkpoint(resume_from)
+            self.generation = saved.generation
+            if rules is None and saved.rule:
+                self.rules = resolve_rule(saved.rule)
+            self.rng.bit_generator.state = saved.rng_state
+            boundary = boundary or saved.boundary or None
+            self.backend = create_backend(
+                backend, saved.cells, self.rules, saved.ever_alive, saved.window, rng=self.rng, boundary=boundary, **options
+            )
+        elif file and (is_snapshot(file) or is_pattern_file(file) and backend != "sparse"):
+            # Never build a list grid: the cells of a snapshot are mapped from the file and the array
+            # backends start from them without a copy
+            snapshot = load_snapshot(file) if is_snapshot(file) else None
+            if snapshot:
+                self.generation = snapshot.generation
+                if rules is None and snapshot.rule:
+                    self.rules = resolve_rule(snapshot.rule)
+            if snapshot and snapshot.encoding == "packed" and backend == "bitpacked" and not (width and height):
+                # The packed words mapped from the file are stepped as they are, never unpacked
+                self.backend = BACKENDS["bitpacked"].from_packed(snapshot.packed, self.rules, boundary=boundary)
+            else:
+                board = snapshot.cells if snapshot else read_pattern(file).to_array()
+                if width and height:
+                    board = integrate_array(board, width, height, fill_mode, placement, self.rng)
+                ever_alive = board == Config.ALIVE
+                self.backend = create_backend(backend, board, self.rules, ever_alive, rng=self.rng, boundary=boundary, **options)
+        elif backend == "sparse" and file:
+            # Never build the dense grid of a file loaded in the sparse backend
+            board_width, board_height, cells = create_sparse_board(file, fill_mode, placement, width, height, self.rng)
+            self.backend = BACKENDS["sparse"](board_width, board_height, cells, self.rules, rng=self.rng, boundary=boundary)
+        else:
+            board = create_board(file, fill_mode, placement, width, height, density, self.rng)
+            self.backend = create_backend(backend, board, self.rules, create_history(board), rng=self.rng, boundary=boundary, **options)
+
+        self.width = self.backend.width
+        self.height = self.backend.height
+
+        if detect_cycles and self.rules in STOCHASTIC_RULES:
+            raise ValueError("Cycle detection needs a deterministic rule, the board of a stochastic one may never repeat")
+        if detect_cycles and not self.backend.bounded:
+            raise ValueError("Cycle detection needs a bounded board, the cells of an infinite plane evolve outside of it")
+        self.cycles = CycleDetector(self.width, self.height) if detect_cycles else None
+        if self.cycles:
+            self.cycles.update(self.to_array(), self.generation)
+
+        self.checkpointer = Checkpointer(checkpoint, checkpoint_every, self.generation) if checkpoint else None
+
+        self.observers: list[Observer] = []
+        self._observed: object = None
+
+    @property
+    def board(self) -> list[list[int]]:
+        return self.backend.board
+
+    @property
+    def ever_alive(self) -> np.ndarray:
+        """Return a boolean array of the cells that were ALIVE at least once."""
+        return self.backend.ever_alive
+
+    @property
+    def dirty(self) -> set[tuple[int, int]] | None:
+        """Return the cells changed by the last step, None when the backend does not track them."""
+        return self.backend.dirty
+
+    def to_array(self, top: int = 0, left: int = 0, bottom: int | None = None, right: int | None = None) -> np.ndarray:
+        """Return the cells of rows [top, bottom) and columns [left, right) as a uint8 array, the whole board by default."""
+        return self.backend.to_array(top, left, bottom, right)
+
+    def save(self, path: str, encoding: str | None = None) -> None:
+        """Write the board, the rule and the generation as a binary snapshot."""
+        save_snapshot(path, self.to_array(), rule_name(self.rules), self.generation, encoding)
+
+    def checkpoint(self) -> Checkpoint:
+        """Return a copy of the state of the game: board, history, generation, rule and random generator.
+
+        On an infinite plane the cells are those of the whole plane, with the window of the board in them.
+        """
+        cells, ever_alive, (row, col) = self.backend.plane()
+        window = None if self.backend.bounded else (row, col, row + self.height, col + self.width)
+        return Checkpoint(
+            np.array(cells),
+            np.array(ever_alive),
+            self.generation,
+            rule_name(self.rules),
+            self.rng.bit_generator.state,
+            self.backend.boundary,
+            window,
         )
 
+    def close(self) -> None:
+        """Write the last checkpoint, when checkpointing, and release the backend."""
+        try:
+            if self.checkpointer:
+                self.checkpointer.close(self)
+        finally:
+            self.backend.close()
+
+    @property
+    def period(self) -> int | None:
+        """Return the period of the board once it repeats, None before or without cycle detection."""
+        return self.cycles.period if self.cycles else None
+
+    def population(self) -> int:
+        """Return the number of ALIVE cells."""
+        return self.backend.population()
+
+    def add_observer(self, observer: Observer) -> None:
+        """Call observer with the Metrics of every generation computed from now on."""
+        if not self.observers:
+            self._observed = self.backend.census()
+        self.observers.append(observer)
+
+    def remove_observer(self, observer: Observer) -> None:
+        self.observers.remove(observer)
+        if not self.observers:
+            self._observed = None
+
+    def _notify(self, step_s: float) -> None:
+        # The census of the previous notification is kept only while observed, without observers a step measures nothing
+        metrics = self.backend.measure(self._observed, self.generation, step_s)
+        self._observed = self.backend.census(self._observed)
+        for observer in self.observers:
+            observer(metrics)
+
+    def step(self):
+        start = perf_counter() if self.observers else 0.0
+        self.backend.step()
+        self.generation += 1
+        if self.observers:
+            self._notify(perf_counter() - start)
+        if self.cycles and self.cycles.period is None:
+            self.cycles.update(self.to_array(), self.generation, self.dirty)
+        if self.checkpointer:
+            self.checkpointer.update(self)
+
+    def advance(self, generations: int) -> None:
+        """Compute the board a given number of generations ahead, the hashlife backend jumps by powers of two.
+
+        With cycle detection the generations are computed one by one until the
+        board repeats, then only the remainder of the period is computed.
+        Observers get the generations computed one by one, then a single
+        notification for the generations computed at once.
+        """
+        if self.cycles:
+            while generations and self.cycles.period is None:
+                self.step()
+                generations -= 1
+        start = perf_counter() if self.observers else 0.0
+        if self.cycles:
+            # The board of a deterministic rule repeats forever, and ever_alive holds every board of the cycle
+            self.backend.advance(generations % self.cycles.period if generations else 0)
+        else:
+            self.backend.advance(generations)
+        self.generation += generations
+        if self.observers and generations:
+            self._notify(perf_counter() - start)
+        if self.checkpointer:
+            self.checkpointer.update(self)
+
     def pause(self) -> None:
         """Pause the game."""
         self.running = False
@@ -56,6 +232,9 @@ class GameOfLife():
 
     def listen_keyboard(self) -> None:
         """Listen for space imput on keyboard."""
+        # Only the terminal needs keyboard, which fails to import on hosts without input devices
+        import keyboard
+
         while self.game:
             if keyboard.is_pressed("space"):
                 if self.running:
@@ -67,57 +246,64 @@ class GameOfLife():
                 self.stop()
             sleep(0.05)
 
-    def start(self) -> None:
-        """Run the game of life in the terminal."""
+    def start(self, profiler: Profiler | None = None) -> None:
+        """Run the game of life in the terminal, timing the board, detect, render and step phases with a profiler."""
         self.game = True
+        phase = profiler.phase if profiler else no_phase
 
         thread = threading.Thread(target=self.listen_keyboard, daemon=True) # Automatically terminate the thread when the main program exits
         thread.start()
 
-        while self.game:
-            os.system('cls' if os.name == 'nt' else 'clear')
-            if self.paterns:
-                print(apply_pattern_colors(render(self.board), detect_patterns(self.board)))
-            else:
-                print(render(self.board))
-            if self.running:
-                self.board, self.ever_alive = next_board_state(self.board, self.rules, self.ever_alive)
-            sleep(self.interval_s)
-        os.system('cls' if os.name == 'nt' else 'clear')
+        renderer = TerminalRenderer(self.display)
+        dirty = None
+        try:
+            while self.game:
+                with phase("board"):
+                    board = self.board
+                with phase("detect"):
+                    patterns = detect_patterns(board) if self.paterns else None
+                with phase("render"):
+                    renderer.draw(board, patterns, dirty)
+                dirty = set()
+                if self.running:
+                    with phase("step"):
+                        self.step()
+                    dirty = self.dirty
+                sleep(self.interval_s)
+        finally:
+            renderer.close()
+            self.close()
 
 
 #========================== OPTIMISATION CORNER ===========================================
 
-# IDEA:
+# DONE:
 # Convert the board into a NumPy array: matrix access and operations are much faster than nested Python lists.
+# See engine/vectorized.py and the "numpy" backend of GameOfLife.
 # Use boolean masks to check whether a pattern matches, it is very fast in NumPy.
+# See detect_patterns in engine/patterns.py and engine/pattern_library.json.
+
+def next_board_state_optimized(board_state: list[list[int]], torus: bool = False) -> list[list[int]]:
+    """Calculate next board state from the ALIVE cells counted by column over three rows, without a padded copy.
 
-def next_board_state_optimized(board_state: list[list[int]]) -> list[list[int]]:
-    """Calculate next board state with a padding optimisation."""
+    With torus the edges of the board wrap around, otherwise the cells outside of it are DEAD.
+    """
     height = len(board_state)
     width = len(board_state[0])
-
-    padded = [[Config.DEAD] * (width + 2)]
-    for row in board_state:
-        padded.append([Config.DEAD] + row + [Config.DEAD])
-    padded.append([Config.DEAD] * (width + 2))
+    alive = Config.ALIVE
 
     result = dead_state(width, height)
 
-    transposition_list = [
-        (-1, -1), (-1, 0), (-1, 1),
-        (0, -1),           (0, 1),
-        (1, -1),  (1, 0),  (1, 1)
-    ]
-
-    for i in range(1, height + 1):
-        for j in range(1, width + 1):
-            compt = 0
-            for di, dj in transposition_list:
-                if padded[i + di][j + dj] == Config.ALIVE:
-                    compt += 1
-
-            if compt == 3 or (padded[i][j] == Config.ALIVE and compt == 2):
-                result[i - 1][j - 1] = Config.ALIVE
+    for i, row in enumerate(board_state):
+        rows = [board_state[(i + di) % height] for di in (-1, 0, 1) if torus or 0 <= i + di < height]
+        # ALIVE cells of every column of the three rows, then of its 3x3 block, the cell included
+        vertical = [sum(cells) for cells in zip(*([cell == alive for cell in neighbor] for neighbor in rows))]
+        left = (vertical[-1:] if torus else [0]) + vertical[:-1]
+        right = vertical[1:] + (vertical[:1] if torus else [0])
+
+        for j, (cell, block) in enumerate(zip(row, map(sum, zip(left, vertical, right)))):
+            # 3 in the block: birth, or an ALIVE cell with 2 neighbors; 4: an ALIVE cell with 3
+            if block == 3 or (block == 4 and cell == alive):
+                result[i][j] = alive
 
     return result
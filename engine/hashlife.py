@@ -0,0 +1,360 @@
+from typing import Callable, Iterator
+
+import numpy as np
+
+from config.config import Config
+from engine.backend import Backend, plane_of_cells
+from engine.metrics import Metrics, measure_cells
+from engine.state import dead_state
+from rules.compiler import STOCHASTIC_RULES, as_compiled
+
+
+Cell = tuple[int, int]
+
+
+class Node:
+    """Canonical quadtree node of side 2**level, leaves are single cells."""
+
+    __slots__ = ("nw", "ne", "sw", "se", "level", "population", "results")
+
+    def __init__(self, nw: "Node | None", ne: "Node | None", sw: "Node | None", se: "Node | None", level: int, population: int) -> None:
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.level = level
+        self.population = population
+        self.results: dict[int, Node] | None = None
+
+
+DEAD_LEAF = Node(None, None, None, None, 0, 0)
+ALIVE_LEAF = Node(None, None, None, None, 0, 1)
+
+
+class HashLife:
+    """Memoised quadtree universe, unbounded in every direction."""
+
+    def __init__(self, birth: frozenset[int], survival: frozenset[int], neighbors: list[tuple[int, int]], max_nodes: int = 1_000_000) -> None:
+        self.birth = birth
+        self.survival = survival
+        self.neighbors = neighbors
+        self.max_nodes = max_nodes
+        self._cache: dict[tuple[Node, Node, Node, Node], Node] = {}
+        self._empty = [DEAD_LEAF]
+
+        # The root covers the square of side 2**level starting at (top, left)
+        self.root = self.empty(3)
+        self.top = 0
+        self.left = 0
+
+    def join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        """Return the canonical node made of four quadrants."""
+        key = (nw, ne, sw, se)
+        node = self._cache.get(key)
+        if node is None:
+            node = Node(nw, ne, sw, se, nw.level + 1, nw.population + ne.population + sw.population + se.population)
+            self._cache[key] = node
+        return node
+
+    def empty(self, level: int) -> Node:
+        """Return the canonical DEAD node of a given level."""
+        while len(self._empty) <= level:
+            child = self._empty[-1]
+            self._empty.append(self.join(child, child, child, child))
+        return self._empty[level]
+
+    def centre(self, node: Node) -> Node:
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def expand(self, node: Node) -> Node:
+        """Return the node one level up with node in its centre."""
+        border = self.empty(node.level - 1)
+        return self.join(
+            self.join(border, border, border, node.nw),
+            self.join(border, border, node.ne, border),
+            self.join(border, node.sw, border, border),
+            self.join(node.se, border, border, border),
+        )
+
+    def _base_case(self, node: Node) -> Node:
+        """Return the centre 2x2 of a 4x4 node after one generation."""
+        grid = [
+            [node.nw.nw, node.nw.ne, node.ne.nw, node.ne.ne],
+            [node.nw.sw, node.nw.se, node.ne.sw, node.ne.se],
+            [node.sw.nw, node.sw.ne, node.se.nw, node.se.ne],
+            [node.sw.sw, node.sw.se, node.se.sw, node.se.se],
+        ]
+
+        def next_cell(i: int, j: int) -> Node:
+            count = sum(grid[i + di][j + dj].population for di, dj in self.neighbors)
+            alive = count in self.survival if grid[i][j].population else count in self.birth
+            return ALIVE_LEAF if alive else DEAD_LEAF
+
+        return self.join(next_cell(1, 1), next_cell(1, 2), next_cell(2, 1), next_cell(2, 2))
+
+    def successor(self, node: Node, step: int) -> Node:
+        """Return the centre of node, one level down, 2**step generations later (step <= level - 2)."""
+        if node.population == 0:
+            return self.empty(node.level - 1)
+        if node.results is not None and step in node.results:
+            return node.results[step]
+
+        if node.level == 2:
+            result = self._base_case(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            parts = [
+                nw,
+                self.join(nw.ne, ne.nw, nw.se, ne.sw),
+                ne,
+                self.join(nw.sw, nw.se, sw.nw, sw.ne),
+                self.join(nw.se, ne.sw, sw.ne, se.nw),
+                self.join(ne.sw, ne.se, se.nw, se.ne),
+                sw,
+                self.join(sw.ne, se.nw, sw.se, se.sw),
+                se,
+            ]
+
+            if step == node.level - 2:
+                # Full speed: two half jumps of 2**(level - 3) generations
+                parts = [self.successor(part, node.level - 3) for part in parts]
+                inner_step = node.level - 3
+            else:
+                parts = [self.centre(part) for part in parts]
+                inner_step = step
+
+            a, b, c, d, e, f, g, h, i = parts
+            result = self.join(
+                self.successor(self.join(a, b, d, e), inner_step),
+                self.successor(self.join(b, c, e, f), inner_step),
+                self.successor(self.join(d, e, g, h), inner_step),
+                self.successor(self.join(e, f, h, i), inner_step),
+            )
+
+        if node.results is None:
+            node.results = {}
+        node.results[step] = result
+        return result
+
+    def set_cells(self, cells: set[Cell]) -> None:
+        """Replace the universe content by the given ALIVE cells."""
+        if not cells:
+            self.root = self.empty(3)
+            self.top = self.left = 0
+            return
+
+        self.top = min(i for i, _ in cells)
+        self.left = min(j for _, j in cells)
+        extent = max(max(i - self.top, j - self.left) for i, j in cells) + 1
+        level = max(3, (extent - 1).bit_length())
+
+        def build(level: int, top: int, left: int, cells: list[Cell]) -> Node:
+            if not cells:
+                return self.empty(level)
+            if level == 0:
+                return ALIVE_LEAF
+            half = 1 << (level - 1)
+            quadrants: list[list[Cell]] = [[], [], [], []]
+            for i, j in cells:
+                quadrants[(2 if i >= top + half else 0) + (1 if j >= left + half else 0)].append((i, j))
+            return self.join(
+                build(level - 1, top, left, quadrants[0]),
+                build(level - 1, top, left + half, quadrants[1]),
+                build(level - 1, top + half, left, quadrants[2]),
+                build(level - 1, top + half, left + half, quadrants[3]),
+            )
+
+        self.root = build(level, self.top, self.left, list(cells))
+
+    def cells(self, top: int, left: int, bottom: int, right: int) -> Iterator[Cell]:
+        """Yield the ALIVE cells inside the window [top, bottom) x [left, right)."""
+        stack = [(self.root, self.top, self.left)]
+
+        while stack:
+            node, node_top, node_left = stack.pop()
+            size = 1 << node.level
+            if (
+                node.population == 0
+                or node_top >= bottom or node_top + size <= top
+                or node_left >= right or node_left + size <= left
+            ):
+                continue
+            if node.level == 0:
+                yield node_top, node_left
+                continue
+            half = size >> 1
+            stack.append((node.nw, node_top, node_left))
+            stack.append((node.ne, node_top, node_left + half))
+            stack.append((node.sw, node_top + half, node_left))
+            stack.append((node.se, node_top + half, node_left + half))
+
+    def _is_padded(self, node: Node) -> bool:
+        """Return whether every ALIVE cell lies in the central quarter of node."""
+        return self.centre(self.centre(node)).population == node.population
+
+    def jump(self, step: int) -> None:
+        """Advance the universe by 2**step generations."""
+        # Cells travel at most one cell per generation, the padding keeps them all in the result
+        while self.root.level < step + 3 or not self._is_padded(self.root):
+            self.top -= 1 << (self.root.level - 1)
+            self.left -= 1 << (self.root.level - 1)
+            self.root = self.expand(self.root)
+
+        self.top += 1 << (self.root.level - 2)
+        self.left += 1 << (self.root.level - 2)
+        self.root = self.successor(self.root, step)
+
+        while self.root.level > 3 and self.centre(self.root).population == self.root.population:
+            self.top += 1 << (self.root.level - 2)
+            self.left += 1 << (self.root.level - 2)
+            self.root = self.centre(self.root)
+
+        if len(self._cache) > self.max_nodes:
+            self.collect()
+
+    def advance(self, generations: int) -> None:
+        """Advance the universe by any number of generations, one power of two at a time."""
+        if generations < 0:
+            raise ValueError("generations must be positive")
+
+        step = 0
+        while generations:
+            if generations & 1:
+                self.jump(step)
+            generations >>= 1
+            step += 1
+
+    def collect(self) -> None:
+        """Drop every cached node unreachable from the root, and the memoised results."""
+        cache = {}
+        stack = [self.root, *self._empty[1:]]
+
+        while stack:
+            node = stack.pop()
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key in cache:
+                continue
+            cache[key] = node
+            node.results = None
+            stack.extend(key)
+
+        self._cache = cache
+
+
+class HashLifeBackend(Backend):
+    """Backend jumping ahead by powers of two generations with HashLife.
+
+    The universe is unbounded: cells leaving the board keep evolving and only
+    the board window is shown. ever_alive is only sampled at the generations
+    reached by step and advance.
+    """
+
+    boundaries = ("infinite",)
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        cells: set[Cell],
+        rules: Callable,
+        max_nodes: int = 1_000_000,
+        boundary: str | None = None
+    ) -> None:
+        super().__init__(width, height, rules, boundary)
+
+        if rules in STOCHASTIC_RULES:
+            raise ValueError(
+                f"Rule '{rules.__name__}' is stochastic, the hashlife backend only runs deterministic rules"
+            )
+        rule = as_compiled(rules)
+        if rule is None or rule.spec.states != 2:
+            raise ValueError(f"Rule '{getattr(rules, '__name__', rules)}' is not supported by the hashlife backend, it needs a two states rule")
+        if 0 in rule.spec.birth:
+            raise ValueError("B0 rules give birth in empty space, the hashlife backend cannot run them")
+
+        self.universe = HashLife(rule.spec.birth, rule.spec.survival, rule.neighbors, max_nodes)
+        self.universe.set_cells(cells)
+        self._ever_alive = np.zeros((height, width), dtype=bool)
+        self._board = None
+        self._sample()
+
+    @classmethod
+    def from_board(cls, board: list[list[int]], rules: Callable, ever_alive: np.ndarray, **options) -> "HashLifeBackend":
+        cells = {
+            (i, j)
+            for i, row in enumerate(board)
+            for j, cell in enumerate(row)
+            if cell == Config.ALIVE
+        }
+        backend = cls(len(board[0]), len(board), cells, rules, **options)
+        backend._ever_alive |= ever_alive
+        return backend
+
+    @classmethod
+    def from_plane(
+        cls,
+        cells: np.ndarray,
+        rules: Callable,
+        ever_alive: np.ndarray,
+        window: tuple[int, int, int, int],
+        **options
+    ) -> "HashLifeBackend":
+        top, left, bottom, right = window
+        rows, cols = np.nonzero(cells == Config.ALIVE)
+        backend = cls(right - left, bottom - top, set(zip((rows - top).tolist(), (cols - left).tolist())), rules, **options)
+        backend._ever_alive |= ever_alive[top:bottom, left:right]
+        return backend
+
+    def plane(self) -> tuple[np.ndarray, np.ndarray, tuple[int, int]]:
+        universe = self.universe
+        size = 1 << universe.root.level
+        cells = universe.cells(universe.top, universe.left, universe.top + size, universe.left + size)
+        return plane_of_cells(self.width, self.height, dict.fromkeys(cells, Config.ALIVE), self._ever_alive)
+
+    def _sample(self) -> None:
+        # The ALIVE cells of the board, read once per generation reached
+        self._alive = set(self.universe.cells(0, 0, self.height, self.width))
+        if self._alive:
+            rows, cols = zip(*self._alive)
+            self._ever_alive[rows, cols] = True
+
+    @property
+    def board(self) -> list[list[int]]:
+        if self._board is None:
+            board = dead_state(self.width, self.height)
+            for i, j in self._alive:
+                board[i][j] = Config.ALIVE
+            self._board = board
+        return self._board
+
+    @property
+    def ever_alive(self) -> np.ndarray:
+        return self._ever_alive
+
+    def population(self) -> int:
+        return len(self._alive)
+
+    def to_array(self, top: int = 0, left: int = 0, bottom: int | None = None, right: int | None = None) -> np.ndarray:
+        top, bottom, _ = slice(top, bottom).indices(self.height)
+        left, right, _ = slice(left, right).indices(self.width)
+        window = np.zeros((max(bottom - top, 0), max(right - left, 0)), dtype=np.uint8)
+        for i, j in self.universe.cells(top, left, bottom, right):
+            window[i - top, j - left] = Config.ALIVE
+        return window
+
+    def census(self, previous: object = None) -> set[Cell]:
+        # Every generation reached samples a new set of the ALIVE cells, it is kept without a copy
+        return self._alive
+
+    def measure(self, previous: set[Cell], generation: int, step_s: float) -> Metrics:
+        return measure_cells(previous, self._alive, {}, generation, step_s)
+
+    def step(self) -> None:
+        self.advance(1)
+
+    def advance(self, generations: int) -> None:
+        self.universe.advance(generations)
+        self._board = None
+        self._sample()
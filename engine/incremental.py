@@ -0,0 +1,127 @@
+from typing import Callable
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from config.config import Config
+from engine.backend import Backend
+from engine.vectorized import to_array
+from rules.compiler import as_compiled
+
+
+class IncrementalBackend(Backend):
+    """Backend recomputing only the tiles that changed last generation and their neighbors.
+
+    The board is updated in place: settled tiles are neither recomputed nor
+    copied. dirty holds the cells changed by the last step.
+    """
+
+    def __init__(
+        self,
+        board: list[list[int]],
+        rules: Callable,
+        ever_alive: np.ndarray,
+        tile_size: int = 16,
+        boundary: str | None = None
+    ) -> None:
+        super().__init__(len(board[0]), len(board), rules, boundary)
+
+        self.rule = as_compiled(rules)
+        if self.rule is None:
+            raise ValueError(
+                f"Rule '{getattr(rules, '__name__', rules)}' is not supported by the incremental backend, it only runs deterministic rules"
+            )
+
+        self.tile_size = tile_size
+        tiles_high = -(-self.height // tile_size)
+        tiles_wide = -(-self.width // tile_size)
+
+        # A DEAD border of one cell around whole tiles, allocated once
+        self._padded = np.zeros((tiles_high * tile_size + 2, tiles_wide * tile_size + 2), dtype=np.uint8)
+        self._padded[1:self.height + 1, 1:self.width + 1] = to_array(board)
+        self.array = self._padded[1:self.height + 1, 1:self.width + 1]
+        self._tiles = self._tiles_view(self._padded[1:-1, 1:-1])
+
+        history = np.zeros((tiles_high * tile_size, tiles_wide * tile_size), dtype=bool)
+        history[:self.height, :self.width] = ever_alive
+        self.history = history
+        self._history_tiles = self._tiles_view(history)
+
+        # Cells of the last tiles lying outside the board must stay DEAD
+        rows = np.arange(tiles_high * tile_size).reshape(tiles_high, 1, tile_size, 1)
+        cols = np.arange(tiles_wide * tile_size).reshape(1, tiles_wide, 1, tile_size)
+        self._inside = (rows < self.height) & (cols < self.width)
+
+        self.active = np.ones((tiles_high, tiles_wide), dtype=bool)
+        self._changed_tiles = np.empty((0, 2), dtype=int)
+        self._changed_cells = np.empty((0, tile_size, tile_size), dtype=bool)
+        self._board = None
+
+    def _tiles_view(self, array: np.ndarray) -> np.ndarray:
+        """Return a writable (tile row, tile column, row, column) view of an array made of whole tiles."""
+        size = self.tile_size
+        height, width = array.shape
+        return array.reshape(height // size, size, width // size, size).swapaxes(1, 2)
+
+    @property
+    def board(self) -> list[list[int]]:
+        if self._board is None:
+            self._board = self.array.tolist()
+        return self._board
+
+    @property
+    def ever_alive(self) -> np.ndarray:
+        return self.history[:self.height, :self.width]
+
+    def to_array(self, top: int = 0, left: int = 0, bottom: int | None = None, right: int | None = None) -> np.ndarray:
+        return self.array[top:bottom, left:right]
+
+    @property
+    def dirty(self) -> set[tuple[int, int]]:
+        size = self.tile_size
+        tiles, rows, cols = np.nonzero(self._changed_cells)
+        rows = self._changed_tiles[tiles, 0] * size + rows
+        cols = self._changed_tiles[tiles, 1] * size + cols
+        return set(zip(rows.tolist(), cols.tolist()))
+
+    def step(self) -> None:
+        size = self.tile_size
+        tile_rows, tile_cols = np.nonzero(self.active)
+
+        # Active tiles with their one cell halo, read from the padded board
+        windows = sliding_window_view(self._padded, (size + 2, size + 2))[tile_rows * size, tile_cols * size]
+        alive = windows == Config.ALIVE
+        counts = np.zeros((len(windows), size, size), dtype=np.uint8)
+        for di, dj in self.rule.neighbors:
+            counts += alive[:, 1 + di:size + 1 + di, 1 + dj:size + 1 + dj]
+
+        current = windows[:, 1:-1, 1:-1]
+        result = self.rule.table[current, counts] * self._inside[tile_rows, tile_cols]
+        changed = result != current
+
+        self._tiles[tile_rows, tile_cols] = result
+        self._history_tiles[tile_rows, tile_cols] |= result == Config.ALIVE
+
+        changed_tiles = changed.any(axis=(1, 2))
+        self._changed_tiles = np.stack([tile_rows[changed_tiles], tile_cols[changed_tiles]], axis=1)
+        self._changed_cells = changed[changed_tiles]
+
+        # A change only reaches the next tile when it lies on the tile border
+        cells = self._changed_cells
+        top, bottom = cells[:, 0, :], cells[:, -1, :]
+        reach = [
+            (np.ones(len(cells), dtype=bool), 0, 0),
+            (top.any(axis=1), -1, 0),
+            (bottom.any(axis=1), 1, 0),
+            (cells[:, :, 0].any(axis=1), 0, -1),
+            (cells[:, :, -1].any(axis=1), 0, 1),
+            (top[:, 0], -1, -1),
+            (top[:, -1], -1, 1),
+            (bottom[:, 0], 1, -1),
+            (bottom[:, -1], 1, 1),
+        ]
+        touched = np.zeros((self.active.shape[0] + 2, self.active.shape[1] + 2), dtype=bool)
+        for mask, di, dj in reach:
+            touched[self._changed_tiles[mask, 0] + 1 + di, self._changed_tiles[mask, 1] + 1 + dj] = True
+        self.active = touched[1:-1, 1:-1]
+        self._board = None
@@ -0,0 +1,98 @@
+import csv
+import json
+from dataclasses import asdict, dataclass, fields
+from typing import Callable, TextIO
+
+import numpy as np
+
+from config.config import Config
+
+
+@dataclass(frozen=True)
+class Metrics:
+    """Counters of a generation, births and deaths are counted since the previous observed board.
+
+    The bounding box holds the cells that are not DEAD as rows [top, bottom)
+    and columns [left, right), all None on an empty board.
+    """
+    generation: int
+    population: int
+    births: int
+    deaths: int
+    zombies: int
+    top: int | None
+    left: int | None
+    bottom: int | None
+    right: int | None
+    step_s: float
+
+
+Observer = Callable[[Metrics], None]
+
+FIELDS = [field.name for field in fields(Metrics)]
+
+
+def measure(previous: np.ndarray, cells: np.ndarray, generation: int, step_s: float) -> Metrics:
+    """Return the metrics of the cells of a generation following the previous board."""
+    alive = cells == Config.ALIVE
+    was_alive = previous == Config.ALIVE
+    population = int(np.count_nonzero(alive))
+    births = int(np.count_nonzero(alive & ~was_alive))
+
+    occupied = cells != Config.DEAD
+    rows, cols = np.flatnonzero(occupied.any(axis=1)), np.flatnonzero(occupied.any(axis=0))
+    box = (int(rows[0]), int(cols[0]), int(rows[-1]) + 1, int(cols[-1]) + 1) if len(rows) else (None,) * 4
+
+    return Metrics(
+        generation,
+        population,
+        births,
+        # Every ALIVE cell was either born or already ALIVE
+        int(np.count_nonzero(was_alive)) - (population - births),
+        int(np.count_nonzero(cells == Config.ZOMBIE)),
+        *box,
+        step_s,
+    )
+
+
+def measure_cells(
+    previous: set[tuple[int, int]],
+    alive: set[tuple[int, int]],
+    states: dict[tuple[int, int], int],
+    generation: int,
+    step_s: float
+) -> Metrics:
+    """Return the metrics of a board given by its ALIVE cells and the other non DEAD ones, following the previous ALIVE cells."""
+    births = len(alive - previous)
+    occupied = alive | states.keys()
+    rows, cols = [i for i, _ in occupied], [j for _, j in occupied]
+    box = (min(rows), min(cols), max(rows) + 1, max(cols) + 1) if occupied else (None,) * 4
+
+    return Metrics(
+        generation,
+        len(alive),
+        births,
+        len(previous) - (len(alive) - births),
+        sum(1 for state in states.values() if state == Config.ZOMBIE),
+        *box,
+        step_s,
+    )
+
+
+class MetricsWriter:
+    """Observer writing the metrics of every generation as a CSV row or a JSON line."""
+
+    def __init__(self, stream: TextIO, format: str) -> None:
+        self.stream = stream
+        self.format = format
+        if format == "csv":
+            self._writer = csv.DictWriter(stream, FIELDS)
+            if not stream.seekable() or stream.tell() == 0:
+                self._writer.writeheader()
+
+    def __call__(self, metrics: Metrics) -> None:
+        # Not flushed, a line per generation would make the disk the bottleneck
+        if self.format == "csv":
+            self._writer.writerow(asdict(metrics))
+        else:
+            self.stream.write(json.dumps(asdict(metrics)) + "\n")
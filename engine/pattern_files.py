@@ -0,0 +1,308 @@
+import itertools
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, TextIO
+
+import numpy as np
+
+from config.config import Config
+
+
+RLE_EXTENSION = ".rle"
+CELLS_EXTENSION = ".cells"
+
+# Lines of RLE data are at most 70 characters long
+RLE_LINE_LENGTH = 70
+
+RLE_HEADER = re.compile(r"x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*(\S+))?", re.IGNORECASE)
+
+# RLE data is decoded by chunks of about this many characters
+RLE_CHUNK_SIZE = 1 << 20
+
+# Kind of each ASCII character of RLE data: a cell state, b and . are DEAD, o and A ALIVE and B to X
+# the next states, or one of the other kinds below. p to y prefix B to X for the states after X.
+INVALID, ROW_END, END, DIGIT, PREFIX = -1, -2, -3, -4, -5
+RLE_KINDS = np.full(256, INVALID, dtype=np.int16)
+RLE_KINDS[[ord("b"), ord(".")]] = Config.DEAD
+RLE_KINDS[ord("o")] = Config.ALIVE
+RLE_KINDS[ord("A"):ord("X") + 1] = np.arange(1, 25)
+RLE_KINDS[ord("$")] = ROW_END
+RLE_KINDS[ord("!")] = END
+RLE_KINDS[ord("0"):ord("9") + 1] = DIGIT
+RLE_KINDS[ord("p"):ord("y") + 1] = PREFIX
+
+@dataclass
+class PatternFile:
+    """Non DEAD cells of an RLE or plaintext pattern, as coordinate and state arrays."""
+    width: int
+    height: int
+    rows: np.ndarray
+    cols: np.ndarray
+    states: np.ndarray
+    rule: str = ""
+    name: str = ""
+
+    def to_array(self) -> np.ndarray:
+        """Return the pattern as a uint8 array."""
+        board = np.full((self.height, self.width), Config.DEAD, dtype=np.uint8)
+        board[self.rows, self.cols] = self.states
+        return board
+
+    def cells(self) -> dict[tuple[int, int], int]:
+        """Return the non DEAD cells as the sparse backend stores them."""
+        return dict(zip(zip(self.rows.tolist(), self.cols.tolist()), self.states.tolist()))
+
+
+class _Runs:
+    """Runs of cells found while parsing, expanded to cells once the file is read."""
+
+    def __init__(self) -> None:
+        self.chunks: list[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+
+    def extend(self, rows: np.ndarray, cols: np.ndarray, lengths: np.ndarray, states: np.ndarray) -> None:
+        self.chunks.append((rows, cols, lengths, states))
+
+    def pattern(self, width: int, height: int, rule: str = "", name: str = "") -> PatternFile:
+        rows, cols, lengths, states = (
+            np.concatenate([chunk[k] for chunk in self.chunks]) if self.chunks else np.zeros(0, dtype=np.int64)
+            for k in range(4)
+        )
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        rows = np.repeat(rows, lengths)
+        cols = np.repeat(cols, lengths) + np.arange(len(starts)) - starts
+        states = np.repeat(states, lengths).astype(np.uint8)
+
+        outside = (rows >= height) | (cols >= width)
+        if outside.any():
+            index = np.flatnonzero(outside)[0]
+            raise ValueError(
+                f"Cell ({rows[index]}, {cols[index]}) is outside pattern bounds "
+                f"(height={height}, width={width})"
+            )
+        return PatternFile(width, height, rows, cols, states, rule, name)
+
+def is_pattern_file(path: str) -> bool:
+    """Return whether a board file is an RLE or plaintext pattern, by its extension."""
+    return str(path).endswith((RLE_EXTENSION, CELLS_EXTENSION))
+
+
+def _decode_rle(data: bytes, row: int, col: int, runs: _Runs) -> tuple[int, int]:
+    """Add the runs of a chunk of RLE data starting at a row and column, return the row and column it ends at.
+
+    Every character is classified at once: the digits before a tag give its
+    count, the $ tags the row of the tags after them and the cell tags since
+    the last $ their column.
+    """
+    codes = np.frombuffer(data, dtype=np.uint8)
+    kinds = RLE_KINDS[codes]
+    if (kinds == INVALID).any():
+        raise ValueError(f"Invalid RLE data '{chr(codes[np.argmax(kinds == INVALID)])}'")
+
+    digit = kinds == DIGIT
+    prefix = kinds == PREFIX
+    prefixed = np.zeros_like(prefix)
+    prefixed[1:] = prefix[:-1]
+    if prefix[-1:].any() or (prefixed & ~((codes >= ord("A")) & (codes <= ord("X")))).any():
+        raise ValueError("Invalid RLE data, p to y must come before B to X")
+
+    # One anchor per tag, the prefix of a prefixed state
+    anchor = ~digit & ~prefixed
+    tags = np.flatnonzero(anchor)
+    states = kinds[tags].astype(np.int64)
+    prefixes = np.flatnonzero(prefix)
+    states[np.searchsorted(tags, prefixes)] = (codes[prefixes] - ord("p") + 1) * 24 + kinds[prefixes + 1]
+
+    digits = np.flatnonzero(digit)
+    owner = np.cumsum(anchor)[digits]
+    weights = (codes[digits] - ord("0")) * 10.0 ** (tags[owner] - digits - 1)
+    counts = np.bincount(owner, weights=weights, minlength=len(tags)).round().astype(np.int64)
+    counts[np.bincount(owner, minlength=len(tags)) == 0] = 1
+
+    row_end = states == ROW_END
+    row_counts = np.where(row_end, counts, 0)
+    tag_rows = row + np.cumsum(row_counts) - row_counts
+    cell_counts = np.where(row_end, 0, counts)
+    before = np.cumsum(cell_counts) - cell_counts
+    # Cells counted before the last $, -1 before the first one of the chunk
+    row_start = np.maximum.accumulate(np.where(row_end, before, -1))
+    tag_cols = np.where(row_start < 0, col + before, before - row_start)
+
+    cells = ~row_end & (states != Config.DEAD)
+    runs.extend(tag_rows[cells], tag_cols[cells], counts[cells], states[cells])
+
+    end_row = row + int(row_counts.sum())
+    if not row_end.any():
+        return end_row, col + int(cell_counts.sum())
+    return end_row, int(cell_counts.sum() - row_start[-1])
+
+
+def parse_rle(lines: Iterable[str]) -> PatternFile:
+    """Parse RLE lines, decoded by chunks as they are read, only the runs of non DEAD cells are kept."""
+    lines = iter(lines)
+    name = ""
+
+    for line in lines:
+        line = line.strip()
+        if line.startswith("#N"):
+            name = line[2:].strip()
+        elif line and not line.startswith("#"):
+            header = RLE_HEADER.match(line)
+            if header is None:
+                raise ValueError(f"Invalid RLE header '{line}', expected 'x = <width>, y = <height>'")
+            width, height = int(header[1]), int(header[2])
+            rule = header[3] or ""
+            break
+    else:
+        raise ValueError("RLE file has no header line")
+
+    runs = _Runs()
+    row = col = 0
+    chunk: list[str] = []
+    size = 0
+    pending = ""
+
+    for line in itertools.chain(lines, [None]):
+        if line is not None:
+            line = "".join(line.split())
+            chunk.append(line)
+            size += len(line)
+            if size < RLE_CHUNK_SIZE and "!" not in line:
+                continue
+
+        data = pending + "".join(chunk)
+        data, finished = data.partition("!")[0], "!" in data
+        # A run count or a prefixed state may be cut by the end of a chunk
+        pending = re.search(r"\d*[p-y]?$", data)[0]
+        data = data[:len(data) - len(pending)]
+        if data:
+            row, col = _decode_rle(data.encode("ascii", "replace"), row, col, runs)
+        if finished:
+            break
+        chunk, size = [], 0
+
+    return runs.pattern(width, height, rule, name)
+
+def parse_cells(lines: Iterable[str]) -> PatternFile:
+    """Parse plaintext lines one by one, O is ALIVE and . DEAD, the width is the longest row."""
+    runs = _Runs()
+    name = ""
+    width = height = 0
+
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.startswith("!"):
+            if line.startswith("!Name:"):
+                name = line[6:].strip()
+            continue
+
+        codes = np.frombuffer(line.encode("ascii", "replace"), dtype=np.uint8)
+        alive = (codes == ord("O")) | (codes == ord("*"))
+        if not (alive | (codes == ord("."))).all():
+            raise ValueError(f"Invalid plaintext row '{line}'")
+
+        edges = np.flatnonzero(np.diff(alive, prepend=False, append=False))
+        starts, stops = edges[::2], edges[1::2]
+        runs.extend(np.full(len(starts), height), starts, stops - starts, np.full(len(starts), Config.ALIVE))
+        width = max(width, len(line))
+        height += 1
+
+    return runs.pattern(width, height, name=name)
+
+def read_pattern(path: str) -> PatternFile:
+    """Read an RLE or plaintext pattern file, by its extension."""
+    with open(path) as f:
+        if str(path).endswith(RLE_EXTENSION):
+            return parse_rle(f)
+        return parse_cells(f)
+
+
+def read_pattern_rule(path: str) -> str:
+    """Return the rule in the header of an RLE file without reading its cells, empty for plaintext."""
+    if not str(path).endswith(RLE_EXTENSION):
+        return ""
+
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                header = RLE_HEADER.match(line)
+                return (header[3] or "") if header else ""
+    return ""
+
+
+def _row_runs(row: np.ndarray) -> Iterator[tuple[int, int]]:
+    """Yield the runs of a row as (length, state), the trailing DEAD cells excepted."""
+    alive = np.flatnonzero(row != Config.DEAD)
+    if len(alive) == 0:
+        return
+    row = row[:alive[-1] + 1]
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(row)) + 1))
+    lengths = np.diff(np.append(starts, len(row)))
+    yield from zip(lengths.tolist(), row[starts].tolist())
+
+
+def _rle_tag(state: int, multistate: bool) -> str:
+    if not multistate:
+        return "o" if state == Config.ALIVE else "b"
+    if state == Config.DEAD:
+        return "."
+    prefix, letter = divmod(state - 1, 24)
+    return ("" if prefix == 0 else chr(ord("p") + prefix - 1)) + chr(ord("A") + letter)
+
+
+def _rle_tokens(cells: np.ndarray) -> Iterator[str]:
+    multistate = int(cells.max(initial=0)) > Config.ALIVE
+    written = 0
+
+    for i, row in enumerate(cells):
+        runs = list(_row_runs(np.asarray(row)))
+        if not runs:
+            continue
+        # One $ ends a row, a count of them skips the empty rows
+        if i > written:
+            yield f"{i - written if i - written > 1 else ''}$"
+        written = i
+        for length, state in runs:
+            yield f"{length if length > 1 else ''}{_rle_tag(state, multistate)}"
+    yield "!"
+
+
+def write_rle(stream: TextIO, board, rule: str = "", name: str = "") -> None:
+    """Write a board as RLE one row at a time, a memory-mapped board is never loaded whole."""
+    cells = board if isinstance(board, np.ndarray) else np.asarray(board, dtype=np.uint8)
+    height, width = cells.shape
+
+    if name:
+        stream.write(f"#N {name}\n")
+    stream.write(f"x = {width}, y = {height}" + (f", rule = {rule}" if rule else "") + "\n")
+
+    line = ""
+    for token in _rle_tokens(cells):
+        if len(line) + len(token) > RLE_LINE_LENGTH:
+            stream.write(line + "\n")
+            line = ""
+        line += token
+    stream.write(line + "\n")
+
+
+def write_cells(stream: TextIO, board, name: str = "") -> None:
+    """Write a two states board as plaintext one row at a time."""
+    cells = board if isinstance(board, np.ndarray) else np.asarray(board, dtype=np.uint8)
+    characters = np.array([".", "O"])
+
+    if name:
+        stream.write(f"!Name: {name}\n")
+    for row in cells:
+        row = np.asarray(row)
+        if (row > Config.ALIVE).any():
+            raise ValueError("A plaintext pattern only holds DEAD and ALIVE cells")
+        stream.write("".join(characters[row]) + "\n")
+
+
+def write_pattern(path: str, board, rule: str = "", name: str = "") -> None:
+    """Write a board as an RLE or plaintext pattern file, by its extension."""
+    with open(path, "w") as f:
+        if str(path).endswith(RLE_EXTENSION):
+            write_rle(f, board, rule, name)
+        else:
+            write_cells(f, board, name)
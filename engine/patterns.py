@@ -1,13 +1,26 @@
+import json
 from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 
+import numpy as np
+
 from config.config import Config
 
 
+PATTERN_LIBRARY = Path(__file__).parent / "pattern_library.json"
+
+ADJACENT_NEIGHBORS = [(di, dj) for di in range(-1, 2) for dj in range(-1, 2) if (di, dj) != (0, 0)]
+# Cells up to two cells apart belong to the same group in the second detection pass
+GROUP_NEIGHBORS = [(di, dj) for di in range(-2, 3) for dj in range(-2, 3) if (di, dj) != (0, 0)]
+
+
 @dataclass
 class Pattern:
     name: str
     cells: list[tuple[int, int]]
+    kind: str = ""
 
 
 def detect_block(board: list[list[int]], i: int, j: int, used_cells: set) -> Optional[tuple[str, list[tuple[int, int]]]]:
@@ -104,8 +117,8 @@ def detect_blinker(board: list[list[int]], i: int, j: int, used_cells: set) -> O
 
     return horizontal or vertical
 
-def detect_patterns(board):
-    """Detect block and blinker patterns."""
+def detect_patterns_per_cell(board):
+    """Detect block and blinker patterns by running the detectors on every ALIVE cell."""
     width = len(board[0])
     height = len(board)
     detected_patterns = []
@@ -124,3 +137,168 @@ def detect_patterns(board):
                     detected_patterns.append(pattern)
 
     return detected_patterns
+
+
+class PatternLibrary:
+    """Known patterns indexed by the shape of each of their phases under every rotation and reflection."""
+
+    def __init__(self, entries: list[dict]) -> None:
+        self.shapes: dict[tuple[int, int, bytes], tuple[str, str]] = {}
+
+        for entry in entries:
+            for phase in entry["phases"]:
+                shape = np.array([[cell == "O" for cell in row] for row in phase], dtype=np.uint8)
+                for variant in _symmetries(shape):
+                    self.shapes[_shape_key(variant)] = (entry["name"], entry.get("kind", ""))
+
+        self.max_cells = max(key[2].count(1) for key in self.shapes)
+        self.max_side = max(max(key[0], key[1]) for key in self.shapes)
+
+    def match(self, shape: np.ndarray) -> tuple[str, str] | None:
+        """Return the name and kind of a cropped shape, None when it is unknown."""
+        return self.shapes.get(_shape_key(shape))
+
+
+def _symmetries(shape: np.ndarray) -> list[np.ndarray]:
+    rotations = [np.rot90(shape, k) for k in range(4)]
+    return rotations + [np.fliplr(rotation) for rotation in rotations]
+
+
+def _shape_key(shape: np.ndarray) -> tuple[int, int, bytes]:
+    return shape.shape[0], shape.shape[1], np.ascontiguousarray(shape, dtype=np.uint8).tobytes()
+
+
+@lru_cache(maxsize=None)
+def load_pattern_library(path: str | Path = PATTERN_LIBRARY) -> PatternLibrary:
+    """Load a pattern library file, once per path."""
+    with open(path) as f:
+        return PatternLibrary(json.load(f)["patterns"])
+
+
+def label_components(mask: np.ndarray, neighbors: list[tuple[int, int]]) -> tuple[np.ndarray, np.ndarray]:
+    """Label the connected set cells of mask, return their flat indices and the component of each one."""
+    height, width = mask.shape
+    cells = np.flatnonzero(mask)
+    position = np.full(mask.size, -1, dtype=np.int64)
+    position[cells] = np.arange(len(cells))
+    position = position.reshape(mask.shape)
+
+    # Every pair of neighboring set cells, each pair once
+    sources, targets = [], []
+    for di, dj in neighbors:
+        if (di, dj) < (0, 0):
+            continue
+        source = position[max(0, -di):height - max(0, di), max(0, -dj):width - max(0, dj)]
+        target = position[max(0, di):height - max(0, -di), max(0, dj):width - max(0, -dj)]
+        linked = (source >= 0) & (target >= 0)
+        sources.append(source[linked])
+        targets.append(target[linked])
+    sources = np.concatenate(sources) if sources else np.empty(0, dtype=np.int64)
+    targets = np.concatenate(targets) if targets else np.empty(0, dtype=np.int64)
+
+    # Hook the higher parent of every pair under the lower one, then jump pointers, until stable
+    parent = np.arange(len(cells))
+    while True:
+        source_parent = parent[sources]
+        target_parent = parent[targets]
+        if (source_parent == target_parent).all():
+            break
+        np.minimum.at(parent, np.maximum(source_parent, target_parent), np.minimum(source_parent, target_parent))
+        while True:
+            grand_parent = parent[parent]
+            if (grand_parent == parent).all():
+                break
+            parent = grand_parent
+
+    return cells, parent
+
+
+def _match_groups(board: np.ndarray, cells: np.ndarray, groups: np.ndarray, library: PatternLibrary) -> tuple[list[Pattern], np.ndarray, np.ndarray]:
+    """Match every group of cells against the library.
+
+    Return the patterns found, the cells of the unknown groups small enough
+    to be part of a pattern and the cells of the groups too large to be one.
+    """
+    width = board.shape[1]
+    _, groups = np.unique(groups, return_inverse=True)
+    rows, cols = np.divmod(cells, width)
+    count = groups.max() + 1 if len(groups) else 0
+
+    # Bounding box and size of every group, only the small ones are looked up
+    top = np.full(count, board.shape[0])
+    left = np.full(count, width)
+    bottom = np.full(count, -1)
+    right = np.full(count, -1)
+    np.minimum.at(top, groups, rows)
+    np.minimum.at(left, groups, cols)
+    np.maximum.at(bottom, groups, rows)
+    np.maximum.at(right, groups, cols)
+    small = (
+        (np.bincount(groups, minlength=count) <= library.max_cells)
+        & (bottom - top < library.max_side)
+        & (right - left < library.max_side)
+    )
+
+    order = np.argsort(groups, kind="stable")
+    members_of = np.split(order, np.flatnonzero(np.diff(groups[order])) + 1)
+    patterns = []
+    matched = np.zeros(count, dtype=bool)
+
+    for group in np.flatnonzero(small).tolist():
+        members = members_of[group]
+        group_rows = rows[members] - top[group]
+        group_cols = cols[members] - left[group]
+        shape = np.zeros((bottom[group] - top[group] + 1, right[group] - left[group] + 1), dtype=np.uint8)
+        shape[group_rows, group_cols] = board.flat[cells[members]]
+        match = library.match(shape)
+        if match is None:
+            continue
+        matched[group] = True
+        patterns.append(Pattern(match[0], list(zip(rows[members].tolist(), cols[members].tolist())), match[1]))
+
+    unknown = small & ~matched
+    return patterns, cells[unknown[groups]], cells[~small[groups]]
+
+
+def dilate(mask: np.ndarray, radius: int) -> np.ndarray:
+    """Return the cells at most radius cells away from a set cell of mask, diagonals included."""
+    for axis in (0, 1):
+        grown = mask.copy()
+        length = mask.shape[axis]
+        for shift in range(1, radius + 1):
+            ahead = [slice(None)] * 2
+            behind = [slice(None)] * 2
+            ahead[axis], behind[axis] = slice(shift, length), slice(0, length - shift)
+            grown[tuple(ahead)] |= mask[tuple(behind)]
+            grown[tuple(behind)] |= mask[tuple(ahead)]
+        mask = grown
+    return mask
+
+
+def detect_patterns(board, library: PatternLibrary | None = None) -> list[Pattern]:
+    """Detect the isolated patterns of the library in one pass over the board.
+
+    Non DEAD cells are grouped into 8-connected components, every component
+    made of ALIVE cells only is looked up by shape. Unknown components are
+    then merged with the ones less than two cells away and looked up again,
+    to find the phases split in several components (toad, beacon).
+    """
+    library = library if library else load_pattern_library()
+    board = np.asarray(board, dtype=np.uint8)
+
+    cells, components = label_components(board != Config.DEAD, ADJACENT_NEIGHBORS)
+    patterns, unknown, large = _match_groups(board, cells, components, library)
+
+    if len(unknown):
+        mask = np.zeros(board.shape, dtype=bool)
+        mask.flat[unknown] = True
+        cells, groups = label_components(mask, GROUP_NEIGHBORS)
+        merged, _, _ = _match_groups(board, cells, groups, library)
+
+        # A merged group is not isolated when a large component lies less than two cells away
+        crowded = np.zeros(board.shape, dtype=bool)
+        crowded.flat[large] = True
+        crowded = dilate(crowded, 2)
+        patterns.extend(pattern for pattern in merged if not any(crowded[i, j] for i, j in pattern.cells))
+
+    return sorted(patterns, key=lambda pattern: pattern.cells[0])
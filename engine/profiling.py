@@ -0,0 +1,75 @@
+import cProfile
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from time import perf_counter_ns
+from typing import ContextManager, Iterator
+
+import numpy as np
+
+
+STEP_PHASE = "step"
+PERCENTILES = (50, 95, 99)
+
+_NO_PHASE = nullcontext()
+
+
+def no_phase(name: str) -> ContextManager:
+    """Stand-in for Profiler.phase when not profiling, times nothing."""
+    return _NO_PHASE
+
+
+class Profiler:
+    """Durations of the named phases of a loop, the last `window` of each kept for rolling percentiles.
+
+    Phases are timed with perf_counter_ns. With stats_path the step phase
+    also runs under cProfile, its statistics are written by close as a
+    pstats file.
+    """
+
+    def __init__(self, window: int = 10000, stats_path: str | None = None) -> None:
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.stats_path = stats_path
+        self.durations: dict[str, deque[int]] = {}
+        self.counts: dict[str, int] = {}
+        self._cprofile = cProfile.Profile() if stats_path else None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the block as one run of the phase."""
+        profiled = self._cprofile is not None and name == STEP_PHASE
+        if profiled:
+            self._cprofile.enable()
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, perf_counter_ns() - start)
+            if profiled:
+                self._cprofile.disable()
+
+    def record(self, name: str, duration_ns: int) -> None:
+        if name not in self.durations:
+            self.durations[name] = deque(maxlen=self.window)
+            self.counts[name] = 0
+        self.durations[name].append(duration_ns)
+        self.counts[name] += 1
+
+    def percentiles(self, name: str) -> dict[int, float]:
+        """Return the p50, p95 and p99 of the last durations of a phase, in milliseconds."""
+        values = np.percentile(np.fromiter(self.durations[name], dtype=np.int64), PERCENTILES) / 1e6
+        return dict(zip(PERCENTILES, values.tolist()))
+
+    def summary(self) -> str:
+        """Return a table of the runs and percentiles of every phase."""
+        lines = [f"{'phase':<16}{'runs':>10}" + "".join(f"{f'p{p} ms':>12}" for p in PERCENTILES)]
+        for name in self.durations:
+            percentiles = self.percentiles(name)
+            lines.append(f"{name:<16}{self.counts[name]:>10}" + "".join(f"{percentiles[p]:>12.3f}" for p in PERCENTILES))
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        """Write the cProfile statistics of the step phase, when asked."""
+        if self._cprofile is not None:
+            self._cprofile.dump_stats(self.stats_path)
@@ -2,12 +2,22 @@ from config.config import Config
 from engine.patterns import Pattern
 
 
+# RGB color of every cell state, the unknown states are red
+PALETTE: list[tuple[int, int, int]] = [
+    (0, 0, 0),
+    *[Config.CELL_COLORS.get(state, (255, 0, 0)) for state in range(1, 256)]
+]
+
+PATTERN_COLORS: dict[str, str] = {"block": "🟫", "blinker": "🟦"}
+KIND_COLORS: dict[str, str] = {"still_life": "🟪", "oscillator": "🟨", "spaceship": "🟧"}
+
+
 def render(board_state: list[list[int]]) -> str:
     """Return a visual str of a board state that can be print in the terminal."""
     mapping_dead_alive: dict[int, str] = {Config.DEAD: "⬛", Config.ALIVE: "⬜", Config.ZOMBIE: "🟩"}
 
     return "\n".join(
-        "".join(mapping_dead_alive[cell] for cell in row)
+        "".join(mapping_dead_alive.get(cell, "🟥") for cell in row)
         for row in board_state
         )
 
@@ -16,13 +26,10 @@ def apply_pattern_colors(rendered_board: str, detected_patterns: list[Pattern])
     grid = [list(row) for row in rendered_board.split("\n")]
 
     for pattern in detected_patterns:
-
-        if pattern.name == "block":
-            for (i, j) in pattern.cells:
-                grid[i][j] = "🟫"
-
-        if pattern.name == "blinker":
-            for (i, j) in pattern.cells:
-                grid[i][j] = "🟦"
+        color = PATTERN_COLORS.get(pattern.name) or KIND_COLORS.get(pattern.kind)
+        if color is None:
+            continue
+        for (i, j) in pattern.cells:
+            grid[i][j] = color
 
     return "\n".join("".join(row) for row in grid)
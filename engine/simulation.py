@@ -0,0 +1,117 @@
+import threading
+from dataclasses import dataclass
+from time import perf_counter
+
+import numpy as np
+
+from engine.game_of_life import GameOfLife
+from engine.metrics import Observer
+from engine.profiling import Profiler, no_phase
+
+
+@dataclass
+class Frame:
+    """Copy of the cells of a viewport at a generation."""
+    cells: np.ndarray
+    viewport: tuple[int, int, int, int]
+    generation: int
+
+
+class Simulation(threading.Thread):
+    """Thread stepping a GameOfLife at most once per interval_s, as fast as possible when it is 0.
+
+    The renderer asks for the cells of its viewport with request and reads
+    the last published frame from frame, a single reference swapped by this
+    thread, so it never waits for a generation. A frame is only copied when
+    one was requested since the last one, unused generations cost nothing.
+    An observer given to watch is added to the engine by this thread too.
+    """
+
+    RATE_PERIOD_S = 0.5
+
+    def __init__(self, engine: GameOfLife, interval_s: float = 0.0, paused: bool = True, profiler: Profiler | None = None) -> None:
+        super().__init__(daemon=True)
+        self.engine = engine
+        self.profiler = profiler
+        self.interval_s = interval_s
+        self.paused = paused
+        # A resumed engine starts at the generation of its checkpoint
+        self.generation = engine.generation
+        self.rate = 0.0
+        self.frame: Frame | None = None
+        self._viewport: tuple[int, int, int, int] | None = None
+        self._observer: Observer | None = None
+        self._watch: tuple[Observer | None] | None = None
+        self._wake = threading.Event()
+        self._stopped = False
+
+    def request(self, top: int, left: int, bottom: int, right: int) -> None:
+        """Ask for a frame of rows [top, bottom) and columns [left, right), published after the current generation."""
+        self._viewport = (top, left, bottom, right)
+        self._wake.set()
+
+    def watch(self, observer: Observer | None) -> None:
+        """Call observer with the Metrics of every next generation, None stops calling the previous one."""
+        self._watch = (observer,)
+        self._wake.set()
+
+    def pause(self) -> None:
+        self.paused = True
+        self._wake.set()
+
+    def resume(self) -> None:
+        self.paused = False
+        self._wake.set()
+
+    def stop(self) -> None:
+        """Stop after the current generation, the engine is closed by the thread."""
+        self._stopped = True
+        self._wake.set()
+
+    def _publish(self) -> None:
+        viewport = self._viewport
+        if viewport is None:
+            return
+        self._viewport = None
+        self.frame = Frame(np.array(self.engine.to_array(*viewport)), viewport, self.generation)
+
+    def _apply_watch(self) -> None:
+        watch = self._watch
+        if watch is None:
+            return
+        self._watch = None
+        if self._observer:
+            self.engine.remove_observer(self._observer)
+        self._observer, = watch
+        if self._observer:
+            self.engine.add_observer(self._observer)
+
+    def run(self) -> None:
+        phase = self.profiler.phase if self.profiler else no_phase
+        next_step = perf_counter()
+        rate_start, rate_generation = perf_counter(), self.generation
+
+        try:
+            while not self._stopped:
+                self._wake.clear()
+                self._apply_watch()
+                self._publish()
+
+                now = perf_counter()
+                if now - rate_start >= self.RATE_PERIOD_S:
+                    self.rate = (self.generation - rate_generation) / (now - rate_start)
+                    rate_start, rate_generation = now, self.generation
+
+                if self.paused:
+                    self._wake.wait(self.RATE_PERIOD_S)
+                    continue
+                if now < next_step:
+                    self._wake.wait(min(next_step - now, self.RATE_PERIOD_S))
+                    continue
+
+                next_step = now + self.interval_s
+                with phase("step"):
+                    self.engine.step()
+                self.generation += 1
+        finally:
+            self.engine.close()
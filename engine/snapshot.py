@@ -0,0 +1,112 @@
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+from config.config import Config
+from engine.bitpacked import WORD_BITS, PackedBoard
+
+
+SNAPSHOT_EXTENSION = ".gol"
+MAGIC = b"GOLB"
+VERSION = 1
+
+# magic, version, encoding, states, reserved, width, height, generation, rule length; little-endian
+HEADER = struct.Struct("<4sBBBxIIQH")
+# The payload starts on a multiple of 8 bytes so the packed words can be mapped in place
+ALIGNMENT = 8
+
+ENCODINGS = {name: code for code, name in enumerate(Config.SNAPSHOT_ENCODINGS)}
+
+
+@dataclass
+class Snapshot:
+    """Board saved at a generation with the rule computing it.
+
+    The cells of a uint8 snapshot and the words of a packed one are
+    memory-mapped from the file, read-only and loaded on first access.
+    """
+    width: int
+    height: int
+    states: int
+    rule: str
+    generation: int
+    encoding: str
+    payload: np.ndarray
+
+    @property
+    def cells(self) -> np.ndarray:
+        """Return the board as a uint8 array, the mapped payload itself for a uint8 snapshot."""
+        if self.encoding == "uint8":
+            return self.payload
+        return self.packed.to_array()
+
+    @property
+    def packed(self) -> PackedBoard:
+        """Return the ALIVE cells packed 64 per word, the mapped payload itself for a packed snapshot."""
+        if self.encoding == "packed":
+            return PackedBoard(self.payload, self.width)
+        return PackedBoard.from_array(self.payload)
+
+
+def is_snapshot(path: str) -> bool:
+    """Return whether a board file is a binary snapshot, by its extension."""
+    return str(path).endswith(SNAPSHOT_EXTENSION)
+
+
+def _payload_offset(rule: bytes) -> int:
+    return -(-(HEADER.size + len(rule)) // ALIGNMENT) * ALIGNMENT
+
+
+def save_snapshot(path: str, board, rule: str = "", generation: int = 0, encoding: str | None = None) -> None:
+    """Write a board as a binary snapshot.
+
+    Two states boards are packed 64 cells per uint64 word by default, other
+    boards keep one byte per cell.
+    """
+    cells = np.asarray(board, dtype=np.uint8)
+    height, width = cells.shape
+    states = max(2, int(cells.max(initial=0)) + 1)
+    encoding = encoding if encoding else ("packed" if states == 2 else "uint8")
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown encoding '{encoding}', expected one of {', '.join(ENCODINGS)}")
+    if encoding == "packed" and states > 2:
+        raise ValueError(f"A packed snapshot only holds DEAD and ALIVE cells, the board has {states} states")
+
+    rule_bytes = rule.encode()
+    payload = PackedBoard.from_array(cells).words.astype("<u8") if encoding == "packed" else cells
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, ENCODINGS[encoding], states, width, height, generation, len(rule_bytes)))
+        f.write(rule_bytes)
+        f.write(bytes(_payload_offset(rule_bytes) - HEADER.size - len(rule_bytes)))
+        f.write(np.ascontiguousarray(payload).tobytes())
+
+
+def load_snapshot(path: str) -> Snapshot:
+    """Read the header of a binary snapshot and map its payload without copying it."""
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header[:4] != MAGIC:
+            raise ValueError(f"{path} is not a board snapshot")
+        _, version, encoding_id, states, width, height, generation, rule_length = HEADER.unpack(header)
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        rule = f.read(rule_length).decode()
+
+    encoding = {value: name for name, value in ENCODINGS.items()}.get(encoding_id)
+    if encoding is None:
+        raise ValueError(f"Unknown snapshot encoding {encoding_id}")
+
+    if encoding == "packed":
+        dtype, shape = np.dtype("<u8"), (height, -(-width // WORD_BITS))
+    else:
+        dtype, shape = np.dtype(np.uint8), (height, width)
+    offset = _payload_offset(rule.encode())
+
+    if width * height == 0:
+        payload = np.zeros(shape, dtype=dtype)
+    else:
+        payload = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+    return Snapshot(width, height, states, rule, generation, encoding, payload)
@@ -0,0 +1,236 @@
+from collections import Counter
+from typing import Callable
+
+import numpy as np
+
+from config.config import Config
+from engine.backend import Backend, plane_of_cells
+from engine.metrics import Metrics, measure_cells
+from rules.compiler import CLASSIC, as_compiled
+from rules.rules import MOORE_NEIGHBORS, respawn_rules, zombie_rules
+
+
+Cell = tuple[int, int]
+
+
+def count_neighbors(
+    cells: set[Cell],
+    neighbors: list[tuple[int, int]],
+    width: int,
+    height: int,
+    boundary: str = "dead"
+) -> Counter:
+    """Return for every cell of the board how many of its neighbors are in cells.
+
+    The neighbors wrap around the edges of a torus, and are all kept on an infinite plane.
+    """
+    if boundary == "torus":
+        return Counter(
+            ((i + di) % height, (j + dj) % width)
+            for i, j in cells
+            for di, dj in neighbors
+        )
+
+    counts = Counter(
+        (i + di, j + dj)
+        for i, j in cells
+        for di, dj in neighbors
+    )
+    if boundary == "infinite":
+        return counts
+
+    return Counter({
+        (i, j): count
+        for (i, j), count in counts.items()
+        if 0 <= i < height and 0 <= j < width
+    })
+
+
+def two_states_logic(alive: set[Cell], alive_neighbors: Counter, birth: frozenset[int], survival: frozenset[int]) -> set[Cell]:
+    # An ALIVE cell without ALIVE neighbors is not counted, it survives under S0
+    return {
+        cell
+        for cell in alive_neighbors.keys() | alive
+        if alive_neighbors[cell] in (survival if cell in alive else birth)
+    }
+
+
+class SparseBackend(Backend):
+    """Backend storing only the non DEAD cells, its cost scales with the population.
+
+    ALIVE cells are kept in a set, ZOMBIE and dying cells in a dict of states.
+    The stochastic rules draw the same noise field as the dense backends, so
+    a seed gives the same generations. On an infinite plane the cells leaving
+    the board keep evolving, with negative coordinates past its top and left.
+    """
+
+    stochastic = True
+    boundaries = ("dead", "torus", "infinite")
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        cells: dict[Cell, int],
+        rules: Callable,
+        ever_alive: np.ndarray | None = None,
+        rng: np.random.Generator | None = None,
+        boundary: str | None = None
+    ) -> None:
+        super().__init__(width, height, rules, boundary)
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        self.rule = as_compiled(rules)
+        if self.rule is not None:
+            if 0 in self.rule.spec.birth:
+                raise ValueError("B0 rules give birth in empty space, the sparse backend cannot run them")
+            self._step = self._compiled_step
+        elif rules == respawn_rules:
+            self._step = self._respawn_step
+        elif rules == zombie_rules:
+            self._step = self._zombie_step
+        else:
+            raise ValueError(f"Rule '{getattr(rules, '__name__', rules)}' is not supported by the sparse backend")
+        if self.rule is None and not self.bounded:
+            raise ValueError("The stochastic rules draw the noise of the board cells, the sparse backend cannot run them on an infinite plane")
+
+        self.alive = {cell for cell, state in cells.items() if state == Config.ALIVE}
+        self.states = {cell: state for cell, state in cells.items() if state not in (Config.DEAD, Config.ALIVE)}
+        self._ever_alive = np.zeros((height, width), dtype=bool) if ever_alive is None else np.array(ever_alive, dtype=bool)
+        self._mark_alive()
+        self._board = None
+
+    @classmethod
+    def from_board(cls, board: list[list[int]], rules: Callable, ever_alive: np.ndarray, **options) -> "SparseBackend":
+        cells = {
+            (i, j): cell
+            for i, row in enumerate(board)
+            for j, cell in enumerate(row)
+            if cell != Config.DEAD
+        }
+        return cls(len(board[0]), len(board), cells, rules, ever_alive, **options)
+
+    @classmethod
+    def from_plane(
+        cls,
+        cells: np.ndarray,
+        rules: Callable,
+        ever_alive: np.ndarray,
+        window: tuple[int, int, int, int],
+        **options
+    ) -> "SparseBackend":
+        if (options.get("boundary") or cls.boundaries[0]) != "infinite":
+            return super().from_plane(cells, rules, ever_alive, window, **options)
+        top, left, bottom, right = window
+        rows, cols = np.nonzero(cells != Config.DEAD)
+        plane = dict(zip(zip((rows - top).tolist(), (cols - left).tolist()), cells[rows, cols].tolist()))
+        return cls(right - left, bottom - top, plane, rules, ever_alive[top:bottom, left:right], **options)
+
+    def plane(self) -> tuple[np.ndarray, np.ndarray, tuple[int, int]]:
+        if self.bounded:
+            return super().plane()
+        return plane_of_cells(self.width, self.height, {**dict.fromkeys(self.alive, Config.ALIVE), **self.states}, self._ever_alive)
+
+    @property
+    def board(self) -> list[list[int]]:
+        if self._board is None:
+            # The cells of an infinite plane outside of the board are left out
+            self._board = self.to_array().tolist()
+        return self._board
+
+    @property
+    def ever_alive(self) -> np.ndarray:
+        return self._ever_alive
+
+    def population(self) -> int:
+        if not self.bounded:
+            return super().population()
+        return len(self.alive)
+
+    def to_array(self, top: int = 0, left: int = 0, bottom: int | None = None, right: int | None = None) -> np.ndarray:
+        top, bottom, _ = slice(top, bottom).indices(self.height)
+        left, right, _ = slice(left, right).indices(self.width)
+        window = np.zeros((max(bottom - top, 0), max(right - left, 0)), dtype=np.uint8)
+        for i, j in self.alive:
+            if top <= i < bottom and left <= j < right:
+                window[i - top, j - left] = Config.ALIVE
+        for (i, j), state in self.states.items():
+            if top <= i < bottom and left <= j < right:
+                window[i - top, j - left] = state
+        return window
+
+    def _inside(self, cells: set[Cell] | dict[Cell, int]) -> set[Cell] | dict[Cell, int]:
+        """Return the cells of the board, all of them on a bounded board."""
+        if self.bounded:
+            return cells
+        if isinstance(cells, dict):
+            return {(i, j): state for (i, j), state in cells.items() if 0 <= i < self.height and 0 <= j < self.width}
+        return {(i, j) for i, j in cells if 0 <= i < self.height and 0 <= j < self.width}
+
+    def census(self, previous: object = None) -> set[Cell]:
+        # A step replaces the set of the ALIVE cells, it is kept without a copy
+        return self._inside(self.alive)
+
+    def measure(self, previous: set[Cell], generation: int, step_s: float) -> Metrics:
+        return measure_cells(previous, self._inside(self.alive), self._inside(self.states), generation, step_s)
+
+    def _mark_alive(self) -> None:
+        if not self.alive:
+            return
+        rows, cols = np.array(list(self.alive)).T
+        if not self.bounded:
+            inside = (rows >= 0) & (rows < self.height) & (cols >= 0) & (cols < self.width)
+            rows, cols = rows[inside], cols[inside]
+        self._ever_alive[rows, cols] = True
+
+    def step(self) -> None:
+        self._step()
+        self._mark_alive()
+        self._board = None
+
+    def _compiled_step(self) -> None:
+        rule = self.rule
+        alive_neighbors = count_neighbors(self.alive, rule.neighbors, self.width, self.height, self.boundary)
+
+        if rule.spec.states == 2:
+            # Any other state behaves as DEAD under a two states rule
+            self.alive = two_states_logic(self.alive, alive_neighbors, rule.spec.birth, rule.spec.survival)
+            self.states = {}
+            return
+
+        alive = set()
+        states = {}
+        for cell in alive_neighbors.keys() | self.alive | self.states.keys():
+            state = Config.ALIVE if cell in self.alive else self.states.get(cell, Config.DEAD)
+            next_state = rule.transitions[state][alive_neighbors[cell]]
+            if next_state == Config.ALIVE:
+                alive.add(cell)
+            elif next_state != Config.DEAD:
+                states[cell] = next_state
+
+        self.alive = alive
+        self.states = states
+
+    def _respawn_step(self) -> None:
+        alive_neighbors = count_neighbors(self.alive, MOORE_NEIGHBORS, self.width, self.height, self.boundary)
+        noise = self.rng.random((self.height, self.width))
+        rows, cols = np.nonzero(self._ever_alive & (noise <= 0.01))
+        respawned = set(zip(rows.tolist(), cols.tolist())) - self.alive
+        self.alive = two_states_logic(self.alive, alive_neighbors, CLASSIC.spec.birth, CLASSIC.spec.survival) | respawned
+        self.states = {}
+
+    def _zombie_step(self) -> None:
+        zombies = self.states.keys()
+        alive_neighbors = count_neighbors(self.alive, MOORE_NEIGHBORS, self.width, self.height, self.boundary)
+        zombie_neighbors = count_neighbors(zombies, MOORE_NEIGHBORS, self.width, self.height, self.boundary)
+
+        noise = self.rng.random((self.height, self.width))
+        bitten = {(i, j) for i, j in self.alive if noise[i, j] < 0.001}
+        bitten |= {
+            cell
+            for cell in self.alive
+            if alive_neighbors[cell] == 0 and zombie_neighbors[cell] >= 1
+        }
+
+        self.states = dict.fromkeys(zombies | bitten, Config.ZOMBIE)
+        self.alive = two_states_logic(self.alive, alive_neighbors, CLASSIC.spec.birth, CLASSIC.spec.survival) - self.states.keys()
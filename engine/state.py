@@ -1,6 +1,7 @@
-import random
 from typing import Callable
 
+import numpy as np
+
 from config.config import Config
 
 
@@ -8,29 +9,34 @@ def dead_state(width: int, height: int) -> list[list[int]]:
     """Return a grid of DEAD cell of size height x width."""
     return [[Config.DEAD for _ in range(width)] for _ in range(height)] 
 
-def random_state(width: int, height: int) -> list[list[int]]:
-    """Return a grid of size height x width filled with random 0/1 values."""
-    return [
-        [random.choice([Config.DEAD, Config.ALIVE]) for _ in range(width)]
-        for _ in range(height)
-    ]
-
-def next_board_state(board: list[list[int]], rule: Callable[[int, int], int], ever_alive: set) -> tuple[list[list[int]], set[tuple[int, int]]]:
-    """Return the next board state given a board, following the classic rules of the game of life."""
+def random_state(width: int, height: int, density: float = 0.5, rng: np.random.Generator | None = None) -> list[list[int]]:
+    """Return a grid of size height x width where each cell is ALIVE with probability density, drawn from rng."""
+    if not 0 <= density <= 1:
+        raise ValueError(f"density must be between 0 and 1, got {density}")
+    rng = rng if rng is not None else np.random.default_rng()
+    return np.where(rng.random((height, width)) < density, Config.ALIVE, Config.DEAD).tolist()
+
+def next_board_state(
+    board: list[list[int]],
+    rule: Callable[[int, int], int],
+    ever_alive: np.ndarray,
+    noise: list[list[float]] | None = None
+) -> tuple[list[list[int]], np.ndarray]:
+    """Return the next board state given a board, following the classic rules of the game of life.
+
+    ever_alive is a boolean array of the cells ever ALIVE, updated in place.
+    noise holds the random number of every cell for the stochastic rules.
+    """
     width = len(board[0])
     height = len(board)
     result = dead_state(width, height)
-
-    new_alive_cells = []
+    # The deterministic rules do not take a noise field
+    arguments = (ever_alive,) if noise is None else (ever_alive, noise)
 
     for i in range(height):
         for j in range(width):
-            cell_state = rule(board, i, j, ever_alive)
-            if cell_state == Config.ALIVE:
-                new_alive_cells.append((i,j))
-            result[i][j] = cell_state
-
+            result[i][j] = rule(board, i, j, *arguments)
 
-    ever_alive.update(new_alive_cells)
+    ever_alive |= np.array(result, dtype=np.uint8) == Config.ALIVE
 
     return result, ever_alive
@@ -0,0 +1,182 @@
+import csv
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, replace
+from time import perf_counter
+from typing import Iterable, Iterator, TextIO
+
+from engine.backends import BACKENDS
+from engine.game_of_life import GameOfLife
+from rules.compiler import STOCHASTIC_RULES, resolve_rule
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    """Parameters of one simulation of a sweep, the rule is a name of NAMED_RULES or a rulestring."""
+    rule: str
+    width: int
+    height: int
+    density: float
+    seed: int
+    generations: int
+    backend: str = "numpy"
+
+    @property
+    def key(self) -> str:
+        """Return the identifier of the run, used to skip completed runs when resuming."""
+        return f"{self.rule}|{self.width}x{self.height}|{self.density}|{self.seed}|{self.generations}|{self.backend}"
+
+
+FIELDS = [
+    "key",
+    *SweepPoint.__dataclass_fields__,
+    "initial_population",
+    "final_population",
+    "peak_population",
+    "extinct_at",
+    "period",
+    "cycle_start",
+    "elapsed_s",
+]
+
+
+def sweep_grid(
+    rules: Iterable[str],
+    sizes: Iterable[tuple[int, int]],
+    densities: Iterable[float],
+    seeds: Iterable[int],
+    generations: Iterable[int],
+    backend: str = "numpy"
+) -> list[SweepPoint]:
+    """Return every combination of the parameters."""
+    return [
+        SweepPoint(rule, width, height, density, seed, generation_count, backend)
+        for rule, (width, height), density, seed, generation_count
+        in itertools.product(rules, sizes, densities, seeds, generations)
+    ]
+
+
+def create_game(point: SweepPoint) -> GameOfLife:
+    """Return the game simulated for a point, its random board drawn from the seed."""
+    rule = resolve_rule(point.rule)
+    return GameOfLife(
+        width=point.width,
+        height=point.height,
+        rules=rule,
+        backend=point.backend,
+        density=point.density,
+        seed=point.seed,
+        # A backend running an infinite plane by default never repeats a bounded board
+        detect_cycles=rule not in STOCHASTIC_RULES and BACKENDS[point.backend].boundaries[0] != "infinite",
+    )
+
+
+def check_point(point: SweepPoint) -> None:
+    """Raise ValueError when the point cannot run, by computing a generation of a small board of it.
+
+    Some backends only refuse a rule at its first step, a point failing in a
+    worker would otherwise end the sweep with the traceback of the worker.
+    """
+    game = create_game(replace(point, width=4, height=4))
+    try:
+        game.step()
+    finally:
+        game.close()
+
+
+def run_point(point: SweepPoint) -> dict:
+    """Simulate a random board of the point and return its parameters with the population statistics.
+
+    The run stops early when the population dies out, extinct_at is then
+    the generation of the extinction. With a deterministic rule it also
+    stops once the board repeats: period and cycle_start give the cycle,
+    every board of it was already counted in the peak, and the final
+    population comes from jumping to the last generation.
+    """
+    start = perf_counter()
+    game = create_game(point)
+
+    try:
+        population = initial_population = peak_population = game.population()
+        extinct_at = 0 if population == 0 else None
+        while extinct_at is None and game.period is None and game.generation < point.generations:
+            game.step()
+            population = game.population()
+            peak_population = max(peak_population, population)
+            if population == 0:
+                extinct_at = game.generation
+        if extinct_at is None and game.period:
+            game.advance(point.generations - game.generation)
+            population = game.population()
+    finally:
+        game.close()
+
+    return {
+        "key": point.key,
+        **asdict(point),
+        "initial_population": initial_population,
+        "final_population": population,
+        "peak_population": peak_population,
+        "extinct_at": extinct_at,
+        "period": game.period,
+        "cycle_start": game.cycles.start if game.cycles else None,
+        "elapsed_s": round(perf_counter() - start, 6),
+    }
+
+
+def sweep(points: Iterable[SweepPoint], workers: int | None = None, completed: set[str] = frozenset()) -> Iterator[dict]:
+    """Run the points missing from completed over a pool of worker processes, yield the results as they complete."""
+    pending = [point for point in points if point.key not in completed]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_point, point) for point in pending]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def output_format(path: str | None) -> str:
+    """Return csv for a .csv path, jsonl otherwise."""
+    return "csv" if path and path.endswith(".csv") else "jsonl"
+
+
+def completed_keys(path: str, format: str) -> set[str]:
+    """Return the keys of the results already written to a sweep output, none when it does not exist."""
+    if not os.path.exists(path):
+        return set()
+
+    with open(path, newline="") as f:
+        if format == "csv":
+            return {row["key"] for row in csv.DictReader(f)}
+        return {json.loads(line)["key"] for line in f if line.strip()}
+
+
+def open_results(path: str, resume: bool) -> TextIO:
+    """Open a sweep output, when resuming append after the last complete line written before a crash."""
+    if not (resume and os.path.exists(path)):
+        return open(path, "w", newline="")
+
+    with open(path, "rb+") as f:
+        content = f.read()
+        f.truncate(content.rfind(b"\n") + 1)
+    return open(path, "a", newline="")
+
+
+class ResultWriter:
+    """Write sweep results one by one, flushing each so a crash loses at most the running simulations."""
+
+    def __init__(self, stream: TextIO, format: str) -> None:
+        self.stream = stream
+        self.format = format
+        if format == "csv":
+            self._writer = csv.DictWriter(stream, FIELDS)
+            if not stream.seekable() or stream.tell() == 0:
+                self._writer.writeheader()
+
+    def write(self, result: dict) -> None:
+        if self.format == "csv":
+            self._writer.writerow(result)
+        else:
+            self.stream.write(json.dumps(result) + "\n")
+        self.stream.flush()
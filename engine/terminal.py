@@ -0,0 +1,154 @@
+import os
+import shutil
+import sys
+from typing import TextIO
+
+import numpy as np
+
+from config.config import Config
+from engine.patterns import Pattern
+from engine.render import KIND_COLORS, PATTERN_COLORS
+
+
+STATE_GLYPHS = ["⬛", "⬜", "🟩", "🟥"]
+PATTERN_GLYPHS = list(dict.fromkeys([*PATTERN_COLORS.values(), *KIND_COLORS.values()]))
+HALFBLOCK_GLYPHS = [" ", "▀", "▄", "█"]
+
+# Weight of every cell of the block of cells drawn by one character, the code of a character is the sum of the weights of its non DEAD cells
+BLOCK_WEIGHTS = {
+    "halfblock": np.array([[1], [2]]),
+    # Braille dots 1 to 8, the code is the offset from U+2800
+    "braille": np.array([[0x01, 0x08], [0x02, 0x10], [0x04, 0x20], [0x40, 0x80]]),
+}
+
+DISPLAY_MODES = Config.DISPLAY_MODES
+
+ESC = "\x1b["
+
+
+class TerminalRenderer:
+    """Draw boards in an ANSI terminal, writing only the characters changed since the last frame.
+
+    emoji draws one cell per character with the colors of render, halfblock
+    and braille draw 2x1 and 4x2 cells per character to fit larger boards.
+    Boards larger than the terminal are cropped to its size.
+    """
+
+    def __init__(self, mode: str = "emoji", stream: TextIO | None = None, size: tuple[int, int] | None = None) -> None:
+        if mode not in DISPLAY_MODES:
+            raise ValueError(f"Unknown display mode '{mode}', expected one of {', '.join(DISPLAY_MODES)}")
+
+        self.mode = mode
+        self.stream = stream if stream else sys.stdout
+        self.size = size
+        self._codes = None
+
+        if mode == "emoji":
+            self.block = (1, 1)
+            self.glyph_width = 2
+            self.glyphs = STATE_GLYPHS + PATTERN_GLYPHS
+        else:
+            self.block = BLOCK_WEIGHTS[mode].shape
+            self.glyph_width = 1
+            self.glyphs = HALFBLOCK_GLYPHS if mode == "halfblock" else [chr(0x2800 + code) for code in range(256)]
+
+        if os.name == "nt":
+            # Turn on the ANSI escape sequences of the Windows console
+            os.system("")
+
+    def viewport(self, width: int, height: int) -> tuple[int, int]:
+        """Return the rows and columns of characters drawn for a board, the board is cropped to the terminal."""
+        columns, lines = self.size if self.size else shutil.get_terminal_size()
+        rows_per, cols_per = self.block
+        return min(-(-height // rows_per), lines), min(-(-width // cols_per), columns // self.glyph_width)
+
+    def codes(self, board, patterns: list[Pattern] | None = None) -> np.ndarray:
+        """Return the glyph index of every character drawn for a board."""
+        rows, cols = self.viewport(len(board[0]), len(board))
+        rows_per, cols_per = self.block
+        cells = np.asarray(board)[:rows * rows_per, :cols * cols_per]
+
+        if self.mode == "emoji":
+            codes = np.minimum(cells, len(STATE_GLYPHS) - 1).astype(np.int64)
+            for pattern in patterns or []:
+                color = PATTERN_COLORS.get(pattern.name) or KIND_COLORS.get(pattern.kind)
+                if color is None:
+                    continue
+                for i, j in pattern.cells:
+                    if i < rows and j < cols:
+                        codes[i, j] = self.glyphs.index(color)
+            return codes
+
+        # Pad with DEAD cells to whole blocks, then sum the weights of every block
+        padded = np.zeros((rows * rows_per, cols * cols_per), dtype=bool)
+        padded[:cells.shape[0], :cells.shape[1]] = cells != Config.DEAD
+        blocks = padded.reshape(rows, rows_per, cols, cols_per)
+        return np.einsum("ikjl,kl->ij", blocks.astype(np.int64), BLOCK_WEIGHTS[self.mode])
+
+    def _code(self, board: list[list[int]], row: int, col: int) -> int:
+        """Return the glyph index of one character, reading only its cells."""
+        if self.mode == "emoji":
+            return min(board[row][col], len(STATE_GLYPHS) - 1)
+
+        weights = BLOCK_WEIGHTS[self.mode]
+        rows_per, cols_per = self.block
+        code = 0
+        for k in range(rows_per):
+            for l in range(cols_per):
+                i, j = row * rows_per + k, col * cols_per + l
+                if i < len(board) and j < len(board[0]) and board[i][j] != Config.DEAD:
+                    code += int(weights[k, l])
+        return code
+
+    def draw(self, board, patterns: list[Pattern] | None = None, dirty: set[tuple[int, int]] | None = None) -> None:
+        """Draw a board in one write.
+
+        The first frame and the frames after a resize clear the screen, the
+        others only move the cursor to the changed characters. dirty, the
+        cells changed since the last drawn board, spares comparing the whole
+        viewport; it is ignored with patterns, their colors depend on the
+        cells around them.
+        """
+        rows, cols = self.viewport(len(board[0]), len(board))
+        previous = self._codes
+
+        if previous is None or previous.shape != (rows, cols):
+            codes = self.codes(board, patterns)
+            frame = [f"{ESC}?25l{ESC}2J"]
+            for i, row in enumerate(codes.tolist()):
+                frame.append(f"{ESC}{i + 1};1H" + "".join(self.glyphs[code] for code in row))
+
+        elif dirty is not None and not patterns and len(dirty) * 8 < rows * cols:
+            # Few changes: only read the characters holding a changed cell
+            rows_per, cols_per = self.block
+            codes = previous
+            changed = sorted({(i // rows_per, j // cols_per) for i, j in dirty if i < rows * rows_per and j < cols * cols_per})
+            for i, j in changed:
+                codes[i, j] = self._code(board, i, j)
+            frame = self._moves(changed, codes)
+
+        else:
+            codes = self.codes(board, patterns)
+            changed = zip(*(indices.tolist() for indices in np.nonzero(codes != previous)))
+            frame = self._moves(changed, codes)
+
+        self._codes = codes
+        self.stream.write("".join(frame))
+        self.stream.flush()
+
+    def _moves(self, changed, codes: np.ndarray) -> list[str]:
+        """Return the writes of the changed characters, in row-major order, moving the cursor only between runs."""
+        frame = []
+        cursor = None
+        for i, j in changed:
+            if cursor != (i, j):
+                frame.append(f"{ESC}{i + 1};{j * self.glyph_width + 1}H")
+            frame.append(self.glyphs[codes[i, j]])
+            cursor = (i, j + 1)
+        return frame
+
+    def close(self) -> None:
+        """Clear the screen and show the cursor again."""
+        self.stream.write(f"{ESC}2J{ESC}H{ESC}?25h")
+        self.stream.flush()
+        self._codes = None
@@ -0,0 +1,141 @@
+import multiprocessing
+import os
+import weakref
+from multiprocessing import shared_memory
+from multiprocessing.pool import Pool
+from typing import Callable
+
+import numpy as np
+
+from config.config import Config
+from engine.backend import Backend
+from engine.vectorized import count_neighbors, to_array
+from rules.compiler import as_compiled
+
+
+# Views on the shared boards, set in each worker by _init_worker
+_worker_state: dict = {}
+
+
+def _init_worker(
+    names: list[str],
+    shape: tuple[int, int],
+    table: np.ndarray,
+    neighbors: list[tuple[int, int]],
+    torus: bool
+) -> None:
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    _worker_state["blocks"] = blocks
+    _worker_state["boards"] = [np.ndarray(shape, dtype=np.uint8, buffer=block.buf) for block in blocks[:2]]
+    _worker_state["history"] = np.ndarray(shape, dtype=bool, buffer=blocks[2].buf)
+    _worker_state["table"] = table
+    _worker_state["neighbors"] = neighbors
+    _worker_state["torus"] = torus
+
+
+def step_band(source: int, start: int, stop: int) -> None:
+    """Compute rows [start, stop) of the next board from the shared board source, reading a one row halo."""
+    board = _worker_state["boards"][source]
+    result = _worker_state["boards"][1 - source]
+    history = _worker_state["history"]
+
+    # The halo rows are read from the neighbouring bands, their own counts are discarded
+    if _worker_state["torus"]:
+        # The halo rows of the first and last bands wrap around, the counts wrap the columns
+        top = start - 1
+        window = board.take(range(top, stop + 1), axis=0, mode="wrap")
+    else:
+        top = max(start - 1, 0)
+        window = board[top:min(stop + 1, len(board))]
+    alive_neighbors = count_neighbors(window == Config.ALIVE, _worker_state["neighbors"], _worker_state["torus"])
+    band = _worker_state["table"][window, alive_neighbors][start - top:stop - top]
+
+    result[start:stop] = band
+    history[start:stop] |= band == Config.ALIVE
+
+
+def _release(pool: Pool, blocks: list[shared_memory.SharedMemory]) -> None:
+    pool.terminate()
+    pool.join()
+    for block in blocks:
+        block.unlink()
+        try:
+            block.close()
+        except BufferError:
+            # A view on the board is still referenced, the mapping goes away with it
+            pass
+
+
+class TiledBackend(Backend):
+    """Backend splitting the board into row bands stepped by a pool of worker processes.
+
+    The boards live in shared memory, so only band bounds are sent to the
+    workers each generation. The result is identical to the numpy backend.
+    """
+
+    boundaries = ("dead", "torus")
+
+    def __init__(
+        self,
+        board: list[list[int]],
+        rules: Callable,
+        ever_alive: np.ndarray,
+        workers: int | None = None,
+        boundary: str | None = None
+    ) -> None:
+        super().__init__(len(board[0]), len(board), rules, boundary)
+
+        rule = as_compiled(rules)
+        if rule is None:
+            raise ValueError(
+                f"Rule '{getattr(rules, '__name__', rules)}' is not supported by the tiled backend, it only runs deterministic rules"
+            )
+
+        self.workers = workers if workers else os.cpu_count() or 1
+        shape = (self.height, self.width)
+        size = self.height * self.width
+
+        self._blocks = [shared_memory.SharedMemory(create=True, size=max(size, 1)) for _ in range(3)]
+        self._boards = [np.ndarray(shape, dtype=np.uint8, buffer=block.buf) for block in self._blocks[:2]]
+        self._history = np.ndarray(shape, dtype=bool, buffer=self._blocks[2].buf)
+        self._boards[0][:] = to_array(board)
+        self._history[:] = ever_alive
+        self._source = 0
+        self._board = None
+
+        bounds = np.linspace(0, self.height, min(self.workers, self.height) + 1, dtype=int)
+        self._bands = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+        self._pool = multiprocessing.Pool(
+            self.workers,
+            initializer=_init_worker,
+            initargs=([block.name for block in self._blocks], shape, rule.table, rule.neighbors, self.boundary == "torus"),
+        )
+        self._finalizer = weakref.finalize(self, _release, self._pool, self._blocks)
+
+    @property
+    def array(self) -> np.ndarray:
+        """Return the current board, a view on the shared memory."""
+        return self._boards[self._source]
+
+    @property
+    def board(self) -> list[list[int]]:
+        if self._board is None:
+            self._board = self.array.tolist()
+        return self._board
+
+    @property
+    def ever_alive(self) -> np.ndarray:
+        return self._history
+
+    def to_array(self, top: int = 0, left: int = 0, bottom: int | None = None, right: int | None = None) -> np.ndarray:
+        return self.array[top:bottom, left:right]
+
+    def step(self) -> None:
+        self._pool.starmap(step_band, [(self._source, start, stop) for start, stop in self._bands])
+        self._source = 1 - self._source
+        self._board = None
+
+    def close(self) -> None:
+        self._boards = self._history = None
+        self._finalizer()
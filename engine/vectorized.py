@@ -0,0 +1,102 @@
+from typing import Callable
+
+import numpy as np
+
+from config.config import Config
+from rules.compiler import CLASSIC, CompiledRule, as_compiled
+from rules.rules import MOORE_NEIGHBORS, respawn_rules, zombie_rules
+
+
+def to_array(board: list[list[int]]) -> np.ndarray:
+    """Return the board as a 2D uint8 array."""
+    return np.asarray(board, dtype=np.uint8)
+
+def _axis_slices(size: int, d: int, torus: bool) -> list[tuple[slice, slice]]:
+    """Return the (cell, neighbor) slices of an axis where every cell x reads its neighbor x + d.
+
+    On a torus the neighbors past an edge are read from the opposite one by a second pair of slices.
+    """
+    slices = [(slice(max(0, -d), size - max(0, d)), slice(max(0, d), size - max(0, -d)))]
+    if torus and d > 0:
+        slices.append((slice(size - d, size), slice(0, d)))
+    elif torus and d < 0:
+        slices.append((slice(0, -d), slice(size + d, size)))
+    return slices
+
+def count_neighbors(mask: np.ndarray, neighbors: list[tuple[int, int]], torus: bool = False) -> np.ndarray:
+    """Return for every cell how many of its neighbors are set in mask.
+
+    Cells outside the board are DEAD, or the edges wrap around on a torus.
+    """
+    height, width = mask.shape
+    counts = np.zeros(mask.shape, dtype=np.uint8)
+
+    for di, dj in neighbors:
+        for rows, neighbor_rows in _axis_slices(height, di, torus):
+            for cols, neighbor_cols in _axis_slices(width, dj, torus):
+                counts[rows, cols] += mask[neighbor_rows, neighbor_cols]
+
+    return counts
+
+def evaluate(rule: CompiledRule, board: np.ndarray, torus: bool = False) -> np.ndarray:
+    """Return the next state of every cell by looking up the transition table of a compiled rule."""
+    alive_neighbors = count_neighbors(board == Config.ALIVE, rule.neighbors, torus)
+    return rule.table[board, alive_neighbors]
+
+
+def respawn_rules_vectorized(board: np.ndarray, ever_alive: np.ndarray, noise: np.ndarray, torus: bool = False) -> np.ndarray:
+    """Vectorized counterpart of rules.rules.respawn_rules."""
+    result = evaluate(CLASSIC, board, torus)
+
+    respawned = (board == Config.DEAD) & ever_alive & (noise <= 0.01)
+    result[respawned] = Config.ALIVE
+
+    return result
+
+
+def zombie_rules_vectorized(board: np.ndarray, ever_alive: np.ndarray, noise: np.ndarray, torus: bool = False) -> np.ndarray:
+    """Vectorized counterpart of rules.rules.zombie_rules."""
+    alive = board == Config.ALIVE
+    zombie = board == Config.ZOMBIE
+    alive_neighbors = count_neighbors(alive, MOORE_NEIGHBORS, torus)
+    zombie_neighbors = count_neighbors(zombie, MOORE_NEIGHBORS, torus)
+    result = CLASSIC.table[board, alive_neighbors]
+
+    bitten = alive & (noise < 0.001)
+    bitten |= alive & (alive_neighbors == 0) & (zombie_neighbors >= 1)
+    result[bitten | zombie] = Config.ZOMBIE
+
+    return result
+
+
+STOCHASTIC_RULES = {
+    respawn_rules: respawn_rules_vectorized,
+    zombie_rules: zombie_rules_vectorized,
+}
+
+
+def next_board_state_vectorized(
+    board: np.ndarray,
+    rule: Callable,
+    ever_alive: np.ndarray,
+    noise: np.ndarray | None = None,
+    torus: bool = False
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the next board state of a uint8 board, ever_alive is a boolean array updated in place.
+
+    noise holds the random number of every cell for the stochastic rules, a new field is drawn without it.
+    With torus the edges of the board wrap around.
+    """
+    compiled = as_compiled(rule)
+
+    if compiled is not None:
+        result = evaluate(compiled, board, torus)
+    elif rule in STOCHASTIC_RULES:
+        noise = noise if noise is not None else np.random.default_rng().random(board.shape)
+        result = STOCHASTIC_RULES[rule](board, ever_alive, noise, torus)
+    else:
+        raise ValueError(f"Rule '{getattr(rule, '__name__', rule)}' has no vectorized implementation")
+
+    ever_alive |= result == Config.ALIVE
+
+    return result, ever_alive
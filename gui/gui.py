@@ -1,12 +1,23 @@
+import numpy as np
 import pygame
-import time
 from config.config import Config
+from engine.checkpoint import load_checkpoint
 from engine.game_of_life import GameOfLife
+from engine.profiling import Profiler, no_phase
+from engine.render import PALETTE
+from engine.simulation import Simulation
+from rules.compiler import resolve_rule
 from rules.rules import classic_rules, zombie_rules, von_neumann_rules, respawn_rules
 
 
 class GameGUI:
-    def __init__(self):
+    def __init__(
+        self,
+        checkpoint: str | None = None,
+        checkpoint_every: int = 1000,
+        resume_from: str | None = None,
+        profiler: Profiler | None = None
+    ):
         pygame.init()
 
         self.screen = pygame.display.set_mode((Config.WINDOW_WIDTH, Config.WINDOW_HEIGHT))
@@ -15,35 +26,52 @@ class GameGUI:
         self.font = pygame.font.Font(None, 30)
 
         self.engine = None
-        self.board = None
+        self.simulation = None
+        self.metrics = None
+        # The engine only measures its generations while the metrics are shown
+        self.metrics_shown = False
         self.offset_x = 0
         self.offset_y = 0
         self.cell_size = float(Config.CELL_SIZE)
         self.paused = True
         self.current_view = "game"
         self.running = True
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        # Only the first game continues the checkpoint, the next ones start from the settings
+        self.resume_from = resume_from
+        # Times the step phase in the simulation thread and the drawing phases in this one
+        self.profiler = profiler
 
         self.current_speed = "Fast"
-        self.last_update = time.time()
         self.current_board_size = "Medium"
         self.RULES = {
             "Classic": classic_rules,
             "Zombie": zombie_rules,
             "Von Neumann": von_neumann_rules,
-            "Respawn": respawn_rules
+            "Respawn": respawn_rules,
+            "HighLife": "B36/S23",
+            "Seeds": "B2/S"
         }
         self.current_rule = "Classic"
         self.current_file = None
+        self.BOUNDARIES = {
+            "Dead edge": "dead",
+            "Torus": "torus",
+            "Infinite": "infinite"
+        }
+        self.current_boundary = "Dead edge"
 
         self.start_button = self.create_side_button(0)
         self.settings_button = self.create_side_button(1)
         self.reset_button = self.create_side_button(2)
         self.exit_button = self.create_side_button(3)
 
-        self.speed_buttons = self.create_horizontal_buttons(["Fast", "Medium", "Slow"], 60)
+        self.speed_buttons = self.create_horizontal_buttons(list(Config.SPEEDS), 60)
         self.size_buttons = self.create_horizontal_buttons(["Small", "Medium", "Big"], 160)
-        self.rule_buttons = self.create_horizontal_buttons(["Classic", "Zombie", "Von Neumann", "Respawn"], 260)
-        self.file_buttons = self.create_horizontal_buttons(["Blinker", "Pulsar", "LWS"], 360)
+        self.rule_buttons = self.create_horizontal_buttons(list(self.RULES), 260)
+        self.file_buttons = self.create_horizontal_buttons(list(Config.BOARD_FILES), 360)
+        self.boundary_buttons = self.create_horizontal_buttons(list(self.BOUNDARIES), 460)
 
     def create_side_button(self, index):
         return pygame.Rect(
@@ -65,24 +93,55 @@ class GameGUI:
 
     def create_engine(self):
         width, height = Config.BOARD_SIZES[self.current_board_size]
-        rules = self.RULES[self.current_rule]
+        rules = resolve_rule(self.RULES[self.current_rule])
         file = Config.BOARD_FILES[self.current_file] if self.current_file else None
-        self.engine = GameOfLife(width=width, height=height, rules=rules, file=file)
-        self.board = self.engine.board
+        # A resumed game keeps the boundary of its checkpoint, read once and handed to the engine
+        saved = load_checkpoint(self.resume_from) if self.resume_from else None
+        boundary = saved.boundary if saved else self.BOUNDARIES[self.current_boundary]
+        # The python backend has no infinite plane
+        backend = "numpy" if boundary == "infinite" else "python"
+        checkpointing = {"checkpoint": self.checkpoint, "checkpoint_every": self.checkpoint_every}
+        if saved:
+            self.engine = GameOfLife(resume_from=saved, backend=backend, **checkpointing)
+            self.resume_from = None
+        else:
+            self.engine = GameOfLife(
+                width=width, height=height, rules=rules, file=file, backend=backend, boundary=boundary, **checkpointing
+            )
+        self.simulation = Simulation(self.engine, Config.SPEEDS[self.current_speed], self.paused, self.profiler)
+        if self.metrics_shown:
+            self.simulation.watch(self.show_metrics)
+        self.simulation.start()
+
+    def toggle_metrics(self):
+        self.metrics_shown = not self.metrics_shown
+        self.metrics = None
+        if self.simulation:
+            # Called by the simulation thread, the panel reads the last metrics swapped in
+            self.simulation.watch(self.show_metrics if self.metrics_shown else None)
+
+    def show_metrics(self, metrics):
+        self.metrics = metrics
 
     def reset(self):
+        if self.simulation:
+            self.simulation.stop()
         self.engine = None
-        self.board = None
+        self.simulation = None
+        self.metrics = None
         self.offset_x = 0
         self.offset_y = 0
         self.paused = True
-        self.last_update = time.time()
 
     def handle_mouse(self, event):
         if self.start_button.collidepoint(event.pos):
             self.paused = not self.paused
             if self.engine is None:
                 self.create_engine()
+            elif self.paused:
+                self.simulation.pause()
+            else:
+                self.simulation.resume()
 
         elif self.settings_button.collidepoint(event.pos):
             self.current_view = "settings" if self.current_view == "game" else "game"
@@ -100,6 +159,8 @@ class GameGUI:
         for name, rect in self.speed_buttons.items():
             if rect.collidepoint(pos):
                 self.current_speed = name
+                if self.simulation:
+                    self.simulation.interval_s = Config.SPEEDS[name]
 
         if self.engine is None:
             for name, rect in self.size_buttons.items():
@@ -114,6 +175,10 @@ class GameGUI:
                 if rect.collidepoint(pos):
                     self.current_file = name
 
+            for name, rect in self.boundary_buttons.items():
+                if rect.collidepoint(pos):
+                    self.current_boundary = name
+
     def handle_keyboard(self, event):
         if event.key == pygame.K_LEFT:
             self.offset_x -= Config.SCROLL_SPEED
@@ -123,6 +188,8 @@ class GameGUI:
             self.offset_y -= Config.SCROLL_SPEED
         elif event.key == pygame.K_DOWN:
             self.offset_y += Config.SCROLL_SPEED
+        elif event.key == pygame.K_m:
+            self.toggle_metrics()
 
     def handle_zoom(self, event):
         mouse_x, mouse_y = pygame.mouse.get_pos()
@@ -137,34 +204,34 @@ class GameGUI:
         self.offset_x = (self.offset_x + mouse_x) * scale - mouse_x
         self.offset_y = (self.offset_y + mouse_y) * scale - mouse_y
 
-    def update(self):
-        if self.engine and not self.paused:
-            now = time.time()
-            if now - self.last_update >= Config.SPEEDS[self.current_speed]:
-                self.engine.step()
-                self.board = self.engine.board
-                self.last_update = now
-
     def draw_board(self):
-        if not self.board:
+        if self.engine is None:
             return
 
-        max_x = max(0, len(self.board[0]) * self.cell_size - Config.GAME_WIDTH)
-        max_y = max(0, len(self.board) * self.cell_size - Config.WINDOW_HEIGHT)
+        max_x = max(0, self.engine.width * self.cell_size - Config.GAME_WIDTH)
+        max_y = max(0, self.engine.height * self.cell_size - Config.WINDOW_HEIGHT)
         self.offset_x = max(0, min(self.offset_x, max_x))
         self.offset_y = max(0, min(self.offset_y, max_y))
 
-        for i, row in enumerate(self.board):
-            for j, cell in enumerate(row):
-                if cell == Config.DEAD:
-                    continue
+        # Only the visible cells are read, as one byte per cell indexing PALETTE, by the simulation thread
+        top = int(self.offset_y // self.cell_size)
+        left = int(self.offset_x // self.cell_size)
+        bottom = top + int(Config.WINDOW_HEIGHT // self.cell_size) + 2
+        right = left + int(Config.GAME_WIDTH // self.cell_size) + 2
+        self.simulation.request(top, left, bottom, right)
 
-                color = Config.CELL_COLORS.get(cell, (255, 0, 0))
-                x = j * self.cell_size - self.offset_x
-                y = i * self.cell_size - self.offset_y
+        # The last frame may be of the previous viewport while a generation is computed
+        frame = self.simulation.frame
+        if frame is None or frame.cells.size == 0:
+            return
+        cells = frame.cells
+        top, left, _, _ = frame.viewport
 
-                if -self.cell_size < x < Config.GAME_WIDTH and -self.cell_size < y < Config.WINDOW_HEIGHT:
-                    pygame.draw.rect(self.screen, color, (int(x), int(y), int(self.cell_size), int(self.cell_size)))
+        surface = pygame.surfarray.make_surface(np.ascontiguousarray(cells.T))
+        surface.set_palette(PALETTE)
+        height, width = cells.shape
+        surface = pygame.transform.scale(surface, (round(width * self.cell_size), round(height * self.cell_size)))
+        self.screen.blit(surface, (round(left * self.cell_size - self.offset_x), round(top * self.cell_size - self.offset_y)))
 
     def draw_side_panel(self):
         pygame.draw.rect(self.screen, (30, 30, 30), (Config.GAME_WIDTH, 0, Config.UI_WIDTH, Config.WINDOW_HEIGHT))
@@ -173,6 +240,25 @@ class GameGUI:
         self.draw_button(self.reset_button, "Reset", (200, 100, 0))
         self.draw_button(self.exit_button, "Exit", (0, 0, 200))
 
+        # The GUI and the simulation run at their own rates
+        rates = [f"FPS: {self.clock.get_fps():.0f}"]
+        if self.simulation:
+            rates += [f"Gen: {self.simulation.generation}", f"Gen/s: {self.simulation.rate:.1f}"]
+        metrics = self.metrics
+        if self.metrics_shown and metrics:
+            box = f"{metrics.right - metrics.left}x{metrics.bottom - metrics.top}" if metrics.top is not None else "-"
+            rates += [
+                f"Population: {metrics.population}",
+                f"Births: {metrics.births}",
+                f"Deaths: {metrics.deaths}",
+                f"Zombies: {metrics.zombies}",
+                f"Box: {box}",
+                f"Step: {metrics.step_s * 1000:.1f} ms",
+            ]
+        for index, label in enumerate(rates):
+            text = self.font.render(label, True, (200, 200, 200))
+            self.screen.blit(text, (Config.GAME_WIDTH + Config.MARGIN, self.create_side_button(4).y + index * 30))
+
     def draw_button(self, rect, label, color):
         pygame.draw.rect(self.screen, color, rect)
         text = self.font.render(label, True, (255, 255, 255))
@@ -184,6 +270,7 @@ class GameGUI:
         self.draw_button_group(self.size_buttons, self.current_board_size, "Board Size", 130)
         self.draw_button_group(self.rule_buttons, self.current_rule, "Rules", 230)
         self.draw_button_group(self.file_buttons, self.current_file, "Patterns", 330)
+        self.draw_button_group(self.boundary_buttons, self.current_boundary, "Boundary", 430)
 
     def draw_button_group(self, buttons, current, title, title_y):
         self.screen.blit(self.font.render(title, True, (255, 255, 255)), (50, title_y))
@@ -194,6 +281,7 @@ class GameGUI:
             self.screen.blit(text, (rect.x + 10, rect.y + 5))
 
     def run(self):
+        phase = self.profiler.phase if self.profiler else no_phase
         while self.running:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -205,16 +293,21 @@ class GameGUI:
                 elif event.type == pygame.MOUSEWHEEL:
                     self.handle_zoom(event)
 
-            self.update()
-
             self.screen.fill((0, 0, 0))
             if self.current_view == "game":
-                self.draw_board()
+                with phase("draw_board"):
+                    self.draw_board()
             else:
                 self.draw_settings()
 
-            self.draw_side_panel()
-            pygame.display.flip()
+            with phase("draw_side_panel"):
+                self.draw_side_panel()
+            with phase("flip"):
+                pygame.display.flip()
             self.clock.tick(60)
 
+        if self.simulation:
+            # Wait for the thread to close the engine, which writes the last checkpoint
+            self.simulation.stop()
+            self.simulation.join()
         pygame.quit()
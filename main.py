@@ -1,14 +1,29 @@
+import json
+import sys
+from contextlib import contextmanager
+
 import click
-from engine.game_of_life import GameOfLife
-from gui.gui import GameGUI
-from rules.rules import classic_rules, zombie_rules, von_neumann_rules, respawn_rules
+from config.config import Config
+from rules.rules import NAMED_RULES as RULES_MAP
+
+# Only the option choices are imported here, every command imports the modules it runs: the help of a
+# command does not load numpy, the backends, pillow or the process pool
+
+
+class RuleType(click.ParamType):
+    """A name of RULES_MAP or any rulestring such as B36/S23."""
+
+    name = "rule"
 
-RULES_MAP = {
-    "classic": classic_rules,
-    "zombie": zombie_rules,
-    "neumann": von_neumann_rules,
-    "respawn": respawn_rules,
-}
+    def convert(self, value, param, ctx):
+        if callable(value):
+            return value
+        from rules.compiler import resolve_rule
+
+        try:
+            return resolve_rule(value)
+        except ValueError as error:
+            self.fail(str(error), param, ctx)
 
 
 @click.group()
@@ -17,10 +32,79 @@ def cli():
     pass
 
 
+def checkpoint_options(command):
+    """Add the checkpoint and resume options of the long running commands."""
+    command = click.option("--resume", "resume_from", type=click.Path(exists=True, dir_okay=False), default=None, help="Continue the game saved in a checkpoint, which is then updated unless --checkpoint is given.")(command)
+    command = click.option("--checkpoint-every", type=click.IntRange(min=1), default=1000, help="Generations between two checkpoints.")(command)
+    command = click.option("--checkpoint", type=click.Path(dir_okay=False), default=None, help="Save the game to this .npz checkpoint periodically and at exit.")(command)
+    return command
+
+
+def game_options(command):
+    """Add the rule, backend workers, boundary and seed options of the commands creating a game."""
+    command = click.option("--seed", type=int, default=None, help="Seed of the random board and of the stochastic rules.")(command)
+    command = click.option("--boundary", type=click.Choice(Config.BOUNDARIES), default=None, help="Edges of the board: DEAD cells beyond them, wrapped around as a torus, or an infinite plane. Infinite for hashlife and dead for the other backends by default.")(command)
+    command = click.option("--workers", type=int, default=None, help="Worker processes of the tiled backend.")(command)
+    command = click.option("--rules", type=RuleType(), default=None, help=f"One of {', '.join(RULES_MAP)} or a rulestring such as B36/S23.")(command)
+    return command
+
+
+def metrics_option(command):
+    """Add the metrics output option of the commands stepping a game."""
+    return click.option("--metrics", type=click.Path(dir_okay=False), default=None, help="Write the population, births, deaths, zombies, bounding box and step time of the computed generations to this file, .csv for CSV and JSON lines otherwise.")(command)
+
+
+@contextmanager
+def metrics_output(game, path):
+    """Write the metrics of the generations computed in the block to path, nothing is measured without one."""
+    if path is None:
+        yield
+        return
+    from engine.metrics import MetricsWriter
+    from engine.sweep import output_format
+
+    with open(path, "w", newline="") as stream:
+        writer = MetricsWriter(stream, output_format(path))
+        game.add_observer(writer)
+        try:
+            yield
+        finally:
+            game.remove_observer(writer)
+
+
+def profile_options(command):
+    """Add the profiling options of the interactive commands."""
+    command = click.option("--profile-stats", type=click.Path(dir_okay=False), default=None, help="Also run the step under cProfile and write its statistics to this pstats file, implies --profile.")(command)
+    command = click.option("--profile", is_flag=True, help="Time the phases of the loop and print their p50, p95 and p99 on exit.")(command)
+    return command
+
+
+@contextmanager
+def profiling(profile, stats_path):
+    """Yield a profiler, None when not profiling, and print its summary after the block."""
+    if not (profile or stats_path):
+        yield None
+        return
+    from engine.profiling import Profiler
+
+    profiler = Profiler(stats_path=stats_path)
+    try:
+        yield profiler
+    finally:
+        profiler.close()
+        click.echo(profiler.summary(), err=True)
+
+
 @cli.command()
-def gui():
+@checkpoint_options
+@profile_options
+def gui(checkpoint, checkpoint_every, resume_from, profile, profile_stats):
     """Launch pygame GUI"""
-    GameGUI().run()
+    # pygame prints a banner on import, the other commands may write to stdout
+    from gui.gui import GameGUI
+
+    with profiling(profile, profile_stats) as profiler:
+        GameGUI(checkpoint or resume_from, checkpoint_every, resume_from, profiler).run()
 
 
 @cli.command()
@@ -30,8 +114,13 @@ def gui():
 @click.option("--interval", "interval_s", type=float, default=0.5)
 @click.option("--fill-mode", default="DEAD")
 @click.option("--placement", default="topleft")
-@click.option("--rules", type=click.Choice(RULES_MAP.keys()), default=None)
+@game_options
 @click.option("--patterns", is_flag=True)
+@click.option("--backend", type=click.Choice(list(Config.BACKENDS)), default="python")
+@click.option("--display", type=click.Choice(Config.DISPLAY_MODES), default="emoji", help="One cell per character, or 2x1 (halfblock) or 4x2 (braille) cells per character for large boards.")
+@checkpoint_options
+@metrics_option
+@profile_options
 def terminal(
     width,
     height,
@@ -41,23 +130,256 @@ def terminal(
     placement,
     rules,
     patterns,
+    backend,
+    workers,
+    boundary,
+    display,
+    seed,
+    checkpoint,
+    checkpoint_every,
+    resume_from,
+    metrics,
+    profile,
+    profile_stats,
 ):
     """Launch terminal version"""
+    from engine.game_of_life import GameOfLife
+
+    try:
+        game = GameOfLife(
+            width=width,
+            height=height,
+            file=file,
+            interval_s=interval_s,
+            fill_mode=fill_mode,
+            placement=placement,
+            rules=rules,
+            paterns=patterns,
+            backend=backend,
+            workers=workers,
+            boundary=boundary,
+            display=display,
+            seed=seed,
+            checkpoint=checkpoint or resume_from,
+            checkpoint_every=checkpoint_every,
+            resume_from=resume_from,
+        )
+    except ValueError as error:
+        raise click.ClickException(str(error))
+
+    with profiling(profile, profile_stats) as profiler, metrics_output(game, metrics):
+        game.start(profiler)
 
-    selected_rules = RULES_MAP.get(rules) if rules else None
-
-    game = GameOfLife(
-        width=width,
-        height=height,
-        file=file,
-        interval_s=interval_s,
-        fill_mode=fill_mode,
-        placement=placement,
-        rules=selected_rules,
-        paterns=patterns,
+
+@cli.command()
+@click.option("--width", type=int, default=None)
+@click.option("--height", type=int, default=None)
+@click.option("--file", type=str, default=None)
+@click.option("--fill-mode", default="DEAD")
+@click.option("--placement", default="topleft")
+@game_options
+@click.option("--backend", type=click.Choice(list(Config.BACKENDS)), default="python")
+@click.option("--generations", type=int, default=100, help="Generations to compute.")
+@click.option("--every", type=click.IntRange(min=1), default=1, help="Write a record every EVERY generations.")
+@click.option("--snapshots", is_flag=True, help="Add the ALIVE cells to the records, each record is then a coordinates board file.")
+@click.option("--output", type=click.File("w"), default="-", help="JSON lines output file, stdout by default.")
+@click.option("--cycles", is_flag=True, help="Detect when the board repeats, add its period to the records and jump over the remaining generations.")
+@click.option("--stop-on-cycle", is_flag=True, help="End the run at the first record after the board repeats, implies --cycles.")
+@checkpoint_options
+@metrics_option
+def run(
+    width,
+    height,
+    file,
+    fill_mode,
+    placement,
+    rules,
+    backend,
+    workers,
+    boundary,
+    generations,
+    seed,
+    every,
+    snapshots,
+    output,
+    cycles,
+    stop_on_cycle,
+    checkpoint,
+    checkpoint_every,
+    resume_from,
+    metrics,
+):
+    """Compute generations without display, as fast as possible"""
+    from engine.batch import run as run_batch
+    from engine.game_of_life import GameOfLife
+
+    try:
+        game = GameOfLife(
+            width=width,
+            height=height,
+            file=file,
+            fill_mode=fill_mode,
+            placement=placement,
+            rules=rules,
+            backend=backend,
+            workers=workers,
+            boundary=boundary,
+            seed=seed,
+            checkpoint=checkpoint or resume_from,
+            checkpoint_every=checkpoint_every,
+            resume_from=resume_from,
+            detect_cycles=cycles or stop_on_cycle,
+        )
+    except ValueError as error:
+        raise click.ClickException(str(error))
+
+    start = game.generation
+    try:
+        elapsed = 0.0
+        with metrics_output(game, metrics):
+            for record in run_batch(game, generations, every, snapshots, stop_on_cycle):
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+                elapsed = record["elapsed_s"]
+    finally:
+        game.close()
+
+    # Fewer generations when the run stopped on a cycle
+    generations = game.generation - start
+    rate = generations / elapsed if elapsed else float("inf")
+    click.echo(
+        f"{generations} generations of {game.width}x{game.height} cells in {elapsed:.3f}s "
+        f"({rate:.1f} generations/s, {rate * game.width * game.height:.3g} cells/s)",
+        err=True,
     )
 
-    game.start()
+
+@cli.command()
+@click.argument("output", type=click.Path(dir_okay=False))
+@click.option("--width", type=int, default=None)
+@click.option("--height", type=int, default=None)
+@click.option("--file", type=str, default=None)
+@click.option("--fill-mode", default="DEAD")
+@click.option("--placement", default="topleft")
+@game_options
+@click.option("--backend", type=click.Choice(list(Config.BACKENDS)), default="numpy")
+@click.option("--frames", type=click.IntRange(min=1), default=100, help="Frames to record, the first one is the initial board.")
+@click.option("--every", type=click.IntRange(min=1), default=1, help="Generations between two frames.")
+@click.option("--scale", type=click.IntRange(min=1), default=4, help="Pixels per cell side.")
+@click.option("--fps", type=click.FloatRange(min=0, min_open=True), default=10, help="Frames per second of the recording.")
+def export(
+    output,
+    width,
+    height,
+    file,
+    fill_mode,
+    placement,
+    rules,
+    backend,
+    workers,
+    boundary,
+    seed,
+    frames,
+    every,
+    scale,
+    fps,
+):
+    """Record a game to an animated GIF (.gif) or an MP4 video (.mp4, through ffmpeg), without display"""
+    from engine.export import export as export_game
+    from engine.game_of_life import GameOfLife
+
+    try:
+        game = GameOfLife(
+            width=width,
+            height=height,
+            file=file,
+            fill_mode=fill_mode,
+            placement=placement,
+            rules=rules,
+            backend=backend,
+            workers=workers,
+            boundary=boundary,
+            seed=seed,
+        )
+    except ValueError as error:
+        raise click.ClickException(str(error))
+
+    try:
+        export_game(game, output, frames, every, scale, fps)
+    except ValueError as error:
+        raise click.ClickException(str(error))
+    finally:
+        game.close()
+
+    click.echo(f"{frames} frames of {game.width}x{game.height} cells written to {output}", err=True)
+
+
+def parse_size(ctx, param, values):
+    sizes = []
+    for value in values:
+        try:
+            width, height = (int(side) for side in value.lower().split("x"))
+        except ValueError:
+            raise click.BadParameter(f"'{value}' is not a size such as 100x50")
+        sizes.append((width, height))
+    return sizes
+
+
+@cli.command()
+@click.option("--rule", "rules", multiple=True, default=["classic"], help=f"Rules, one of {', '.join(RULES_MAP)} or a rulestring. Repeatable.")
+@click.option("--size", "sizes", multiple=True, default=["50x50"], callback=parse_size, help="Board sizes as WIDTHxHEIGHT. Repeatable.")
+@click.option("--density", "densities", multiple=True, type=click.FloatRange(0, 1), default=[0.5], help="Probability of a cell to start ALIVE. Repeatable.")
+@click.option("--seeds", type=click.IntRange(min=1), default=10, help="Runs of every combination, with seeds 0 to SEEDS - 1.")
+@click.option("--generations", "generations", multiple=True, type=click.IntRange(min=0), default=[100], help="Maximum generations of a run. Repeatable.")
+@click.option("--backend", type=click.Choice(list(Config.BACKENDS)), default="numpy")
+@click.option("--workers", type=int, default=None, help="Worker processes, all the cores by default.")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Results file, .csv for CSV and JSON lines otherwise. stdout by default.")
+@click.option("--resume", is_flag=True, help="Skip the runs already in the output file and append the others.")
+def sweep(rules, sizes, densities, seeds, generations, backend, workers, output, resume):
+    """Run a random board for every combination of the parameters"""
+    from engine.sweep import ResultWriter, SweepPoint, check_point, completed_keys, open_results, output_format, sweep as run_sweep, sweep_grid
+
+    # Refuse the rules the backend cannot run before any worker starts
+    for rule in rules:
+        try:
+            check_point(SweepPoint(rule, 4, 4, densities[0], 0, 1, backend))
+        except ValueError as error:
+            raise click.BadParameter(str(error), param_hint="--rule")
+    if resume and not output:
+        raise click.BadParameter("resuming needs an output file", param_hint="--resume")
+
+    format = output_format(output)
+    points = sweep_grid(rules, sizes, densities, range(seeds), generations, backend)
+
+    # Opening drops a line cut by a crash before the completed runs are read
+    stream = open_results(output, resume) if output else sys.stdout
+    completed = completed_keys(output, format) if resume else set()
+    total = sum(point.key not in completed for point in points)
+    try:
+        writer = ResultWriter(stream, format)
+        for done, result in enumerate(run_sweep(points, workers, completed), start=1):
+            writer.write(result)
+            click.echo(f"[{done}/{total}] {result['key']}", err=True)
+    finally:
+        if output:
+            stream.close()
+
+
+@cli.command()
+@click.argument("source", type=click.Path(exists=True, dir_okay=False))
+@click.argument("destination", type=click.Path(dir_okay=False))
+@click.option("--format", type=click.Choice(["grid", "coordinates"]), default="coordinates", help="Format of a JSON DESTINATION.")
+@click.option("--encoding", type=click.Choice(Config.SNAPSHOT_ENCODINGS), default=None, help="Cells encoding of a .gol snapshot, packed for two states boards by default.")
+@click.option("--rules", type=RuleType(), default=None, help="Rule saved in a .gol snapshot or an RLE header, the rule of SOURCE by default.")
+def convert(source, destination, format, encoding, rules):
+    """Convert a board file between JSON, RLE (.rle), plaintext (.cells) and binary snapshots (.gol), by their extensions"""
+    from engine.convert import convert as convert_board
+    from rules.compiler import rule_name
+
+    try:
+        convert_board(source, destination, rule_name(rules) if rules else None, format, encoding)
+    except ValueError as error:
+        raise click.ClickException(str(error))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,151 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+
+import numpy as np
+
+from config.config import Config
+from rules.rules import (
+    MOORE_NEIGHBORS,
+    VON_NEUMANN_NEIGHBORS,
+    classic_rules,
+    count_neighbors,
+    respawn_rules,
+    NAMED_RULES,
+    von_neumann_rules,
+    zombie_rules,
+)
+
+
+NEIGHBORHOODS = {
+    "moore": MOORE_NEIGHBORS,
+    "von_neumann": VON_NEUMANN_NEIGHBORS,
+}
+
+STOCHASTIC_RULES = {respawn_rules, zombie_rules}
+
+# B3/S23, B2/S/C3, B3/S2V...
+_BS_PATTERN = re.compile(r"^B(?P<birth>\d*)/S(?P<survival>\d*)(?:/C?(?P<states>\d+))?(?P<neighborhood>V?)$", re.IGNORECASE)
+# 23/3, /2/3... (survival first)
+_SB_PATTERN = re.compile(r"^(?P<survival>\d*)/(?P<birth>\d*)(?:/(?P<states>\d+))?(?P<neighborhood>V?)$", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class RuleSpec:
+    """Outer totalistic rule: a neighborhood, birth and survival counts and the number of states.
+
+    With more than two states (Generations rules) an ALIVE cell that does not
+    survive goes through the dying states 2, 3... before becoming DEAD.
+    """
+    birth: frozenset[int]
+    survival: frozenset[int]
+    neighborhood: str = "moore"
+    states: int = 2
+
+    def __post_init__(self):
+        if self.neighborhood not in NEIGHBORHOODS:
+            raise ValueError(f"neighborhood must be one of {', '.join(NEIGHBORHOODS)}")
+        if self.states < 2:
+            raise ValueError("A rule needs at least 2 states")
+        size = len(NEIGHBORHOODS[self.neighborhood])
+        if any(not 0 <= count <= size for count in self.birth | self.survival):
+            raise ValueError(f"Neighbor counts must be between 0 and {size}")
+
+    def __str__(self) -> str:
+        rulestring = "B" + "".join(map(str, sorted(self.birth))) + "/S" + "".join(map(str, sorted(self.survival)))
+        if self.states > 2:
+            rulestring += f"/C{self.states}"
+        if self.neighborhood == "von_neumann":
+            rulestring += "V"
+        return rulestring
+
+
+def parse_rule(rulestring: str) -> RuleSpec:
+    """Parse a rulestring such as "B3/S23", "23/3", "B2/S/C3" or "B3/S2V" (von Neumann neighborhood)."""
+    match = _BS_PATTERN.match(rulestring.strip()) or _SB_PATTERN.match(rulestring.strip())
+    if match is None:
+        raise ValueError(f"Invalid rulestring '{rulestring}', expected something like 'B3/S23'")
+
+    return RuleSpec(
+        birth=frozenset(int(count) for count in match["birth"]),
+        survival=frozenset(int(count) for count in match["survival"]),
+        neighborhood="von_neumann" if match["neighborhood"] else "moore",
+        states=int(match["states"]) if match["states"] else 2,
+    )
+
+
+class CompiledRule:
+    """Rule compiled into a transition table indexed by cell state and ALIVE neighbor count.
+
+    It can be called like the rules of rules.rules, one cell at a time, or
+    evaluated in bulk by indexing table with the state and count arrays.
+    """
+
+    def __init__(self, spec: RuleSpec) -> None:
+        self.spec = spec
+        self.neighbors = NEIGHBORHOODS[spec.neighborhood]
+        self.__name__ = str(spec)
+
+        # States a rule does not know about (a ZOMBIE under B3/S23) behave as DEAD
+        table = np.zeros((max(spec.states, Config.ZOMBIE + 1), len(self.neighbors) + 1), dtype=np.uint8)
+        dying = Config.ALIVE + 1 if spec.states > 2 else Config.DEAD
+        for count in range(len(self.neighbors) + 1):
+            table[Config.DEAD, count] = Config.ALIVE if count in spec.birth else Config.DEAD
+            table[Config.ALIVE, count] = Config.ALIVE if count in spec.survival else dying
+            for state in range(2, spec.states):
+                table[state, count] = state + 1 if state + 1 < spec.states else Config.DEAD
+            for state in range(spec.states, table.shape[0]):
+                table[state, count] = table[Config.DEAD, count]
+
+        self.table = table
+        self.transitions = table.tolist()
+
+    def __call__(self, board, i, j, ever_alive):
+        counts = count_neighbors(board, i, j, self.neighbors, {Config.ALIVE})
+        return self.transitions[board[i][j]][counts[Config.ALIVE]]
+
+    def __repr__(self) -> str:
+        return f"CompiledRule('{self.spec}')"
+
+
+@lru_cache(maxsize=None)
+def _compile(spec: RuleSpec) -> CompiledRule:
+    return CompiledRule(spec)
+
+
+def compile_rule(spec: RuleSpec | str) -> CompiledRule:
+    """Return the compiled rule of a spec or a rulestring, compiled once per spec."""
+    if isinstance(spec, str):
+        spec = parse_rule(spec)
+    return _compile(spec)
+
+
+CLASSIC = compile_rule("B3/S23")
+VON_NEUMANN = compile_rule("B3/S2V")
+
+
+def as_compiled(rule: Callable) -> CompiledRule | None:
+    """Return the compiled equivalent of a deterministic rule, None for stochastic or opaque rules."""
+    if isinstance(rule, CompiledRule):
+        return rule
+    return {classic_rules: CLASSIC, von_neumann_rules: VON_NEUMANN}.get(rule)
+
+
+def rule_name(rule: Callable) -> str:
+    """Return the name of a rule that resolve_rule turns back into it: its NAMED_RULES name or its rulestring."""
+    for name, named in NAMED_RULES.items():
+        if rule is named:
+            return name
+    if isinstance(rule, CompiledRule):
+        return str(rule.spec)
+    raise ValueError(f"Rule '{getattr(rule, '__name__', rule)}' has no name nor rulestring")
+
+
+def resolve_rule(rule: Callable | str) -> Callable:
+    """Return a rule callable from a rule callable, a name of NAMED_RULES or a rulestring."""
+    if isinstance(rule, str):
+        rule = NAMED_RULES.get(rule, rule)
+    if isinstance(rule, str):
+        return compile_rule(rule)
+    return rule
@@ -16,9 +16,14 @@ VON_NEUMANN_NEIGHBORS = [
 ]
 
 
+class TorusBoard(list):
+    """Rows of a board whose opposite edges touch, count_neighbors wraps the neighbors around them."""
+
+
 def count_neighbors(board, i, j, neighbors, states_to_count):
     height = len(board)
     width = len(board[0])
+    torus = isinstance(board, TorusBoard)
 
     counts = {state: 0 for state in states_to_count}
 
@@ -26,10 +31,15 @@ def count_neighbors(board, i, j, neighbors, states_to_count):
         ni = i + di
         nj = j + dj
 
-        if 0 <= ni < height and 0 <= nj < width:
+        if torus:
+            cell = board[ni % height][nj % width]
+        elif 0 <= ni < height and 0 <= nj < width:
             cell = board[ni][nj]
-            if cell in counts:
-                counts[cell] += 1
+        else:
+            continue
+
+        if cell in counts:
+            counts[cell] += 1
 
     return counts
 
@@ -51,8 +61,13 @@ def classic_rules(board, i, j, ever_alive):
     return classic_logic(board[i][j], counts[Config.ALIVE])
 
 
-def respawn_rules(board, i, j, ever_alive):
-    """DEAD cell have a 20% chance of respawing if they were ever ALIVE."""
+def draw(noise, i, j):
+    """Return the random number of cell (i, j) from the noise field of the generation, a new one without field."""
+    return noise[i][j] if noise is not None else random.random()
+
+
+def respawn_rules(board, i, j, ever_alive, noise=None):
+    """DEAD cell have a 1% chance of respawing if they were ever ALIVE."""
     counts = count_neighbors(
         board, i, j,
         MOORE_NEIGHBORS,
@@ -64,15 +79,15 @@ def respawn_rules(board, i, j, ever_alive):
 
     if (
         current == Config.DEAD
-        and (i, j) in ever_alive
-        and random.random() <= 0.01
+        and ever_alive[i][j]
+        and draw(noise, i, j) <= 0.01
     ):
         return Config.ALIVE
 
     return classic_logic(current, alive_neighbors)
 
 
-def zombie_rules(board, i, j, ever_alive):
+def zombie_rules(board, i, j, ever_alive, noise=None):
     counts = count_neighbors(
         board, i, j,
         MOORE_NEIGHBORS,
@@ -84,7 +99,7 @@ def zombie_rules(board, i, j, ever_alive):
     zombie_neighbors = counts[Config.ZOMBIE]
 
     if current == Config.ALIVE:
-        if random.randint(1, 1000) == 1:
+        if draw(noise, i, j) < 0.001:
             return Config.ZOMBIE
         if alive_neighbors == 0 and zombie_neighbors >= 1:
             return Config.ZOMBIE
@@ -110,3 +125,15 @@ def von_neumann_rules(board, i, j, ever_alive):
 
     if current == Config.DEAD:
         return Config.ALIVE if alive_neighbors == 3 else Config.DEAD
+
+
+# Rules known by name on the command line, any other name is parsed as a rulestring by rules.compiler
+NAMED_RULES = {
+    "classic": classic_rules,
+    "zombie": zombie_rules,
+    "neumann": von_neumann_rules,
+    "respawn": respawn_rules,
+    "highlife": "B36/S23",
+    "seeds": "B2/S",
+    "brain": "B2/S/C3",
+}
@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+
+from config.config import Config
+from engine.backends import BACKENDS, create_backend
+from engine.bitpacked import PackedBoard
+from engine.board import create_history
+from engine.game_of_life import GameOfLife
+from engine.state import dead_state, random_state
+from rules.compiler import compile_rule
+from rules.rules import classic_rules, respawn_rules, zombie_rules
+
+
+A = Config.ALIVE
+
+TORUS_BACKENDS = [name for name, backend in BACKENDS.items() if "torus" in backend.boundaries]
+INFINITE_BACKENDS = [name for name, backend in BACKENDS.items() if "infinite" in backend.boundaries]
+
+WINDOWS = [
+    (0, 0, None, None),
+    (3, 5, 17, 90),
+    (10, 64, 11, 128),
+    (0, 70, 40, 300),
+    (25, 10, 25, 10),
+]
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_to_array_returns_the_window_of_the_board(name):
+    board = random_state(100, 30, rng=np.random.default_rng(3))
+    backend = create_backend(name, board, classic_rules, create_history(board))
+    try:
+        backend.step()
+        expected = np.array(backend.board, dtype=np.uint8)
+
+        for top, left, bottom, right in WINDOWS:
+            window = backend.to_array(top, left, bottom, right)
+            assert window.dtype == np.uint8
+            assert np.array_equal(window, expected[top:bottom, left:right])
+    finally:
+        backend.close()
+
+
+def test_packed_board_unpacks_only_the_window():
+    board = np.array(random_state(200, 5, rng=np.random.default_rng(4)), dtype=np.uint8)
+    packed = PackedBoard.from_array(board)
+
+    assert np.array_equal(packed.to_array(1, 63, 4, 129), board[1:4, 63:129])
+    assert np.array_equal(packed.to_array(), board)
+    assert packed.to_array(0, 150, None, 100).shape == (5, 0)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_population_counts_the_alive_cells(name):
+    board = random_state(70, 20, rng=np.random.default_rng(5))
+    backend = create_backend(name, board, classic_rules, create_history(board))
+    try:
+        backend.step()
+
+        assert backend.population() == sum(row.count(Config.ALIVE) for row in backend.board)
+    finally:
+        backend.close()
+
+
+@pytest.mark.parametrize("rule", [zombie_rules, respawn_rules])
+def test_seeded_games_are_reproducible_across_backends(rule):
+    games = [GameOfLife(width=30, height=20, rules=rule, backend=name, seed=11) for name in ["python", "numpy", "sparse"]]
+    again = GameOfLife(width=30, height=20, rules=rule, backend="python", seed=11)
+
+    for _ in range(15):
+        for game in [*games, again]:
+            game.step()
+
+        assert games[0].board == games[1].board == games[2].board == again.board
+        assert np.array_equal(games[0].ever_alive, games[1].ever_alive)
+        assert np.array_equal(games[0].ever_alive, games[2].ever_alive)
+
+
+def test_create_backend_drops_the_rng_of_deterministic_backends():
+    board = random_state(10, 10, rng=np.random.default_rng(6))
+
+    backend = create_backend("bitpacked", board, classic_rules, create_history(board), rng=np.random.default_rng(6))
+
+    assert backend.population() == sum(map(sum, board))
+
+
+@pytest.mark.parametrize("name", TORUS_BACKENDS)
+def test_glider_wraps_around_the_edges_of_a_torus(name):
+    board = dead_state(70, 9)
+    for i, j in [(6, 65), (7, 66), (8, 64), (8, 65), (8, 66)]:
+        board[i][j] = A
+    backend = create_backend(name, board, classic_rules, create_history(board), boundary="torus")
+    try:
+        # A glider moves one cell down and right every 4 generations
+        backend.advance(4 * 12)
+
+        assert np.array_equal(backend.to_array(), np.roll(np.array(board, dtype=np.uint8), (12, 12), axis=(0, 1)))
+    finally:
+        backend.close()
+
+
+@pytest.mark.parametrize("name", TORUS_BACKENDS)
+def test_torus_backends_match_the_numpy_backend(name):
+    board = random_state(70, 20, rng=np.random.default_rng(7))
+    expected = create_backend("numpy", board, classic_rules, create_history(board), boundary="torus")
+    backend = create_backend(name, board, classic_rules, create_history(board), boundary="torus")
+    try:
+        for _ in range(10):
+            expected.step()
+            backend.step()
+
+            assert np.array_equal(backend.to_array(), expected.to_array())
+    finally:
+        backend.close()
+
+
+@pytest.mark.parametrize("name", INFINITE_BACKENDS)
+def test_infinite_plane_keeps_the_cells_leaving_the_board(name):
+    board = random_state(12, 10, rng=np.random.default_rng(8))
+    expected = create_backend("hashlife", board, classic_rules, create_history(board))
+    backend = create_backend(name, board, classic_rules, create_history(board), boundary="infinite")
+
+    for _ in range(60):
+        expected.step()
+        backend.step()
+
+        assert np.array_equal(backend.to_array(), expected.to_array())
+        assert np.array_equal(backend.ever_alive, expected.ever_alive)
+        assert backend.population() == expected.population()
+
+
+def test_unsupported_boundaries_are_refused():
+    board = random_state(10, 10, rng=np.random.default_rng(9))
+
+    with pytest.raises(ValueError):
+        create_backend("incremental", board, classic_rules, create_history(board), boundary="torus")
+    with pytest.raises(ValueError):
+        create_backend("hashlife", board, classic_rules, create_history(board), boundary="dead")
+    with pytest.raises(ValueError):
+        create_backend("numpy", board, compile_rule("B03/S23"), create_history(board), boundary="infinite")
+    with pytest.raises(ValueError):
+        create_backend("sparse", board, respawn_rules, create_history(board), boundary="infinite")
+    with pytest.raises(ValueError):
+        GameOfLife(width=10, height=10, boundary="sphere")
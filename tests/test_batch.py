@@ -0,0 +1,65 @@
+import json
+
+from click.testing import CliRunner
+
+from engine.batch import run, snapshot
+from engine.board import BoardFile, build_from_coordinates
+from engine.game_of_life import GameOfLife
+from main import cli
+
+
+def test_run_yields_a_record_every_k_generations_and_at_the_end():
+    game = GameOfLife(file="board_file/blinker.json")
+
+    records = list(run(game, 5, every=2))
+
+    assert [record["generation"] for record in records] == [0, 2, 4, 5]
+    assert [record["population"] for record in records] == [3, 3, 3, 3]
+    assert game.generation == 5
+
+
+def test_snapshots_are_coordinates_board_files():
+    game = GameOfLife(file="board_file/blinker.json")
+
+    first, second = run(game, 1, snapshots=True)
+
+    assert first["alive_cells"] == [[1, 2], [2, 2], [3, 2]]
+    assert build_from_coordinates(BoardFile.model_validate(second)) == game.board
+    assert snapshot(game)["alive_cells"] == [[2, 1], [2, 2], [2, 3]]
+
+
+def test_run_command_streams_json_lines():
+    result = CliRunner().invoke(cli, ["run", "--file", "board_file/pulsar.json", "--generations", "6", "--every", "3", "--backend", "numpy"])
+
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [record["generation"] for record in records] == [0, 3, 6]
+    assert records[0]["population"] == records[2]["population"]
+    assert "6 generations of" in result.stderr
+
+
+def test_run_command_is_reproducible_with_a_seed():
+    arguments = ["run", "--width", "20", "--height", "20", "--generations", "10", "--seed", "7", "--rules", "zombie"]
+
+    def populations():
+        result = CliRunner().invoke(cli, arguments)
+        return [json.loads(line)["population"] for line in result.stdout.splitlines()]
+
+    assert populations() == populations()
+
+
+def test_run_command_resumes_from_its_checkpoint(tmp_path):
+    checkpoint = str(tmp_path / "run.npz")
+    arguments = ["run", "--width", "20", "--height", "20", "--seed", "3", "--rules", "respawn", "--backend", "numpy"]
+
+    def last_population(*options):
+        result = CliRunner().invoke(cli, [*arguments, *options])
+        assert result.exit_code == 0, result.output
+        return json.loads(result.stdout.splitlines()[-1])
+
+    uninterrupted = last_population("--generations", "30")
+    last_population("--generations", "10", "--checkpoint", checkpoint)
+    resumed = last_population("--generations", "20", "--resume", checkpoint)
+
+    assert resumed["generation"] == 30
+    assert resumed["population"] == uninterrupted["population"]
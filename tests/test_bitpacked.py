@@ -0,0 +1,51 @@
+import random
+
+import numpy as np
+import pytest
+
+from config.config import Config
+from engine.backends import NumpyBackend
+from engine.bitpacked import BitPackedBackend, PackedBoard
+from engine.board import create_history
+from rules.compiler import compile_rule
+from rules.rules import classic_rules, respawn_rules, von_neumann_rules
+
+
+D = Config.DEAD
+A = Config.ALIVE
+
+
+def random_board(width, height, seed):
+    rng = random.Random(seed)
+    return [[rng.choice([D, A]) for _ in range(width)] for _ in range(height)]
+
+
+@pytest.mark.parametrize("width", [1, 64, 70, 130])
+def test_packed_board_round_trips_to_grid(width):
+    board = random_board(width, 9, seed=6)
+
+    packed = PackedBoard.from_grid(board)
+
+    assert packed.to_grid() == board
+    assert packed.nbytes == 9 * 8 * -(-width // 64)
+
+
+@pytest.mark.parametrize("rule", [classic_rules, von_neumann_rules, compile_rule("B36/S23"), compile_rule("B1357/S1357")])
+@pytest.mark.parametrize("width", [13, 64, 130])
+def test_bitpacked_backend_matches_numpy_backend(rule, width):
+    board = random_board(width, 21, seed=7)
+    expected = NumpyBackend(board, rule, create_history(board))
+    backend = BitPackedBackend(board, rule, create_history(board))
+
+    for _ in range(10):
+        expected.step()
+        backend.step()
+
+        assert backend.board == expected.board
+    assert np.array_equal(backend.ever_alive, expected.ever_alive)
+
+
+@pytest.mark.parametrize("rule", [respawn_rules, compile_rule("B2/S/C3")])
+def test_rules_that_are_not_two_states_and_deterministic_are_refused(rule):
+    with pytest.raises(ValueError):
+        BitPackedBackend([[D]], rule, set())
@@ -1,7 +1,8 @@
+import numpy as np
 import pytest
 
 from config.config import Config
-from engine.board import BoardFile, build_from_coordinates, integrate_pattern
+from engine.board import BoardFile, build_from_coordinates, create_sparse_board, integrate_array, integrate_pattern, load_state_from_file
 
 
 D = Config.DEAD
@@ -80,3 +81,21 @@ def test_integrate_pattern_raises_when_pattern_is_bigger_than_board():
             fill_mode="DEAD",
             placement="topleft",
         )
+
+
+@pytest.mark.parametrize("fill_mode", ["DEAD", "random"])
+def test_placements_of_lists_arrays_and_cells_agree(fill_mode):
+    pattern = load_state_from_file("board_file/glider.rle")
+
+    grid = integrate_pattern(pattern, 9, 7, fill_mode, "center", np.random.default_rng(3))
+    array = integrate_array(np.array(pattern, dtype=np.uint8), 9, 7, fill_mode, "center", np.random.default_rng(3))
+    width, height, cells = create_sparse_board("board_file/glider.rle", fill_mode, "center", 9, 7, np.random.default_rng(3))
+
+    assert array.tolist() == grid
+    assert (width, height) == (9, 7)
+    assert cells == {(i, j): cell for i, row in enumerate(grid) for j, cell in enumerate(row) if cell != D}
+
+
+def test_unknown_placement_is_refused():
+    with pytest.raises(ValueError):
+        integrate_array(np.ones((2, 2), dtype=np.uint8), 4, 4, "DEAD", "bottom")
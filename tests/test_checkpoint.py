@@ -0,0 +1,153 @@
+import numpy as np
+import pytest
+
+from engine import checkpoint as checkpoint_module
+from engine.backends import BACKENDS
+from engine.checkpoint import Checkpoint, Checkpointer, load_checkpoint, save_checkpoint
+from engine.game_of_life import GameOfLife
+from rules.compiler import resolve_rule
+
+
+INFINITE_BACKENDS = [name for name, backend in BACKENDS.items() if "infinite" in backend.boundaries]
+
+
+def saved(generation=7):
+    rng = np.random.default_rng(1)
+    return Checkpoint(
+        rng.integers(0, 2, (5, 8), dtype=np.uint8),
+        rng.random((5, 8)) < 0.5,
+        generation,
+        "B36/S23",
+        rng.bit_generator.state,
+    )
+
+
+def test_checkpoint_round_trips(tmp_path):
+    path = tmp_path / "game.npz"
+    checkpoint = saved()
+
+    save_checkpoint(path, checkpoint)
+    loaded = load_checkpoint(path)
+
+    assert np.array_equal(loaded.cells, checkpoint.cells)
+    assert np.array_equal(loaded.ever_alive, checkpoint.ever_alive)
+    assert (loaded.generation, loaded.rule, loaded.rng_state) == (7, "B36/S23", checkpoint.rng_state)
+    assert [p.name for p in tmp_path.iterdir()] == ["game.npz"]
+
+
+def test_failed_write_keeps_the_previous_checkpoint(tmp_path, monkeypatch):
+    path = tmp_path / "game.npz"
+    save_checkpoint(path, saved(1))
+
+    def crash(f, **arrays):
+        f.write(b"partial")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(checkpoint_module.np, "savez", crash)
+    with pytest.raises(OSError):
+        save_checkpoint(path, saved(2))
+
+    monkeypatch.undo()
+    assert load_checkpoint(path).generation == 1
+    assert [p.name for p in tmp_path.iterdir()] == ["game.npz"]
+
+
+def test_bad_files_are_refused(tmp_path):
+    path = tmp_path / "game.npz"
+    path.write_bytes(b"not a checkpoint")
+
+    with pytest.raises(ValueError):
+        load_checkpoint(path)
+
+
+def test_checkpointer_writes_every_generations_and_at_close(tmp_path):
+    path = tmp_path / "game.npz"
+    game = GameOfLife(width=20, height=20, seed=0, backend="numpy", checkpoint=str(path), checkpoint_every=10)
+
+    for _ in range(25):
+        game.step()
+    assert game.checkpointer.last_generation == 20
+
+    game.close()
+    assert game.checkpointer.written >= 1
+    assert load_checkpoint(path).generation == 25
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy", "sparse"])
+def test_resumed_game_continues_like_the_uninterrupted_one(tmp_path, backend):
+    path = tmp_path / "game.npz"
+    rules = resolve_rule("respawn")
+    uninterrupted = GameOfLife(width=30, height=30, rules=rules, seed=4, backend=backend)
+    interrupted = GameOfLife(width=30, height=30, rules=rules, seed=4, backend=backend, checkpoint=str(path))
+
+    for game in (uninterrupted, interrupted):
+        game.advance(20)
+    interrupted.close()
+
+    resumed = GameOfLife(resume_from=str(path), backend=backend)
+    for game in (uninterrupted, resumed):
+        game.advance(20)
+
+    assert resumed.generation == 40
+    assert resumed.rules is rules
+    assert np.array_equal(resumed.to_array(), uninterrupted.to_array())
+    assert np.array_equal(resumed.ever_alive, uninterrupted.ever_alive)
+
+
+def test_resumed_game_keeps_the_boundary(tmp_path):
+    path = tmp_path / "game.npz"
+    game = GameOfLife(width=20, height=20, seed=2, backend="numpy", boundary="torus", checkpoint=str(path))
+    game.advance(5)
+    game.close()
+
+    assert GameOfLife(resume_from=str(path), backend="sparse").backend.boundary == "torus"
+
+
+def test_checkpointer_refuses_a_zero_period(tmp_path):
+    with pytest.raises(ValueError):
+        Checkpointer(str(tmp_path / "game.npz"), every=0)
+
+
+def test_loaded_checkpoint_is_resumed_without_reading_the_file_again(tmp_path):
+    path = tmp_path / "game.npz"
+    save_checkpoint(str(path), saved(generation=12))
+    checkpoint = load_checkpoint(str(path))
+    path.unlink()
+
+    game = GameOfLife(resume_from=checkpoint, backend="numpy")
+
+    assert game.generation == 12
+    assert np.array_equal(game.to_array(), checkpoint.cells)
+
+
+@pytest.mark.parametrize("backend", INFINITE_BACKENDS)
+def test_resumed_infinite_plane_keeps_the_cells_outside_of_the_board(tmp_path, backend):
+    path = tmp_path / "game.npz"
+    options = {"file": "board_file/r_pentomino.cells", "width": 20, "height": 20, "placement": "center", "backend": backend, "boundary": "infinite"}
+    uninterrupted = GameOfLife(**options)
+    interrupted = GameOfLife(**options, checkpoint=str(path))
+
+    # hashlife samples ever_alive at the generations it reaches, both games reach the same ones
+    for game in (uninterrupted, interrupted):
+        game.advance(200)
+    uninterrupted.advance(200)
+    interrupted.close()
+    resumed = GameOfLife(resume_from=str(path), backend=backend)
+    resumed.advance(200)
+
+    assert load_checkpoint(str(path)).cells.shape != (20, 20)
+    assert resumed.population() == uninterrupted.population() == 18
+    assert np.array_equal(resumed.to_array(), uninterrupted.to_array())
+    assert np.array_equal(resumed.ever_alive, uninterrupted.ever_alive)
+
+
+def test_checkpoint_window_round_trips(tmp_path):
+    path = str(tmp_path / "game.npz")
+    checkpoint = saved()
+    checkpoint.window = (1, 2, 4, 7)
+
+    save_checkpoint(path, checkpoint)
+
+    assert load_checkpoint(path).window == (1, 2, 4, 7)
+    save_checkpoint(path, saved())
+    assert load_checkpoint(path).window is None
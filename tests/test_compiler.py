@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from config.config import Config
+from engine.board import create_history
+from engine.sparse import SparseBackend
+from engine.state import next_board_state
+from engine.vectorized import next_board_state_vectorized, to_array
+from rules.compiler import CLASSIC, RuleSpec, compile_rule, parse_rule, resolve_rule, rule_name
+from rules.rules import classic_rules
+
+
+D = Config.DEAD
+A = Config.ALIVE
+
+
+def random_board(width, height, seed):
+    rng = random.Random(seed)
+    return [[rng.choice([D, A]) for _ in range(width)] for _ in range(height)]
+
+
+@pytest.mark.parametrize(
+    "rulestring, spec",
+    [
+        ("B3/S23", RuleSpec(frozenset({3}), frozenset({2, 3}))),
+        ("23/3", RuleSpec(frozenset({3}), frozenset({2, 3}))),
+        ("b36/s23", RuleSpec(frozenset({3, 6}), frozenset({2, 3}))),
+        ("B2/S", RuleSpec(frozenset({2}), frozenset())),
+        ("B2/S/C3", RuleSpec(frozenset({2}), frozenset(), states=3)),
+        ("B3/S2V", RuleSpec(frozenset({3}), frozenset({2}), neighborhood="von_neumann")),
+    ],
+)
+def test_parse_rule(rulestring, spec):
+    assert parse_rule(rulestring) == spec
+
+
+@pytest.mark.parametrize("rulestring", ["B3S23", "B9/S23", "B5/S1V", "B3/S23/C1", "life"])
+def test_parse_rule_refuses_invalid_rulestrings(rulestring):
+    with pytest.raises(ValueError):
+        parse_rule(rulestring)
+
+
+def test_rulestring_round_trips():
+    for rulestring in ["B3/S23", "B36/S23", "B2/S/C3", "B3/S2V"]:
+        assert str(parse_rule(rulestring)) == rulestring
+
+
+def test_compile_rule_is_done_once_per_spec():
+    assert compile_rule("23/3") is CLASSIC
+    assert resolve_rule("B3/S23") is CLASSIC
+    assert resolve_rule(classic_rules) is classic_rules
+
+
+def test_resolve_rule_knows_rule_names():
+    assert resolve_rule("classic") is classic_rules
+    assert resolve_rule("highlife") is compile_rule("B36/S23")
+
+
+def test_generations_table_goes_through_dying_states():
+    rule = compile_rule("B2/S/C4")
+
+    assert rule.table[A].tolist() == [2] * 9
+    assert rule.table[2].tolist() == [3] * 9
+    assert rule.table[3].tolist() == [D] * 9
+    assert rule.table[D, 2] == A
+
+
+def test_compiled_classic_rule_matches_classic_rules():
+    board = random_board(15, 11, seed=3)
+    ever_alive = create_history(board)
+
+    expected, _ = next_board_state(board, classic_rules, ever_alive.copy())
+    result, _ = next_board_state(board, CLASSIC, ever_alive.copy())
+
+    assert result == expected
+
+
+@pytest.mark.parametrize("rulestring", ["B36/S23", "B2/S/C3", "B3/S2V", "B1/S012345678"])
+def test_backends_evaluate_compiled_rules_like_the_per_cell_call(rulestring):
+    rule = compile_rule(rulestring)
+    board = random_board(17, 13, seed=4)
+    ever_alive = create_history(board)
+    array = to_array(board)
+    history = ever_alive.copy()
+    sparse = SparseBackend.from_board(board, rule, ever_alive)
+
+    for _ in range(8):
+        board, ever_alive = next_board_state(board, rule, ever_alive)
+        array, history = next_board_state_vectorized(array, rule, history)
+        sparse.step()
+
+        assert array.tolist() == board
+        assert sparse.board == board
+
+
+@pytest.mark.parametrize("rulestring", ["B3/S0", "B3/S012345678", "B3/S0/C3"])
+def test_sparse_backend_keeps_a_lone_cell_under_s0_rules(rulestring):
+    rule = compile_rule(rulestring)
+    board = [[D] * 5 for _ in range(5)]
+    board[2][2] = A
+    ever_alive = create_history(board)
+    sparse = SparseBackend.from_board(board, rule, ever_alive)
+
+    expected, _ = next_board_state(board, rule, ever_alive.copy())
+    sparse.step()
+
+    assert sparse.board == expected
+    assert sparse.population() == 1
+
+
+def test_rule_name_gives_back_names_and_rulestrings():
+    assert rule_name(resolve_rule("highlife")) == "B36/S23"
+    assert rule_name(classic_rules) == "classic"
+    assert rule_name(compile_rule("B34/S34")) == "B34/S34"
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from config.config import Config
+from engine.batch import run
+from engine.cycles import CycleDetector
+from engine.game_of_life import GameOfLife
+from rules.compiler import resolve_rule
+
+
+D = Config.DEAD
+A = Config.ALIVE
+
+
+def detect(boards, **options):
+    detector = CycleDetector(len(boards[0][0]), len(boards[0]), **options)
+    for generation, board in enumerate(boards):
+        detector.update(np.array(board, dtype=np.uint8), generation)
+    return detector
+
+
+def test_blinker_has_period_two():
+    vertical = [[D, A, D], [D, A, D], [D, A, D]]
+    horizontal = [[D, D, D], [A, A, A], [D, D, D]]
+
+    detector = detect([vertical, horizontal, vertical])
+
+    assert (detector.period, detector.start) == (2, 0)
+
+
+def test_still_and_extinct_boards_have_period_one():
+    block = [[A, A], [A, A]]
+    empty = [[D, D], [D, D]]
+
+    assert detect([[[A, D], [D, D]], block, block]).start == 1
+    assert detect([[[A, D], [D, D]], empty, empty]).period == 1
+
+
+def test_periods_longer_than_the_window_are_not_found():
+    boards = [[[A, D, D]], [[D, A, D]], [[D, D, A]], [[A, D, D]]]
+
+    assert detect(boards, window=2).period is None
+    assert detect(boards, window=3).period == 3
+
+
+def test_incremental_hash_matches_the_hash_of_the_whole_board():
+    rng = np.random.default_rng(0)
+    detector = CycleDetector(30, 20)
+
+    for generation in range(30):
+        board = rng.integers(0, 3 if generation % 7 == 0 else 2, (20, 30), dtype=np.uint8)
+        detector.update(board, generation)
+        fresh = CycleDetector(30, 20)
+        fresh.update(board, 0)
+        assert detector.hash == fresh.hash
+
+
+def test_hash_from_the_changed_cells_matches_the_hash_of_the_whole_board():
+    game = GameOfLife(width=32, height=32, seed=3, backend="incremental")
+    detector = CycleDetector(32, 32)
+    detector.update(game.to_array(), 0)
+
+    for generation in range(1, 20):
+        game.step()
+        detector.update(game.to_array(), generation, game.dirty)
+        fresh = CycleDetector(32, 32)
+        fresh.update(game.to_array(), 0)
+        assert detector.hash == fresh.hash
+
+
+def test_hash_collision_is_not_taken_as_a_cycle():
+    detector = CycleDetector(2, 1)
+    # Both cells share a key, so the two boards with one ALIVE cell hash the same
+    detector.keys[:] = 7
+
+    detector.update(np.array([[A, D]], dtype=np.uint8), 0)
+    detector.update(np.array([[D, A]], dtype=np.uint8), 1)
+    detector.update(np.array([[A, D]], dtype=np.uint8), 2)
+
+    assert detector.collisions == 1
+    assert (detector.period, detector.start) == (2, 0)
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy", "sparse", "bitpacked", "incremental"])
+def test_advance_jumps_over_the_cycle(backend):
+    game = GameOfLife(width=32, height=32, seed=5, backend=backend, detect_cycles=True)
+    reference = GameOfLife(width=32, height=32, seed=5, backend="numpy")
+
+    game.advance(10_000)
+    reference.advance(game.cycles.start + (10_000 - game.cycles.start) % game.period)
+
+    assert game.generation == 10_000
+    assert game.period is not None
+    assert np.array_equal(game.to_array(), reference.to_array())
+    assert np.array_equal(game.ever_alive, reference.ever_alive)
+
+
+def test_cycle_detection_needs_a_deterministic_rule_on_a_bounded_board():
+    with pytest.raises(ValueError):
+        GameOfLife(width=10, height=10, rules=resolve_rule("zombie"), detect_cycles=True)
+    with pytest.raises(ValueError):
+        GameOfLife(width=10, height=10, backend="hashlife", detect_cycles=True)
+    with pytest.raises(ValueError):
+        GameOfLife(width=10, height=10, backend="numpy", boundary="infinite", detect_cycles=True)
+
+
+def test_run_reports_the_period_and_stops_on_cycles():
+    game = GameOfLife(file="board_file/blinker.json", detect_cycles=True)
+
+    records = list(run(game, 100, every=3, stop_on_cycle=True))
+
+    assert [record["generation"] for record in records] == [0, 3]
+    assert (records[-1]["period"], records[-1]["cycle_start"]) == (2, 0)
@@ -0,0 +1,104 @@
+import os
+import stat
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+from PIL import Image
+
+from config.config import Config
+from engine.export import PALETTE_ARRAY, export, scale_cells
+from engine.game_of_life import GameOfLife
+from main import cli
+
+
+D = Config.DEAD
+A = Config.ALIVE
+
+
+def gif_frames(path):
+    with Image.open(path) as image:
+        frames = []
+        for index in range(image.n_frames):
+            image.seek(index)
+            frames.append((np.array(image.convert("RGB")), image.info["duration"]))
+        return frames
+
+
+def test_scale_cells_draws_every_cell_as_a_square():
+    cells = np.array([[D, A], [A, D]], dtype=np.uint8)
+
+    assert scale_cells(cells, 2).tolist() == [
+        [D, D, A, A],
+        [D, D, A, A],
+        [A, A, D, D],
+        [A, A, D, D],
+    ]
+
+
+def test_gif_holds_every_board_of_the_game(tmp_path):
+    path = str(tmp_path / "game.gif")
+    game = GameOfLife(width=20, height=15, seed=3, backend="numpy")
+    reference = GameOfLife(width=20, height=15, seed=3, backend="numpy")
+
+    export(game, path, frames=6, every=2, scale=3, fps=20)
+
+    frames = gif_frames(path)
+    assert len(frames) == 6
+    for index, (pixels, duration) in enumerate(frames):
+        if index:
+            reference.advance(2)
+        assert np.array_equal(pixels, PALETTE_ARRAY[scale_cells(reference.to_array(), 3)])
+        assert duration == 50
+    assert game.generation == 10
+
+
+def test_unchanged_frames_are_kept(tmp_path):
+    path = str(tmp_path / "blinker.gif")
+    game = GameOfLife(file="board_file/blinker.json", backend="numpy")
+
+    # A blinker has period 2, every frame shows the same board
+    export(game, path, frames=4, every=2, scale=1)
+
+    frames = gif_frames(path)
+    assert len(frames) == 4
+    assert all(np.array_equal(pixels, frames[0][0]) for pixels, _ in frames)
+
+
+def test_mp4_frames_are_piped_to_ffmpeg(tmp_path, monkeypatch):
+    # A fake ffmpeg saving the raw frames it reads to the output path, its last argument
+    ffmpeg = tmp_path / "ffmpeg"
+    ffmpeg.write_text('#!/bin/sh\nfor last; do :; done\ncat > "$last"\n')
+    ffmpeg.chmod(ffmpeg.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    path = str(tmp_path / "game.mp4")
+    game = GameOfLife(width=5, height=3, seed=4, backend="numpy")
+    board = game.to_array().copy()
+
+    export(game, path, frames=3, scale=1)
+
+    # The frames are padded to even sizes
+    raw = np.fromfile(path, dtype=np.uint8).reshape(3, 4, 6, 3)
+    assert np.array_equal(raw[0, :3, :5], PALETTE_ARRAY[board])
+    assert (raw[:, 3] == PALETTE_ARRAY[D]).all() and (raw[:, :, 5] == PALETTE_ARRAY[D]).all()
+
+
+def test_mp4_export_needs_ffmpeg(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    with pytest.raises(ValueError):
+        export(GameOfLife(width=5, height=5), str(tmp_path / "game.mp4"))
+
+
+def test_unknown_formats_are_refused(tmp_path):
+    with pytest.raises(ValueError):
+        export(GameOfLife(width=5, height=5), str(tmp_path / "game.avi"))
+
+
+def test_export_command_writes_a_gif(tmp_path):
+    path = tmp_path / "pulsar.gif"
+
+    result = CliRunner().invoke(cli, ["export", str(path), "--file", "board_file/pulsar.json", "--frames", "5", "--every", "3"])
+
+    assert result.exit_code == 0, result.output
+    assert len(gif_frames(path)) == 5
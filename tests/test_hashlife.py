@@ -0,0 +1,53 @@
+import pytest
+
+from config.config import Config
+from engine.board import create_board, create_history
+from engine.hashlife import HashLife, HashLifeBackend
+from engine.sparse import SparseBackend
+from rules.rules import MOORE_NEIGHBORS, classic_rules, respawn_rules, von_neumann_rules, zombie_rules
+
+
+A = Config.ALIVE
+
+GLIDER = {(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)}
+
+
+def test_glider_moves_one_cell_diagonally_every_four_generations():
+    universe = HashLife({3}, {2, 3}, MOORE_NEIGHBORS)
+    universe.set_cells(GLIDER)
+
+    universe.advance(4 * 1000)
+
+    assert set(universe.cells(-10**6, -10**6, 10**6, 10**6)) == {(i + 1000, j + 1000) for i, j in GLIDER}
+
+
+@pytest.mark.parametrize("rule", [classic_rules, von_neumann_rules])
+def test_advance_matches_step_by_step_backend(rule):
+    board = create_board("board_file/ggg.json", "DEAD", "center", 200, 200)
+    expected = SparseBackend.from_board(board, rule, create_history(board))
+    backend = HashLifeBackend.from_board(board, rule, create_history(board))
+
+    expected.advance(100)
+    backend.advance(100)
+
+    assert backend.board == expected.board
+
+
+def test_garbage_collection_bounds_the_cache_and_keeps_results_exact():
+    board = create_board("board_file/ggg.json", "DEAD", "center", 200, 200)
+    cells = {(i, j) for i, row in enumerate(board) for j, cell in enumerate(row) if cell == A}
+    expected = SparseBackend.from_board(board, classic_rules, create_history(board))
+    backend = HashLifeBackend(200, 200, cells, classic_rules, max_nodes=500)
+
+    for _ in range(5):
+        expected.advance(20)
+        backend.advance(20)
+
+        assert len(backend.universe._cache) <= 500
+        assert backend.board == expected.board
+
+
+@pytest.mark.parametrize("rule", [respawn_rules, zombie_rules])
+def test_stochastic_rules_are_refused(rule):
+    with pytest.raises(ValueError, match="stochastic"):
+        HashLifeBackend(3, 3, set(), rule)
@@ -0,0 +1,55 @@
+import random
+
+import numpy as np
+import pytest
+
+from config.config import Config
+from engine.backends import NumpyBackend
+from engine.board import create_board, create_history
+from engine.incremental import IncrementalBackend
+from rules.compiler import compile_rule
+from rules.rules import classic_rules, zombie_rules
+
+
+D = Config.DEAD
+A = Config.ALIVE
+
+
+def random_board(width, height, seed):
+    rng = random.Random(seed)
+    return [[rng.choice([D, A]) for _ in range(width)] for _ in range(height)]
+
+
+@pytest.mark.parametrize("rule", [classic_rules, compile_rule("B2/S/C3")])
+@pytest.mark.parametrize("tile_size", [4, 7, 32])
+def test_incremental_backend_matches_numpy_backend(rule, tile_size):
+    board = random_board(45, 30, seed=8)
+    expected = NumpyBackend(board, rule, create_history(board))
+    backend = IncrementalBackend(board, rule, create_history(board), tile_size=tile_size)
+
+    for _ in range(30):
+        previous = backend.array.copy()
+        expected.step()
+        backend.step()
+
+        assert (backend.array == expected.array).all()
+        assert backend.dirty == set(zip(*(axis.tolist() for axis in np.nonzero(previous != backend.array))))
+    assert np.array_equal(backend.ever_alive, expected.ever_alive)
+
+
+def test_settled_tiles_are_not_recomputed_and_the_board_is_updated_in_place():
+    board = create_board("board_file/blinker.json", "DEAD", "topleft", 64, 64)
+    backend = IncrementalBackend(board, classic_rules, create_history(board), tile_size=8)
+    array = backend.array
+
+    backend.step()
+    backend.step()
+
+    assert backend.array is array
+    assert np.count_nonzero(backend.active) == 1
+    assert backend.dirty == {(1, 2), (3, 2), (2, 1), (2, 3)}
+
+
+def test_stochastic_rules_are_refused():
+    with pytest.raises(ValueError):
+        IncrementalBackend([[D]], zombie_rules, set())
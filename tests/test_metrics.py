@@ -0,0 +1,153 @@
+import csv
+import io
+import json
+from dataclasses import replace
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from config.config import Config
+from engine.game_of_life import GameOfLife
+from engine.metrics import FIELDS, MetricsWriter, measure, measure_cells
+from main import cli
+from rules.rules import zombie_rules
+
+
+D = Config.DEAD
+A = Config.ALIVE
+Z = Config.ZOMBIE
+
+
+def test_measure_counts_the_changes_between_two_boards():
+    previous = np.array([
+        [D, A, D, D],
+        [D, A, D, D],
+        [D, A, D, D],
+    ], dtype=np.uint8)
+    cells = np.array([
+        [D, D, D, D],
+        [A, A, A, D],
+        [D, D, D, Z],
+    ], dtype=np.uint8)
+
+    metrics = measure(previous, cells, 7, 0.5)
+
+    assert (metrics.generation, metrics.population, metrics.births, metrics.deaths, metrics.zombies) == (7, 3, 2, 2, 1)
+    assert (metrics.top, metrics.left, metrics.bottom, metrics.right) == (1, 0, 3, 4)
+    assert metrics.step_s == 0.5
+
+
+def test_empty_board_has_no_bounding_box():
+    cells = np.zeros((3, 3), dtype=np.uint8)
+
+    metrics = measure(cells, cells, 1, 0.0)
+
+    assert metrics.population == 0
+    assert (metrics.top, metrics.left, metrics.bottom, metrics.right) == (None, None, None, None)
+
+
+def test_measure_cells_agrees_with_measure():
+    previous = {(0, 1), (1, 1), (2, 1)}
+    alive = {(1, 0), (1, 1), (1, 2)}
+
+    metrics = measure_cells(previous, alive, {(2, 3): Z}, 7, 0.5)
+
+    assert (metrics.generation, metrics.population, metrics.births, metrics.deaths, metrics.zombies) == (7, 3, 2, 2, 1)
+    assert (metrics.top, metrics.left, metrics.bottom, metrics.right) == (1, 0, 3, 4)
+
+
+@pytest.mark.parametrize("backend, boundary", [
+    ("python", None), ("numpy", "infinite"), ("sparse", None), ("sparse", "infinite"), ("hashlife", None), ("incremental", None),
+])
+def test_backends_measure_the_same_metrics(backend, boundary):
+    game = GameOfLife(width=24, height=24, seed=4, backend=backend, boundary=boundary or ("infinite" if backend == "hashlife" else None))
+    received = []
+    game.add_observer(received.append)
+    previous = np.array(game.to_array())
+
+    expected = []
+    for generations in [1, 1, 5, 1, 30]:
+        game.advance(generations)
+        cells = np.array(game.to_array())
+        expected.append(measure(previous, cells, game.generation, 0.0))
+        previous = cells
+
+    assert [replace(metrics, step_s=0.0) for metrics in received] == expected
+
+
+def test_observers_get_the_metrics_of_every_step():
+    game = GameOfLife(file="board_file/blinker.json")
+    received = []
+    game.add_observer(received.append)
+
+    game.step()
+    game.step()
+
+    assert [metrics.generation for metrics in received] == [1, 2]
+    assert all(metrics.population == 3 and metrics.births == 2 and metrics.deaths == 2 for metrics in received)
+    assert all(metrics.step_s >= 0 for metrics in received)
+
+
+def test_unobserved_games_keep_no_previous_board():
+    game = GameOfLife(width=10, height=10, seed=1, backend="numpy")
+    received = []
+
+    game.add_observer(received.append)
+    game.remove_observer(received.append)
+    game.step()
+
+    assert received == []
+    assert game._observed is None
+
+
+def test_advance_notifies_once_with_the_changes_over_the_jump():
+    game = GameOfLife(file="board_file/blinker.json", backend="numpy")
+    received = []
+    game.add_observer(received.append)
+
+    # A blinker is back to its board after two generations
+    game.advance(4)
+
+    assert [(metrics.generation, metrics.births, metrics.deaths) for metrics in received] == [(4, 0, 0)]
+
+
+def test_zombies_are_counted():
+    game = GameOfLife(width=100, height=100, seed=2, rules=zombie_rules, backend="numpy")
+    reference = GameOfLife(width=100, height=100, seed=2, rules=zombie_rules, backend="numpy")
+    received = []
+    game.add_observer(received.append)
+
+    # ALIVE cells turn ZOMBIE at random, a few per generation on this board
+    expected = []
+    for _ in range(5):
+        game.step()
+        reference.step()
+        expected.append(int(np.count_nonzero(reference.to_array() == Z)))
+
+    assert [metrics.zombies for metrics in received] == expected
+    assert expected[-1] > 0
+
+
+def test_writer_writes_csv_rows_and_json_lines():
+    metrics = measure(np.array([[A]], dtype=np.uint8), np.array([[D]], dtype=np.uint8), 1, 0.25)
+    csv_stream, jsonl_stream = io.StringIO(), io.StringIO()
+
+    MetricsWriter(csv_stream, "csv")(metrics)
+    MetricsWriter(jsonl_stream, "jsonl")(metrics)
+
+    rows = list(csv.DictReader(io.StringIO(csv_stream.getvalue())))
+    assert list(rows[0]) == FIELDS
+    assert rows[0]["deaths"] == "1" and rows[0]["top"] == ""
+    assert json.loads(jsonl_stream.getvalue())["deaths"] == 1
+
+
+def test_run_command_writes_the_metrics(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+
+    result = CliRunner().invoke(cli, ["run", "--file", "board_file/pulsar.json", "--generations", "6", "--output", str(tmp_path / "records.jsonl"), "--metrics", str(path)])
+
+    assert result.exit_code == 0, result.output
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["generation"] for line in lines] == [1, 2, 3, 4, 5, 6]
+    assert lines[-1]["population"] == 48
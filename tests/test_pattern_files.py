@@ -0,0 +1,156 @@
+import io
+
+import numpy as np
+import pytest
+
+from config.config import Config
+from engine.board import create_board, create_sparse_board
+from engine.convert import convert, read_board
+from engine import pattern_files
+from engine.game_of_life import GameOfLife
+from engine.pattern_files import parse_cells, parse_rle, read_pattern_rule, write_cells, write_rle
+from rules.compiler import resolve_rule
+
+
+D = Config.DEAD
+A = Config.ALIVE
+Z = Config.ZOMBIE
+
+GLIDER = [
+    [D, A, D],
+    [D, D, A],
+    [A, A, A],
+]
+
+GOSPER_GLIDER_GUN = """#N Gosper glider gun
+#C A true period 30 glider gun.
+x = 36, y = 9, rule = B3/S23
+24bo$22bobo$12b2o6b2o12b2o$11bo3bo4b2o12b2o$2o8bo5bo3b2o$2o8bo3bob2o4b
+obo$10bo5bo7bo$11bo3bo$12b2o!
+"""
+
+
+def write(writer, board, *args):
+    stream = io.StringIO()
+    writer(stream, board, *args)
+    return stream.getvalue()
+
+
+def test_parse_rle_reads_the_header_and_the_runs():
+    pattern = parse_rle(io.StringIO(GOSPER_GLIDER_GUN))
+
+    assert (pattern.width, pattern.height) == (36, 9)
+    assert pattern.rule == "B3/S23"
+    assert pattern.name == "Gosper glider gun"
+    assert len(pattern.rows) == 36
+    assert pattern.to_array()[4, :2].tolist() == [A, A]
+
+
+def test_parse_rle_skips_empty_rows_and_joins_counts_cut_by_a_line_end():
+    pattern = parse_rle(["x = 12, y = 4\n", "1\n", "1bo3$o!\n"])
+
+    assert pattern.cells() == {(0, 11): A, (3, 0): A}
+
+
+def test_parse_rle_decodes_by_chunks(monkeypatch):
+    board = np.random.default_rng(1).integers(0, 30, (20, 30), dtype=np.uint8)
+    data = write(write_rle, board)
+
+    monkeypatch.setattr(pattern_files, "RLE_CHUNK_SIZE", 7)
+
+    assert np.array_equal(parse_rle(io.StringIO(data)).to_array(), board)
+
+
+def test_parse_rle_reads_multistate_cells():
+    pattern = parse_rle(["x = 3, y = 1, rule = B2/S/C3\n", ".AB!\n"])
+
+    assert pattern.to_array().tolist() == [[D, A, Z]]
+
+
+@pytest.mark.parametrize("data", ["x = 3, y = 1\n4o!\n", "x = 3, y = 1\nobz!\n", "3o!\n"])
+def test_parse_rle_refuses_invalid_files(data):
+    with pytest.raises(ValueError):
+        parse_rle(io.StringIO(data))
+
+
+def test_parse_cells_pads_short_rows():
+    pattern = parse_cells(["!Name: Glider\n", ".O\n", "..O\n", "OOO\n"])
+
+    assert pattern.name == "Glider"
+    assert pattern.to_array().tolist() == GLIDER
+
+
+def test_write_rle_omits_trailing_dead_cells_and_counts_empty_rows():
+    board = [
+        [D, D, A, A, D],
+        [D, D, D, D, D],
+        [D, D, D, D, D],
+        [A, D, D, D, D],
+    ]
+
+    assert write(write_rle, board, "B3/S23") == "x = 5, y = 4, rule = B3/S23\n2b2o3$o!\n"
+
+
+def test_write_rle_wraps_lines():
+    board = np.tile(np.array([A, D], dtype=np.uint8), (10, 50))
+
+    lines = write(write_rle, board).splitlines()
+
+    assert all(len(line) <= 70 for line in lines)
+    assert np.array_equal(parse_rle(lines).to_array(), board)
+
+
+@pytest.mark.parametrize("states", [2, 3, 30])
+def test_rle_round_trips(states):
+    board = np.random.default_rng(states).integers(0, states, (20, 30), dtype=np.uint8)
+    board[5] = D
+
+    assert np.array_equal(parse_rle(io.StringIO(write(write_rle, board))).to_array(), board)
+
+
+def test_cells_round_trips():
+    board = np.random.default_rng(0).integers(0, 2, (20, 30), dtype=np.uint8)
+
+    assert np.array_equal(parse_cells(io.StringIO(write(write_cells, board))).to_array(), board)
+    with pytest.raises(ValueError):
+        write(write_cells, [[Z]])
+
+
+def test_board_loaders_accept_pattern_files(tmp_path):
+    path = tmp_path / "glider.rle"
+    path.write_text("x = 3, y = 3\nbo$2bo$3o!\n")
+
+    assert create_board(str(path), "DEAD", "center", 7, 7) == create_board("board_file/glider.rle", "DEAD", "center", 7, 7)
+    assert create_sparse_board(str(path), "DEAD", "topleft", None, None) == (3, 3, {(0, 1): A, (1, 2): A, (2, 0): A, (2, 1): A, (2, 2): A})
+
+
+def test_game_uses_the_rule_of_the_rle_header(tmp_path):
+    path = tmp_path / "seeds.rle"
+    path.write_text("x = 2, y = 2, rule = B2/S\n2o!\n")
+
+    assert read_pattern_rule(str(path)) == "B2/S"
+    assert GameOfLife(file=str(path)).rules is resolve_rule("seeds")
+    assert GameOfLife(file=str(path), rules=resolve_rule("classic")).rules is resolve_rule("classic")
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy", "sparse", "hashlife"])
+@pytest.mark.parametrize("path", ["board_file/glider.rle", "board_file/r_pentomino.cells"])
+def test_pattern_files_load_like_json_files(tmp_path, backend, path):
+    json_path = str(tmp_path / "pattern.json")
+    convert(path, json_path)
+    game = GameOfLife(file=path, width=40, height=40, placement="center", backend=backend)
+    reference = GameOfLife(file=json_path, width=40, height=40, placement="center", backend=backend)
+
+    game.advance(8)
+    reference.advance(8)
+
+    assert np.array_equal(game.to_array(), reference.to_array())
+
+
+def test_convert_keeps_the_rule_between_rle_and_snapshots(tmp_path):
+    convert("board_file/glider.rle", str(tmp_path / "glider.gol"))
+    convert(str(tmp_path / "glider.gol"), str(tmp_path / "glider.rle"))
+
+    cells, rule, _ = read_board(str(tmp_path / "glider.rle"))
+    assert rule == "B3/S23"
+    assert cells.tolist() == GLIDER
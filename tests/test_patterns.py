@@ -1,4 +1,11 @@
-from engine.patterns import detect_patterns
+from config.config import Config
+from engine.board import create_history
+from engine.state import next_board_state
+from engine.patterns import detect_patterns, detect_patterns_per_cell, load_pattern_library
+from rules.rules import classic_rules
+
+D = Config.DEAD
+A = Config.ALIVE
 
 
 def test_detect_patterns_finds_block():
@@ -26,3 +33,79 @@ def test_detect_patterns_finds_blinker():
 
     assert len(patterns) == 1
     assert patterns[0].name == "blinker"
+
+
+def place(shape: list[str], width: int = 12, height: int = 12, top: int = 3, left: int = 3) -> list[list[int]]:
+    board = [[D] * width for _ in range(height)]
+    for i, row in enumerate(shape):
+        for j, cell in enumerate(row):
+            if cell == "O":
+                board[top + i][left + j] = A
+    return board
+
+
+def test_detect_patterns_finds_every_library_phase():
+    library = load_pattern_library()
+
+    for key, (name, _) in library.shapes.items():
+        height, width, cells = key
+        shape = ["".join("O" if cell else "." for cell in cells[i * width:(i + 1) * width]) for i in range(height)]
+
+        patterns = detect_patterns(place(shape))
+
+        assert [pattern.name for pattern in patterns] == [name]
+        assert len(patterns[0].cells) == cells.count(1)
+
+
+def test_detect_patterns_follows_a_glider():
+    board = place([".O.", "..O", "OOO"])
+
+    for _ in range(8):
+        patterns = detect_patterns(board)
+        assert [(pattern.name, pattern.kind) for pattern in patterns] == [("glider", "spaceship")]
+        board, _ = next_board_state(board, classic_rules, create_history(board))
+
+
+def test_detect_patterns_finds_split_oscillator_phases():
+    beacon = place(["OO..", "O...", "...O", "..OO"])
+    toad = place(["..O.", "O..O", "O..O", ".O.."])
+
+    assert [pattern.name for pattern in detect_patterns(beacon)] == ["beacon"]
+    assert [pattern.name for pattern in detect_patterns(toad)] == ["toad"]
+
+
+def test_detect_patterns_ignores_patterns_touching_other_cells():
+    board = place(["OO", "OO"])
+    board[5][5] = A
+
+    assert detect_patterns(board) == []
+
+
+def test_detect_patterns_ignores_zombie_cells():
+    board = place(["OOO"])
+    board[4][4] = Config.ZOMBIE
+
+    assert detect_patterns(board) == []
+
+
+def test_detect_patterns_finds_several_patterns_in_row_major_order():
+    board = place(["OO...OO.", "OO...O.O", "......O.", "........", ".OOO...."])
+
+    patterns = detect_patterns(board)
+
+    assert [pattern.name for pattern in patterns] == ["block", "boat", "blinker"]
+    assert patterns[0].cells == [(3, 3), (3, 4), (4, 3), (4, 4)]
+
+
+def test_detect_patterns_matches_the_per_cell_detectors():
+    board = place(["OO....", "OO....", "......", "...OOO"])
+
+    expected = [(pattern.name, pattern.cells) for pattern in detect_patterns_per_cell(board)]
+
+    assert [(pattern.name, sorted(pattern.cells)) for pattern in detect_patterns(board)] == expected
+
+
+def test_detect_patterns_ignores_split_phases_next_to_large_components():
+    board = place(["..O.......", "O..O.OOOOO", "O..O.OOOOO", ".O........"], width=16)
+
+    assert detect_patterns(board) == []
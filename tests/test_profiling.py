@@ -0,0 +1,60 @@
+import pstats
+
+import pytest
+
+from engine.game_of_life import GameOfLife
+from engine.profiling import Profiler
+from engine.simulation import Simulation
+from tests.test_simulation import wait_for
+
+
+def test_phases_keep_the_last_window_of_durations():
+    profiler = Profiler(window=3)
+
+    for duration_ms in [100, 1, 2, 3]:
+        profiler.record("step", duration_ms * 1_000_000)
+
+    assert profiler.counts["step"] == 4
+    assert list(profiler.durations["step"]) == [1_000_000, 2_000_000, 3_000_000]
+    assert profiler.percentiles("step")[50] == pytest.approx(2.0)
+
+
+def test_phase_times_its_block():
+    profiler = Profiler()
+
+    with profiler.phase("render"):
+        sum(range(1000))
+    with pytest.raises(ZeroDivisionError):
+        with profiler.phase("render"):
+            1 / 0
+
+    assert profiler.counts == {"render": 2}
+    assert all(duration > 0 for duration in profiler.durations["render"])
+
+
+def test_summary_lists_every_phase():
+    profiler = Profiler()
+    profiler.record("step", 1_500_000)
+    profiler.record("detect", 500_000)
+
+    lines = profiler.summary().splitlines()
+
+    assert lines[0].split() == ["phase", "runs", "p50", "ms", "p95", "ms", "p99", "ms"]
+    assert lines[1].split() == ["step", "1", "1.500", "1.500", "1.500"]
+    assert lines[2].split()[0] == "detect"
+
+
+def test_simulation_steps_are_profiled_with_cprofile(tmp_path):
+    path = str(tmp_path / "step.pstats")
+    profiler = Profiler(stats_path=path)
+    simulation = Simulation(GameOfLife(width=20, height=20, seed=1, backend="numpy"), paused=False, profiler=profiler)
+    simulation.start()
+    try:
+        wait_for(lambda: profiler.counts.get("step", 0) >= 5)
+    finally:
+        simulation.stop()
+        simulation.join()
+    profiler.close()
+
+    functions = {function for _, _, function in pstats.Stats(path).stats}
+    assert "step" in functions
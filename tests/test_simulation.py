@@ -0,0 +1,87 @@
+import time
+
+import numpy as np
+
+from engine.game_of_life import GameOfLife
+from engine.simulation import Simulation
+
+
+def wait_for(condition, timeout_s=5.0):
+    deadline = time.perf_counter() + timeout_s
+    while not condition():
+        assert time.perf_counter() < deadline
+        time.sleep(0.001)
+
+
+def test_paused_simulation_publishes_frames_without_stepping():
+    engine = GameOfLife(file="board_file/blinker.json")
+    simulation = Simulation(engine, paused=True)
+    simulation.start()
+    try:
+        simulation.request(0, 0, 3, 4)
+        wait_for(lambda: simulation.frame is not None)
+
+        assert simulation.generation == 0
+        assert simulation.frame.viewport == (0, 0, 3, 4)
+        assert np.array_equal(simulation.frame.cells, np.array(engine.board)[0:3, 0:4])
+    finally:
+        simulation.stop()
+        simulation.join()
+
+
+def test_unthrottled_simulation_hands_over_the_requested_viewport():
+    engine = GameOfLife(width=20, height=20, backend="numpy")
+    simulation = Simulation(engine, interval_s=0.0, paused=False)
+    simulation.start()
+    try:
+        wait_for(lambda: simulation.generation >= 50)
+        simulation.request(5, 5, 10, 15)
+        wait_for(lambda: simulation.frame is not None)
+    finally:
+        simulation.stop()
+        simulation.join()
+
+    frame = simulation.frame
+    assert frame.generation >= 50
+    assert frame.cells.shape == (5, 10)
+    assert frame.cells.dtype == np.uint8
+
+
+def test_throttled_simulation_waits_for_its_interval():
+    engine = GameOfLife(width=10, height=10)
+    simulation = Simulation(engine, interval_s=10.0, paused=False)
+    simulation.start()
+    try:
+        wait_for(lambda: simulation.generation == 1)
+        time.sleep(0.05)
+
+        assert simulation.generation == 1
+    finally:
+        simulation.stop()
+        simulation.join()
+
+    assert not simulation.is_alive()
+
+
+def test_resumed_engine_counts_from_its_generation():
+    engine = GameOfLife(file="board_file/blinker.json")
+    engine.advance(9)
+
+    assert Simulation(engine).generation == 9
+
+
+def test_watched_simulation_measures_only_while_watched():
+    engine = GameOfLife(file="board_file/blinker.json", backend="numpy")
+    simulation = Simulation(engine, paused=False)
+    received = []
+    simulation.watch(received.append)
+    simulation.start()
+    try:
+        wait_for(lambda: len(received) >= 3)
+        simulation.watch(None)
+        wait_for(lambda: not engine.observers)
+    finally:
+        simulation.stop()
+        simulation.join()
+
+    assert all(metrics.population == 3 for metrics in received)
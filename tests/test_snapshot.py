@@ -0,0 +1,137 @@
+import json
+
+import numpy as np
+import pytest
+
+from config.config import Config
+from engine.game_of_life import GameOfLife
+from engine.convert import convert
+from engine.snapshot import load_snapshot, save_snapshot
+from rules.compiler import resolve_rule
+
+
+D = Config.DEAD
+A = Config.ALIVE
+
+
+def random_cells(width, height, states=2, seed=0):
+    return np.random.default_rng(seed).integers(0, states, (height, width), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("encoding", ["packed", "uint8"])
+@pytest.mark.parametrize("width", [1, 64, 100])
+def test_snapshot_round_trips(tmp_path, encoding, width):
+    path = tmp_path / "board.gol"
+    cells = random_cells(width, 7)
+
+    save_snapshot(path, cells, encoding=encoding)
+    snapshot = load_snapshot(path)
+
+    assert snapshot.encoding == encoding
+    assert (snapshot.width, snapshot.height) == (width, 7)
+    assert np.array_equal(snapshot.cells, cells)
+
+
+def test_header_holds_the_rule_and_the_generation(tmp_path):
+    path = tmp_path / "board.gol"
+
+    save_snapshot(path, random_cells(10, 10), rule="B36/S23", generation=12345678901)
+    snapshot = load_snapshot(path)
+
+    assert snapshot.rule == "B36/S23"
+    assert snapshot.generation == 12345678901
+
+
+def test_boards_with_more_states_keep_one_byte_per_cell(tmp_path):
+    path = tmp_path / "board.gol"
+    cells = random_cells(10, 10, states=3)
+
+    save_snapshot(path, cells)
+
+    assert load_snapshot(path).encoding == "uint8"
+    assert np.array_equal(load_snapshot(path).cells, cells)
+    with pytest.raises(ValueError):
+        save_snapshot(path, cells, encoding="packed")
+
+
+def test_payload_is_mapped_read_only(tmp_path):
+    path = tmp_path / "board.gol"
+    cells = random_cells(30, 20)
+
+    for encoding in ["packed", "uint8"]:
+        save_snapshot(path, cells, encoding=encoding)
+        snapshot = load_snapshot(path)
+
+        assert isinstance(snapshot.payload, np.memmap)
+        assert not snapshot.payload.flags.writeable
+        assert np.array_equal(snapshot.packed.to_array(), cells)
+
+
+def test_packed_snapshot_is_smaller(tmp_path):
+    cells = random_cells(640, 100)
+
+    save_snapshot(tmp_path / "packed.gol", cells, encoding="packed")
+    save_snapshot(tmp_path / "uint8.gol", cells, encoding="uint8")
+
+    assert (tmp_path / "packed.gol").stat().st_size * 7 < (tmp_path / "uint8.gol").stat().st_size
+
+
+def test_bad_files_are_refused(tmp_path):
+    path = tmp_path / "board.gol"
+    path.write_bytes(b"not a snapshot at all, only text")
+
+    with pytest.raises(ValueError):
+        load_snapshot(path)
+
+
+def test_json_conversion_round_trips(tmp_path):
+    grid = [
+        [D, A, D],
+        [D, D, A],
+        [A, A, A],
+    ]
+    source = tmp_path / "glider.json"
+    source.write_text(json.dumps({"format": "grid", "grid": grid}))
+
+    convert(source, tmp_path / "glider.gol", rule="classic")
+    convert(tmp_path / "glider.gol", tmp_path / "glider_coordinates.json")
+
+    assert load_snapshot(tmp_path / "glider.gol").rule == "classic"
+    assert json.loads((tmp_path / "glider_coordinates.json").read_text()) == {
+        "format": "coordinates",
+        "width": 3,
+        "height": 3,
+        "alive_cells": [[0, 1], [1, 2], [2, 0], [2, 1], [2, 2]],
+    }
+
+
+@pytest.mark.parametrize("backend", ["numpy", "bitpacked"])
+def test_game_restores_the_saved_generation_and_rule(tmp_path, backend):
+    path = tmp_path / "game.gol"
+    game = GameOfLife(width=40, height=30, rules=resolve_rule("highlife"), seed=3)
+    game.advance(5)
+    game.save(path)
+
+    restored = GameOfLife(file=str(path), backend=backend)
+    game.advance(5)
+    restored.advance(5)
+
+    assert restored.generation == 10
+    assert restored.rules is resolve_rule("highlife")
+    assert np.array_equal(restored.to_array(), game.to_array())
+
+
+def test_bitpacked_backend_steps_the_mapped_words(tmp_path):
+    path = tmp_path / "game.gol"
+    cells = random_cells(130, 20, seed=5)
+    save_snapshot(path, cells, "classic")
+
+    game = GameOfLife(file=str(path), backend="bitpacked")
+
+    assert isinstance(game.backend.packed.words, np.memmap)
+    assert np.array_equal(game.ever_alive, cells == A)
+    reference = GameOfLife(file=str(path), backend="numpy")
+    game.advance(3)
+    reference.advance(3)
+    assert np.array_equal(game.to_array(), reference.to_array())
+    assert np.array_equal(game.ever_alive, reference.ever_alive)
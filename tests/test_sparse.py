@@ -0,0 +1,71 @@
+import random
+
+import numpy as np
+import pytest
+
+from config.config import Config
+from engine.board import create_board, create_history, create_sparse_board
+from engine.sparse import SparseBackend
+from engine.state import next_board_state
+from rules.rules import classic_rules, respawn_rules, von_neumann_rules, zombie_rules
+
+
+D = Config.DEAD
+A = Config.ALIVE
+Z = Config.ZOMBIE
+
+
+def random_board(width, height, states, seed):
+    rng = random.Random(seed)
+    return [[rng.choice(states) for _ in range(width)] for _ in range(height)]
+
+
+@pytest.mark.parametrize(
+    "rule, states",
+    [
+        (classic_rules, [D, A]),
+        (von_neumann_rules, [D, A]),
+        (respawn_rules, [D, A]),
+        (zombie_rules, [D, A, Z]),
+    ],
+)
+def test_sparse_backend_matches_python_rules(rule, states):
+    board = random_board(19, 13, states, seed=2)
+    ever_alive = create_history(board)
+    backend = SparseBackend.from_board(board, rule, ever_alive, rng=np.random.default_rng(2))
+    rng = np.random.default_rng(2)
+
+    for generation in range(10):
+        noise = rng.random((13, 19)).tolist() if rule in (respawn_rules, zombie_rules) else None
+        board, ever_alive = next_board_state(board, rule, ever_alive, noise)
+        backend.step()
+
+        assert backend.board == board
+        assert np.array_equal(backend.ever_alive, ever_alive)
+
+
+def test_sparse_backend_never_counts_cells_outside_the_board():
+    backend = SparseBackend(3, 3, {(0, 0): A, (0, 1): A, (1, 0): A}, classic_rules)
+
+    backend.step()
+
+    assert backend.alive == {(0, 0), (0, 1), (1, 0), (1, 1)}
+
+
+@pytest.mark.parametrize("placement", ["topleft", "center"])
+def test_create_sparse_board_matches_create_board(placement):
+    width, height, cells = create_sparse_board("board_file/ggg.json", "DEAD", placement, 60, 30)
+    board = create_board("board_file/ggg.json", "DEAD", placement, 60, 30)
+
+    assert (width, height) == (60, 30)
+    assert cells == {
+        (i, j): cell
+        for i, row in enumerate(board)
+        for j, cell in enumerate(row)
+        if cell != D
+    }
+
+
+def test_unsupported_rule_is_refused():
+    with pytest.raises(ValueError):
+        SparseBackend(1, 1, {}, lambda board, i, j, ever_alive: D)
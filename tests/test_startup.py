@@ -0,0 +1,18 @@
+from click.testing import CliRunner
+
+from benchmarks.startup import DEFERRED_MODULES, loaded_modules
+from main import cli
+
+
+def test_run_help_lists_the_options():
+    result = CliRunner().invoke(cli, ["run", "--help"])
+
+    assert result.exit_code == 0, result.output
+    assert "--backend" in result.output and "--metrics" in result.output
+
+
+def test_help_imports_none_of_the_command_modules():
+    loaded = loaded_modules(["run", "--help"])
+
+    assert [module for module in DEFERRED_MODULES if module in loaded] == []
+    assert not [module for module in loaded if module.startswith("engine.")]
@@ -1,8 +1,10 @@
+import numpy as np
 import pytest
 
 from config.config import Config
-from engine.state import dead_state, next_board_state
-from rules.rules import classic_rules
+from engine.game_of_life import next_board_state_optimized
+from engine.state import dead_state, next_board_state, random_state
+from rules.rules import TorusBoard, classic_rules
 
 
 D = Config.DEAD
@@ -10,12 +12,7 @@ A = Config.ALIVE
 
 
 def alive_cells(board):
-    return {
-        (i, j)
-        for i, row in enumerate(board)
-        for j, cell in enumerate(row)
-        if cell == A
-    }
+    return np.array(board) == A
 
 
 def step(board, ever_alive=None):
@@ -42,7 +39,7 @@ def test_dead_cell_with_three_neighbors_becomes_alive():
     next_board, ever_alive = step(board)
 
     assert next_board[1][1] == A
-    assert (1, 1) in ever_alive
+    assert ever_alive[1, 1]
 
 
 def test_dead_cell_with_fewer_than_three_neighbors_stays_dead():
@@ -166,8 +163,28 @@ def test_ever_alive_accumulates_cells_seen_alive_over_time():
         [A, D, D],
     ]
 
-    initial_history = {(0, 0), (1, 0), (2, 0)}
+    initial_history = alive_cells(board)
 
     _, ever_alive = step(board, initial_history)
 
-    assert ever_alive == {(0, 0), (1, 0), (2, 0), (1, 1)}
+    assert ever_alive.tolist() == [
+        [True, False, False],
+        [True, True, False],
+        [True, False, False],
+    ]
+
+
+def test_random_state_density():
+    board = random_state(100, 100, 0.2)
+
+    assert 1500 < sum(map(sum, board)) < 2500
+    with pytest.raises(ValueError):
+        random_state(10, 10, 1.5)
+
+
+@pytest.mark.parametrize("width, height", [(12, 9), (1, 1), (2, 3)])
+def test_next_board_state_optimized_matches_the_rules_on_both_boundaries(width, height):
+    board = random_state(width, height, 0.4, np.random.default_rng(width))
+
+    assert next_board_state_optimized(board) == step(board)[0]
+    assert next_board_state_optimized(board, torus=True) == step(TorusBoard(board))[0]
@@ -0,0 +1,90 @@
+import pytest
+from click.testing import CliRunner
+
+from engine.game_of_life import GameOfLife
+from engine.sweep import ResultWriter, SweepPoint, check_point, completed_keys, open_results, run_point, sweep, sweep_grid
+from main import cli
+
+
+def test_sweep_grid_combines_every_parameter():
+    points = sweep_grid(["classic", "B36/S23"], [(10, 10), (20, 5)], [0.3], [0, 1, 2], [50])
+
+    assert len(points) == 12
+    assert len({point.key for point in points}) == 12
+    assert points[0] == SweepPoint("classic", 10, 10, 0.3, 0, 50)
+
+
+def test_run_point_is_reproducible():
+    point = SweepPoint("zombie", 20, 20, 0.4, 3, 30)
+
+    first, second = run_point(point), run_point(point)
+
+    assert first.pop("elapsed_s") >= 0
+    second.pop("elapsed_s")
+    assert first == second
+    assert first["key"] == point.key
+
+
+def test_run_point_stops_at_extinction():
+    result = run_point(SweepPoint("classic", 10, 10, 0.0, 0, 100))
+
+    assert result["extinct_at"] == 0
+    assert result["final_population"] == 0
+
+
+def test_sweep_skips_completed_runs():
+    points = sweep_grid(["classic"], [(10, 10)], [0.5], range(4), [10])
+
+    results = list(sweep(points, workers=2, completed={points[0].key, points[2].key}))
+
+    assert sorted(result["seed"] for result in results) == [1, 3]
+
+
+@pytest.mark.parametrize("format", ["csv", "jsonl"])
+def test_results_are_resumable_after_a_cut_line(tmp_path, format):
+    path = str(tmp_path / f"results.{format}")
+    points = sweep_grid(["classic"], [(8, 8)], [0.5], range(3), [5])
+    with open_results(path, resume=False) as stream:
+        writer = ResultWriter(stream, format)
+        for point in points:
+            writer.write(run_point(point))
+    with open(path, "rb+") as f:
+        f.truncate(f.seek(0, 2) - 5)
+
+    stream = open_results(path, resume=True)
+    stream.close()
+
+    assert completed_keys(path, format) == {points[0].key, points[1].key}
+
+
+def test_run_point_jumps_to_the_end_of_a_cycle():
+    point = SweepPoint("classic", 24, 24, 0.4, 2, 5000)
+
+    result = run_point(point)
+    game = GameOfLife(width=24, height=24, density=0.4, seed=2)
+    game.advance(result["cycle_start"] + (5000 - result["cycle_start"]) % result["period"])
+
+    assert result["period"] is not None
+    assert result["final_population"] == game.population()
+
+
+def test_run_point_has_no_period_for_stochastic_rules():
+    result = run_point(SweepPoint("respawn", 10, 10, 0.4, 0, 20))
+
+    assert result["period"] is None
+    assert result["cycle_start"] is None
+
+
+def test_check_point_refuses_a_rule_the_backend_cannot_run():
+    check_point(SweepPoint("classic", 50, 50, 0.5, 0, 10, "bitpacked"))
+
+    with pytest.raises(ValueError):
+        check_point(SweepPoint("zombie", 50, 50, 0.5, 0, 10, "bitpacked"))
+
+
+def test_sweep_command_refuses_unsupported_rules_before_running():
+    result = CliRunner().invoke(cli, ["sweep", "--rule", "classic", "--rule", "zombie", "--backend", "bitpacked", "--seeds", "1"])
+
+    assert result.exit_code == 2
+    assert "not supported by the bitpacked backend" in result.output
+    assert result.exception is None or isinstance(result.exception, SystemExit)
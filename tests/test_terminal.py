@@ -0,0 +1,130 @@
+import io
+
+import pytest
+
+from config.config import Config
+from engine.incremental import IncrementalBackend
+from engine.patterns import Pattern
+from engine.terminal import TerminalRenderer
+from rules.rules import classic_rules
+
+
+D = Config.DEAD
+A = Config.ALIVE
+
+
+def frames(renderer, *boards, **options):
+    written = []
+    for board in boards:
+        renderer.stream.seek(0)
+        renderer.stream.truncate()
+        renderer.draw(board, **options)
+        written.append(renderer.stream.getvalue())
+    return written
+
+
+def test_first_frame_draws_every_row():
+    renderer = TerminalRenderer("emoji", io.StringIO(), size=(80, 24))
+    board = [
+        [D, A],
+        [Config.ZOMBIE, D],
+    ]
+
+    frame, = frames(renderer, board)
+
+    assert "\x1b[1;1H⬛⬜" in frame
+    assert "\x1b[2;1H🟩⬛" in frame
+
+
+def test_next_frames_only_write_the_changed_cells():
+    renderer = TerminalRenderer("emoji", io.StringIO(), size=(80, 24))
+    board = [[D] * 4 for _ in range(3)]
+    changed = [row[:] for row in board]
+    changed[1][1] = A
+    changed[1][2] = A
+    changed[2][0] = A
+
+    _, frame, unchanged = frames(renderer, board, changed, changed)
+
+    assert frame == "\x1b[2;3H⬜⬜\x1b[3;1H⬜"
+    assert unchanged == ""
+
+
+def test_dirty_cells_give_the_same_frame():
+    board = [[D] * 4 for _ in range(3)]
+    changed = [row[:] for row in board]
+    changed[1][1] = A
+    changed[1][2] = A
+
+    renderer = TerminalRenderer("emoji", io.StringIO(), size=(80, 24))
+    frames(renderer, board)
+    from_dirty, = frames(renderer, changed, dirty={(1, 1), (1, 2)})
+
+    assert from_dirty == "\x1b[2;3H⬜⬜"
+
+
+def test_pattern_cells_are_colored():
+    renderer = TerminalRenderer("emoji", io.StringIO(), size=(80, 24))
+    board = [[A, A, A]]
+
+    frame, = frames(renderer, board, patterns=[Pattern("blinker", [(0, 0), (0, 1), (0, 2)], "oscillator")])
+
+    assert "🟦🟦🟦" in frame
+
+
+def test_halfblock_draws_two_rows_per_character():
+    renderer = TerminalRenderer("halfblock", io.StringIO(), size=(80, 24))
+    board = [
+        [A, D, A],
+        [A, A, D],
+        [D, A, D],
+    ]
+
+    frame, = frames(renderer, board)
+
+    assert "\x1b[1;1H█▄▀" in frame
+    assert "\x1b[2;1H ▀ " in frame
+
+
+def test_braille_draws_eight_cells_per_character():
+    renderer = TerminalRenderer("braille", io.StringIO(), size=(80, 24))
+    board = [
+        [A, D],
+        [D, A],
+        [A, D],
+        [D, A],
+    ]
+
+    frame, = frames(renderer, board)
+
+    assert chr(0x2800 + 0x01 + 0x10 + 0x04 + 0x80) in frame
+
+
+def test_large_boards_are_cropped_to_the_terminal():
+    renderer = TerminalRenderer("emoji", io.StringIO(), size=(10, 3))
+    board = [[A] * 20 for _ in range(20)]
+
+    frame, = frames(renderer, board)
+
+    assert renderer.viewport(20, 20) == (3, 5)
+    assert frame.count("⬜") == 15
+
+
+def test_dirty_backend_frames_match_full_frames():
+    board = [[D] * 20 for _ in range(20)]
+    for i, j in [(1, 2), (2, 3), (3, 1), (3, 2), (3, 3)]:
+        board[i][j] = A
+    backend = IncrementalBackend(board, classic_rules, set(), tile_size=4)
+    full = TerminalRenderer("braille", io.StringIO(), size=(80, 24))
+    incremental = TerminalRenderer("braille", io.StringIO(), size=(80, 24))
+    frames(full, backend.board)
+    frames(incremental, backend.board)
+
+    for _ in range(10):
+        backend.step()
+        assert frames(incremental, backend.board, dirty=backend.dirty) == frames(full, backend.board)
+
+
+def test_unknown_display_mode():
+    with pytest.raises(ValueError):
+        TerminalRenderer("sixel")
@@ -0,0 +1,43 @@
+import random
+
+import numpy as np
+import pytest
+
+from config.config import Config
+from engine.backends import NumpyBackend
+from engine.board import create_history
+from engine.tiled import TiledBackend
+from rules.compiler import compile_rule
+from rules.rules import classic_rules, zombie_rules
+
+
+D = Config.DEAD
+A = Config.ALIVE
+
+
+def random_board(width, height, seed):
+    rng = random.Random(seed)
+    return [[rng.choice([D, A]) for _ in range(width)] for _ in range(height)]
+
+
+@pytest.mark.parametrize("rule", [classic_rules, compile_rule("B36/S23"), compile_rule("B2/S/C3")])
+@pytest.mark.parametrize("workers", [1, 3])
+def test_tiled_backend_is_identical_to_numpy_backend(rule, workers):
+    board = random_board(31, 23, seed=5)
+    expected = NumpyBackend(board, rule, create_history(board))
+    backend = TiledBackend(board, rule, create_history(board), workers=workers)
+
+    try:
+        for _ in range(10):
+            expected.step()
+            backend.step()
+
+            assert (backend.array == expected.array).all()
+        assert np.array_equal(backend.ever_alive, expected.ever_alive)
+    finally:
+        backend.close()
+
+
+def test_stochastic_rules_are_refused():
+    with pytest.raises(ValueError):
+        TiledBackend([[D]], zombie_rules, set())
@@ -0,0 +1,85 @@
+import random
+
+import numpy as np
+import pytest
+
+from config.config import Config
+from engine.board import create_history
+from engine.state import next_board_state
+from engine.vectorized import count_neighbors, next_board_state_vectorized, to_array
+from rules.rules import MOORE_NEIGHBORS, classic_rules, respawn_rules, von_neumann_rules, zombie_rules
+
+
+D = Config.DEAD
+A = Config.ALIVE
+Z = Config.ZOMBIE
+
+
+def random_board(width, height, states, seed):
+    rng = random.Random(seed)
+    return [[rng.choice(states) for _ in range(width)] for _ in range(height)]
+
+
+def test_count_neighbors_ignores_cells_outside_the_board():
+    board = to_array([
+        [A, A, A],
+        [A, A, A],
+        [A, A, A],
+    ])
+
+    counts = count_neighbors(board == A, MOORE_NEIGHBORS)
+
+    assert counts.tolist() == [
+        [3, 5, 3],
+        [5, 8, 5],
+        [3, 5, 3],
+    ]
+
+
+def test_count_neighbors_wraps_around_a_torus():
+    board = to_array([
+        [A, D, D],
+        [D, D, D],
+        [D, D, D],
+    ])
+
+    counts = count_neighbors(board == A, MOORE_NEIGHBORS, torus=True)
+
+    assert counts.tolist() == [
+        [0, 1, 1],
+        [1, 1, 1],
+        [1, 1, 1],
+    ]
+
+
+@pytest.mark.parametrize(
+    "rule, states",
+    [
+        (classic_rules, [D, A]),
+        (von_neumann_rules, [D, A]),
+        (respawn_rules, [D, A]),
+        (zombie_rules, [D, A, Z]),
+    ],
+)
+def test_vectorized_rules_match_python_rules(rule, states):
+    board = random_board(23, 17, states, seed=1)
+    ever_alive = create_history(board)
+    ever_alive[[0, 5, 10], [0, 5, 3]] = True
+    history = ever_alive.copy()
+    array = to_array(board)
+
+    rng = np.random.default_rng(1)
+
+    for generation in range(10):
+        noise = rng.random((17, 23))
+        stochastic = rule in (respawn_rules, zombie_rules)
+        board, ever_alive = next_board_state(board, rule, ever_alive, noise.tolist() if stochastic else None)
+        array, history = next_board_state_vectorized(array, rule, history, noise)
+
+        assert array.tolist() == board
+        assert np.array_equal(history, ever_alive)
+
+
+def test_unknown_rule_is_refused():
+    with pytest.raises(ValueError):
+        next_board_state_vectorized(to_array([[D]]), lambda board, i, j, ever_alive: D, np.zeros((1, 1), dtype=bool))